@@ -21,3 +21,30 @@ DEPRECIATION_METHODS = [
     ('STRAIGHT', '정액법'),
     ('DECLINING', '정률법'),
 ]
+
+# 예산집행 기간 보고서 기간 구분 (구분 → 시작월, 종료월)
+REPORT_PERIODS = [
+    ('Q1', '1분기'),
+    ('Q2', '2분기'),
+    ('Q3', '3분기'),
+    ('Q4', '4분기'),
+    ('H1', '상반기'),
+    ('H2', '하반기'),
+    ('YEAR', '연간'),
+]
+REPORT_PERIOD_MONTHS = {
+    'Q1': (1, 3),
+    'Q2': (4, 6),
+    'Q3': (7, 9),
+    'Q4': (10, 12),
+    'H1': (1, 6),
+    'H2': (7, 12),
+    'YEAR': (1, 12),
+}
+
+# 예산집행 기간 보고서 비교 기간
+REPORT_COMPARES = [
+    ('PREV_YEAR', '전년 동기'),
+    ('PREV_PERIOD', '직전 기간'),
+    ('NONE', '비교 안 함'),
+]
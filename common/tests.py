@@ -1,3 +1,60 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .utils import calc_rate, get_compare_range, get_period_range
+
+
+class CalcRateTests(SimpleTestCase):
+    """집행률 계산 - 정수 원 단위, 소수점 첫째 자리 반올림(ROUND_HALF_UP)"""
+
+    def test_rounds_half_up(self):
+        self.assertEqual(calc_rate(1, 3), 33.3)
+        self.assertEqual(calc_rate(2, 3), 66.7)
+        self.assertEqual(calc_rate(1, 8), 12.5)
+        # 0.0125 → 1.25% → 1.3% (부동소수점 반올림이면 1.2%)
+        self.assertEqual(calc_rate(1, 80), 1.3)
+        self.assertEqual(calc_rate(5, 400), 1.3)
+        self.assertEqual(calc_rate(12345, 1000000), 1.2)
+        self.assertEqual(calc_rate(150, 100), 150.0)
+
+    def test_negative_and_zero_budget(self):
+        # 환급 등으로 집행액이 음수이면 절댓값 기준으로 반올림
+        self.assertEqual(calc_rate(-1, 80), -1.3)
+        self.assertEqual(calc_rate(0, 100), 0.0)
+        self.assertEqual(calc_rate(100, 0), 0.0)
+        self.assertEqual(calc_rate(100, -5), 0.0)
+
+    def test_large_amounts_are_exact(self):
+        budget = 10 ** 15 + 1
+        self.assertEqual(calc_rate(budget, budget), 100.0)
+        self.assertEqual(calc_rate(budget // 3, budget), 33.3)
+
+
+class ReportPeriodTests(SimpleTestCase):
+    """기간별 예산집행 조회 기간/비교 기간 계산"""
+
+    def test_period_range(self):
+        self.assertEqual(get_period_range(2024, 'Q1'), (date(2024, 1, 1), date(2024, 3, 31)))
+        self.assertEqual(get_period_range(2024, 'H2'), (date(2024, 7, 1), date(2024, 12, 31)))
+        self.assertEqual(get_period_range(2025, 'YEAR'), (date(2025, 1, 1), date(2025, 12, 31)))
+        with self.assertRaises(KeyError):
+            get_period_range(2025, 'Q5')
+
+    def test_compare_range(self):
+        q1 = (date(2024, 1, 1), date(2024, 3, 31))
+        self.assertEqual(get_compare_range(*q1, 'PREV_YEAR'), (date(2023, 1, 1), date(2023, 3, 31)))
+        self.assertEqual(get_compare_range(*q1, 'PREV_PERIOD'), (date(2023, 10, 1), date(2023, 12, 31)))
+        self.assertIsNone(get_compare_range(*q1, 'NONE'))
+
+        # 월말 기준 기간은 전년 2월 말일로 맞춤
+        self.assertEqual(
+            get_compare_range(date(2024, 2, 1), date(2024, 2, 29), 'PREV_YEAR'), (date(2023, 2, 1), date(2023, 2, 28))
+        )
+        # 월 단위가 아닌 기간은 일 단위로 계산 (2/29 → 2/28)
+        self.assertEqual(
+            get_compare_range(date(2024, 2, 10), date(2024, 2, 29), 'PREV_YEAR'), (date(2023, 2, 10), date(2023, 2, 28))
+        )
+        self.assertEqual(
+            get_compare_range(date(2024, 3, 1), date(2024, 3, 10), 'PREV_PERIOD'), (date(2024, 2, 20), date(2024, 2, 29))
+        )
@@ -1,6 +1,10 @@
 # 공통 유틸리티 함수
+import calendar
+from datetime import date, timedelta
 from decimal import Decimal
 
+from .constants import REPORT_PERIOD_MONTHS
+
 
 def format_currency(amount):
     """금액을 한국 원화 형식으로 포맷팅"""
@@ -25,3 +29,73 @@ def calculate_depreciation(cost, salvage_value, useful_life, method='STRAIGHT'):
         return (Decimal(cost) - Decimal(salvage_value)) / useful_life
     # TODO: 정률법 구현
     return Decimal(0)
+
+
+def calc_rate(executed, budget):
+    """집행률(%) 계산 - 정수 원 단위 입력, 소수점 첫째 자리 반올림(ROUND_HALF_UP)
+
+    Args:
+        executed: 집행액 (int)
+        budget: 예산액 (int)
+
+    Returns:
+        집행률 (float, 예산이 0 이하이면 0.0)
+    """
+    if budget <= 0:
+        return 0.0
+    # 정수 연산으로 1000배(소수 첫째 자리까지) 계산 후 반올림
+    quotient, remainder = divmod(abs(executed) * 1000, budget)
+    if remainder * 2 >= budget:
+        quotient += 1
+    return (quotient if executed >= 0 else -quotient) / 10
+
+
+def month_end(year, month):
+    """해당 월 말일"""
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+def get_period_range(year, period):
+    """기간 구분(Q1~Q4, H1, H2, YEAR)의 시작일/종료일"""
+    start_month, end_month = REPORT_PERIOD_MONTHS[period]
+    return date(year, start_month, 1), month_end(year, end_month)
+
+
+def is_month_aligned(start, end):
+    """시작일이 월초이고 종료일이 월말인지 여부 (월 단위 집계 사용 가능 여부)"""
+    return start.day == 1 and (end + timedelta(days=1)).day == 1
+
+
+def _add_months(year, month, count):
+    index = year * 12 + month - 1 + count
+    return index // 12, index % 12 + 1
+
+
+def get_compare_range(start, end, compare):
+    """비교 기간 계산
+
+    Args:
+        compare: PREV_YEAR(전년 동기) / PREV_PERIOD(같은 길이의 직전 기간) / NONE
+
+    Returns:
+        (시작일, 종료일) 또는 NONE이면 None
+    """
+    if compare == 'PREV_YEAR':
+        if is_month_aligned(start, end):
+            return date(start.year - 1, start.month, 1), month_end(end.year - 1, end.month)
+        # 2/29 → 2/28
+        return (
+            start.replace(year=start.year - 1, day=min(start.day, calendar.monthrange(start.year - 1, start.month)[1])),
+            end.replace(year=end.year - 1, day=min(end.day, calendar.monthrange(end.year - 1, end.month)[1])),
+        )
+
+    if compare == 'PREV_PERIOD':
+        if is_month_aligned(start, end):
+            months = (end.year - start.year) * 12 + end.month - start.month + 1
+            prev_start = _add_months(start.year, start.month, -months)
+            prev_end = _add_months(end.year, end.month, -months)
+            return date(*prev_start, 1), month_end(*prev_end)
+        days = (end - start).days + 1
+        return start - timedelta(days=days), start - timedelta(days=1)
+
+    return None
@@ -88,6 +88,18 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# 보고서 조회 결과 캐시 (데이터 버전 키로 무효화, 버전 카운터는 DB의 CacheVersion에 보관)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'vanasso-finance',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -188,6 +200,16 @@ JAZZMIN_SETTINGS = {
                 "url": "admin:budget_execution_main",
                 "icon": "fas fa-chart-pie",
             },
+            {
+                "name": "연간 월별 예산집행 현황",
+                "url": "admin:budget_matrix_main",
+                "icon": "fas fa-table",
+            },
+            {
+                "name": "기간별 예산집행 현황",
+                "url": "admin:budget_period",
+                "icon": "fas fa-calendar-alt",
+            },
             {
                 "name": "월간보고서(확정)",
                 "url": "admin:confirmed_report",
@@ -54,6 +54,11 @@ class CashBookAdmin(CashBookAdminMixin, ReportAdminMixin, admin.ModelAdmin):
         """월간 예산집행 내역 - 현재 연월로 리다이렉트"""
         return self._redirect_with_current_date('budget_execution')
 
+    def budget_matrix_redirect(self, request):
+        """연간 월별 예산집행 현황 - 현재 연도로 리다이렉트"""
+        from django.urls import reverse
+        return redirect(reverse('admin:budget_matrix', args=[date.today().year]))
+
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
@@ -64,6 +69,7 @@ class CashBookAdmin(CashBookAdminMixin, ReportAdminMixin, admin.ModelAdmin):
             path('cashbook-combined/<int:year>/<int:month>/', self.admin_site.admin_view(self.cashbook_combined_view), name='cashbook_combined'),
             path('cashbook/<str:book_type>/<int:year>/<int:month>/', self.admin_site.admin_view(self.cashbook_view), name='cashbook_view'),
             path('cashbook/save/', self.admin_site.admin_view(self.cashbook_save), name='cashbook_save'),
+            path('cashbook/patch/', self.admin_site.admin_view(self.cashbook_patch), name='cashbook_patch'),
             path('cashbook-combined/save/', self.admin_site.admin_view(self.cashbook_combined_save), name='cashbook_combined_save'),
             path('cashbook/pdf/<str:book_type>/<int:year>/<int:month>/', self.admin_site.admin_view(self.cashbook_pdf), name='cashbook_pdf'),
             # 예수금출납장 (파라미터 없는 URL 추가)
@@ -74,16 +80,29 @@ class CashBookAdmin(CashBookAdminMixin, ReportAdminMixin, admin.ModelAdmin):
             path('budget-execution/', self.admin_site.admin_view(self.budget_execution_redirect), name='budget_execution_main'),
             path('budget-execution/<int:year>/<int:month>/', self.admin_site.admin_view(self.budget_execution_view), name='budget_execution'),
             path('budget-execution/print/<int:year>/<int:month>/', self.admin_site.admin_view(self.budget_execution_print), name='budget_execution_print'),
+            path('budget-execution/delta/<int:year>/<int:month>/', self.admin_site.admin_view(self.budget_execution_delta), name='budget_execution_delta'),
+            # 연간 월별 예산집행 현황
+            path('budget-period/', self.admin_site.admin_view(self.budget_period_view), name='budget_period'),
+            path('budget-matrix/', self.admin_site.admin_view(self.budget_matrix_redirect), name='budget_matrix_main'),
+            path('budget-matrix/<int:year>/', self.admin_site.admin_view(self.budget_matrix_view), name='budget_matrix'),
+            path('budget-matrix/print/<int:year>/', self.admin_site.admin_view(self.budget_matrix_print), name='budget_matrix_print'),
             # 스냅샷 확정
             path('snapshot/confirm/cashbook/', self.admin_site.admin_view(self.snapshot_confirm_cashbook), name='snapshot_confirm_cashbook'),
             path('snapshot/confirm/budget/', self.admin_site.admin_view(self.snapshot_confirm_budget), name='snapshot_confirm_budget'),
             path('snapshot/cancel/<str:snapshot_type>/<int:year>/<int:month>/', self.admin_site.admin_view(self.snapshot_cancel), name='snapshot_cancel'),
             path('snapshot/confirm/card/', self.admin_site.admin_view(self.snapshot_confirm_card), name='snapshot_confirm_card'),
+            path('snapshot/confirm/month/', self.admin_site.admin_view(self.snapshot_confirm_month), name='snapshot_confirm_month'),
+            path('snapshot/confirm/annual/', self.admin_site.admin_view(self.snapshot_confirm_annual), name='snapshot_confirm_annual'),
+            path('snapshot/reconfirm-chain/', self.admin_site.admin_view(self.snapshot_reconfirm_chain), name='snapshot_reconfirm_chain'),
+            path('snapshot/diff/<str:snapshot_type>/<int:year>/<int:month>/', self.admin_site.admin_view(self.snapshot_diff_view), name='snapshot_diff'),
+            path('snapshot/history/<str:snapshot_type>/<int:year>/<int:month>/', self.admin_site.admin_view(self.snapshot_history_view), name='snapshot_history'),
             # 월간보고서(확정)
             path('confirmed-report/', self.admin_site.admin_view(self.confirmed_report_main), name='confirmed_report'),
-            path('confirmed-report/cashbook/<str:book_type>/<int:year>/<int:month>/', self.admin_site.admin_view(self.confirmed_cashbook_view), name='confirmed_cashbook'),
-            path('confirmed-report/budget/<int:year>/<int:month>/', self.admin_site.admin_view(self.confirmed_budget_view), name='confirmed_budget'),
-            path('confirmed-report/card/<int:year>/<int:month>/', self.admin_site.admin_view(self.confirmed_card_view), name='confirmed_card'),
+            path('confirmed-report/cashbook/<str:book_type>/<int:year>/<int:month>/', self.admin_site.admin_view(self.confirmed_cashbook_view, cacheable=True), name='confirmed_cashbook'),
+            path('confirmed-report/budget/<int:year>/<int:month>/', self.admin_site.admin_view(self.confirmed_budget_view, cacheable=True), name='confirmed_budget'),
+            path('confirmed-report/card/<int:year>/<int:month>/', self.admin_site.admin_view(self.confirmed_card_view, cacheable=True), name='confirmed_card'),
+            # 연간결산
+            path('annual-report/<int:year>/', self.admin_site.admin_view(self.annual_report_view), name='annual_report'),
         ]
         return custom_urls + urls
 
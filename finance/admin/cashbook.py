@@ -1,27 +1,102 @@
 # finance/admin/cashbook.py
 # 출납장 관리 Admin (예금/현금/예수금출납장)
 
-from django.contrib import admin
-from django.urls import path
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.db import transaction
 from django.template.response import TemplateResponse
-from django.http import HttpResponse
-from django.db.models import Sum, Q
 from decimal import Decimal
 
-from ..models import Account, Transaction, CashBook, CashBookCategory, BankAccount, DepositLedger, MonthlySnapshot
-
-
-def get_cashbook_categories(book_type, entry_type, year):
-    """출납장 과목 조회 - 해당 연도 또는 연도 없는 과목"""
-    return CashBookCategory.objects.filter(
-        Q(fiscal_year=year) | Q(fiscal_year__isnull=True),
-        book_type=book_type,
-        entry_type=entry_type,
-        is_active=True
-    ).order_by('name')
+from ..models import Account, CashBook, CashBookCategory, BankAccount, DepositLedger
+from ..selectors import get_cashbook_balance, get_cashbook_catalog, get_snapshot_index
+from ..services import sync_cashbook_month, patch_cashbook_month, sync_deposit_ledger_month
+
+
+def get_posted_rows(post, prefix, names):
+    """{prefix}{name}_{idx} 형식의 행 입력값을 day 입력칸이 끝나는 행까지 순서대로 수집
+
+    제출되지 않은 입력칸은 None으로 남겨 화면에 없는 필드와 빈 값을 구분한다.
+    """
+    rows = []
+    idx = 0
+    while f'{prefix}day_{idx}' in post:
+        row = {}
+        for name in names:
+            value = post.get(f'{prefix}{name}_{idx}')
+            row[name] = value.strip() if value is not None else None
+        rows.append(row)
+        idx += 1
+    return rows
+
+
+def parse_posted_id(value):
+    """제출된 ID 문자열을 정수로 변환 (비어 있거나 숫자가 아니면 None)"""
+    return int(value) if value and value.isdigit() else None
+
+
+def get_cashbook_totals(book_type, year, month, income_entries, expense_entries):
+    """출납장 화면의 수입/지출 합계와 전월이월/차월이월
+
+    합계는 화면에 표시하는 행에서, 전월이월은 출납장월별잔액 색인에서 조회한다 (이전 월 원장 미조회).
+    """
+    income_total = sum(e['amount'] for e in income_entries if e['amount'])
+    expense_total = sum(e['amount'] for e in expense_entries if e['amount'])
+    prev_balance = get_cashbook_balance(book_type, year, month)['prev_balance']
+    return {
+        'income_total': income_total,
+        'expense_total': expense_total,
+        'prev_balance': prev_balance,
+        'next_balance': prev_balance + income_total - expense_total,
+    }
+
+
+def get_cashbook_data(book_type, year, month, catalog):
+    """출납장 화면의 입력 항목 목록, 수입/지출 행(빈 입력 행 포함), 합계
+
+    Args:
+        catalog: get_cashbook_catalog(year) 결과 (예금/현금출납장 화면이 공유)
+    """
+    book_catalog = catalog.get(book_type, {'income_categories': [], 'expense_items': []})
+
+    income_entries = list(CashBook.objects.filter(
+        book_type=book_type, year=year, month=month, entry_type='INCOME'
+    ).order_by('order').values(
+        'id', 'date', 'category_id', 'description', 'amount', 'bank_account_id', 'note', 'order'
+    ))
+
+    expense_entries = list(CashBook.objects.filter(
+        book_type=book_type, year=year, month=month, entry_type='EXPENSE'
+    ).order_by('order').values(
+        'id', 'date', 'account_id', 'category_id', 'description', 'amount', 'bank_account_id', 'note', 'order'
+    ))
+    for entry in expense_entries:
+        if entry['account_id']:
+            entry['selected_value'] = f"account:{entry['account_id']}"
+        elif entry['category_id']:
+            entry['selected_value'] = f"category:{entry['category_id']}"
+        else:
+            entry['selected_value'] = ''
+
+    income_row_count = 20 if book_type == 'BANK' else 5
+    while len(income_entries) < income_row_count:
+        income_entries.append({
+            'id': None, 'date': None, 'category_id': None, 'description': '',
+            'amount': 0, 'bank_account_id': None, 'note': '', 'order': len(income_entries)
+        })
+    while len(expense_entries) < 20:
+        expense_entries.append({
+            'id': None, 'date': None, 'account_id': None, 'category_id': None,
+            'selected_value': '', 'description': '',
+            'amount': 0, 'bank_account_id': None, 'note': '', 'order': len(expense_entries)
+        })
+
+    return {
+        'income_categories': book_catalog['income_categories'],
+        'expense_items': book_catalog['expense_items'],
+        'income_entries': income_entries,
+        'expense_entries': expense_entries,
+        **get_cashbook_totals(book_type, year, month, income_entries, expense_entries),
+    }
 
 
 class CashBookAdminMixin:
@@ -57,84 +132,24 @@ class CashBookAdminMixin:
 
         _, last_day = monthrange(year, month)
 
-        def get_cashbook_data(book_type):
-            income_categories = get_cashbook_categories(book_type, 'INCOME', year)
-
-            expense_accounts = list(Account.objects.filter(
-                fiscal_year=year,
-                account_type__in=['EXPENSE', 'LIABILITY', 'EQUITY'],
-                is_active=True
-            ).order_by('code'))
-
-            if not expense_accounts:
-                latest_year = Account.objects.filter(account_type__in=['EXPENSE', 'LIABILITY', 'EQUITY']).order_by('-fiscal_year').values_list('fiscal_year', flat=True).first()
-                if latest_year:
-                    expense_accounts = list(Account.objects.filter(
-                        fiscal_year=latest_year,
-                        account_type__in=['EXPENSE', 'LIABILITY', 'EQUITY'],
-                        is_active=True
-                    ).order_by('code'))
-
-            expense_categories = list(get_cashbook_categories(book_type, 'EXPENSE', year))
-
-            expense_items = []
-            for acc in expense_accounts:
-                expense_items.append({'value': f"account:{acc.id}", 'display_name': acc.account_name})
-            for cat in expense_categories:
-                expense_items.append({'value': f"category:{cat.id}", 'display_name': cat.name})
-
-            income_entries = list(CashBook.objects.filter(
-                book_type=book_type, year=year, month=month, entry_type='INCOME'
-            ).order_by('order').values('id', 'date', 'category_id', 'description', 'amount', 'bank_account_id', 'note', 'order'))
-
-            expense_entries_raw = list(CashBook.objects.filter(
-                book_type=book_type, year=year, month=month, entry_type='EXPENSE'
-            ).order_by('order').values('id', 'date', 'account_id', 'category_id', 'description', 'amount', 'bank_account_id', 'note', 'order'))
-
-            expense_entries = []
-            for entry in expense_entries_raw:
-                if entry['account_id']:
-                    entry['selected_value'] = f"account:{entry['account_id']}"
-                elif entry['category_id']:
-                    entry['selected_value'] = f"category:{entry['category_id']}"
-                else:
-                    entry['selected_value'] = ''
-                expense_entries.append(entry)
-
-            income_row_count = 20 if book_type == 'BANK' else 5
-            while len(income_entries) < income_row_count:
-                income_entries.append({'id': None, 'date': None, 'category_id': None, 'description': '', 'amount': 0, 'bank_account_id': None, 'note': '', 'order': len(income_entries)})
-            while len(expense_entries) < 20:
-                expense_entries.append({'id': None, 'date': None, 'account_id': None, 'category_id': None, 'selected_value': '', 'description': '', 'amount': 0, 'bank_account_id': None, 'note': '', 'order': len(expense_entries)})
-
-            income_total = sum(e['amount'] for e in income_entries if e['amount'])
-            expense_total = sum(e['amount'] for e in expense_entries if e['amount'])
-
-            return {
-                'income_categories': income_categories,
-                'expense_items': expense_items,
-                'income_entries': income_entries,
-                'expense_entries': expense_entries,
-                'income_total': income_total,
-                'expense_total': expense_total,
-            }
+        # 계정과목/과목 목록은 회계연도별 캐시를 예금/현금출납장이 공유
+        catalog = get_cashbook_catalog(year)
 
-        bank_data = get_cashbook_data('BANK')
-        cash_data = get_cashbook_data('CASH')
+        bank_data = get_cashbook_data('BANK', year, month, catalog)
+        cash_data = get_cashbook_data('CASH', year, month, catalog)
 
         year_range = list(range(2024, 2028))
         month_range = list(range(1, 13))
 
-        bank_snapshot = MonthlySnapshot.objects.filter(
-            snapshot_type='CASHBOOK_BANK', fiscal_year=year, month=month
-        ).first()
-        cash_snapshot = MonthlySnapshot.objects.filter(
-            snapshot_type='CASHBOOK_CASH', fiscal_year=year, month=month
-        ).first()
+        # 확정 상태는 스냅샷 색인에서 조회 (snapshot_data 미조회)
+        bank_snapshot = get_snapshot_index('CASHBOOK_BANK', year, month)
+        cash_snapshot = get_snapshot_index('CASHBOOK_CASH', year, month)
         bank_is_confirmed = bank_snapshot is not None
         cash_is_confirmed = cash_snapshot is not None
         bank_confirmed_at = bank_snapshot.confirmed_at if bank_snapshot else None
         cash_confirmed_at = cash_snapshot.confirmed_at if cash_snapshot else None
+        bank_is_stale = bank_is_confirmed and bank_snapshot.is_stale
+        cash_is_stale = cash_is_confirmed and cash_snapshot.is_stale
 
         context = {
             **self.admin_site.each_context(request),
@@ -145,22 +160,14 @@ class CashBookAdminMixin:
             'last_day': last_day,
             'year_range': year_range,
             'month_range': month_range,
-            'bank_income_categories': bank_data['income_categories'],
-            'bank_expense_items': bank_data['expense_items'],
-            'bank_income_entries': bank_data['income_entries'],
-            'bank_expense_entries': bank_data['expense_entries'],
-            'bank_income_total': bank_data['income_total'],
-            'bank_expense_total': bank_data['expense_total'],
-            'cash_income_categories': cash_data['income_categories'],
-            'cash_expense_items': cash_data['expense_items'],
-            'cash_income_entries': cash_data['income_entries'],
-            'cash_expense_entries': cash_data['expense_entries'],
-            'cash_income_total': cash_data['income_total'],
-            'cash_expense_total': cash_data['expense_total'],
+            **{f'bank_{key}': value for key, value in bank_data.items()},
+            **{f'cash_{key}': value for key, value in cash_data.items()},
             'bank_is_confirmed': bank_is_confirmed,
             'bank_confirmed_at': bank_confirmed_at,
             'cash_is_confirmed': cash_is_confirmed,
             'cash_confirmed_at': cash_confirmed_at,
+            'bank_is_stale': bank_is_stale,
+            'cash_is_stale': cash_is_stale,
         }
 
         return TemplateResponse(request, 'admin/cashbook_combined.html', context)
@@ -173,75 +180,6 @@ class CashBookAdminMixin:
 
         bank_accounts = BankAccount.objects.filter(is_active=True).order_by('order') if book_type == 'BANK' else []
 
-        income_categories = get_cashbook_categories(book_type, 'INCOME', year)
-
-        expense_accounts = list(Account.objects.filter(
-            fiscal_year=year,
-            account_type__in=['EXPENSE', 'LIABILITY', 'EQUITY'],
-            is_active=True
-        ).order_by('code'))
-
-        if not expense_accounts:
-            latest_year = Account.objects.filter(account_type__in=['EXPENSE', 'LIABILITY', 'EQUITY']).order_by('-fiscal_year').values_list('fiscal_year', flat=True).first()
-            if latest_year:
-                expense_accounts = list(Account.objects.filter(
-                    fiscal_year=latest_year,
-                    account_type__in=['EXPENSE', 'LIABILITY', 'EQUITY'],
-                    is_active=True
-                ).order_by('code'))
-
-        expense_categories = list(get_cashbook_categories(book_type, 'EXPENSE', year))
-
-        expense_items = []
-        for acc in expense_accounts:
-            expense_items.append({
-                'value': f"account:{acc.id}",
-                'display_name': acc.account_name,
-            })
-        for cat in expense_categories:
-            expense_items.append({
-                'value': f"category:{cat.id}",
-                'display_name': cat.name,
-            })
-
-        income_entries = list(CashBook.objects.filter(
-            book_type=book_type, year=year, month=month, entry_type='INCOME'
-        ).order_by('order').values(
-            'id', 'date', 'category_id', 'description', 'amount', 'bank_account_id', 'note', 'order'
-        ))
-
-        expense_entries_raw = list(CashBook.objects.filter(
-            book_type=book_type, year=year, month=month, entry_type='EXPENSE'
-        ).order_by('order').values(
-            'id', 'date', 'account_id', 'category_id', 'description', 'amount', 'bank_account_id', 'note', 'order'
-        ))
-
-        expense_entries = []
-        for entry in expense_entries_raw:
-            if entry['account_id']:
-                entry['selected_value'] = f"account:{entry['account_id']}"
-            elif entry['category_id']:
-                entry['selected_value'] = f"category:{entry['category_id']}"
-            else:
-                entry['selected_value'] = ''
-            expense_entries.append(entry)
-
-        income_row_count = 20 if book_type == 'BANK' else 5
-        while len(income_entries) < income_row_count:
-            income_entries.append({
-                'id': None, 'date': None, 'category_id': None, 'description': '',
-                'amount': 0, 'bank_account_id': None, 'note': '', 'order': len(income_entries)
-            })
-        while len(expense_entries) < 20:
-            expense_entries.append({
-                'id': None, 'date': None, 'account_id': None, 'category_id': None,
-                'selected_value': '', 'description': '',
-                'amount': 0, 'bank_account_id': None, 'note': '', 'order': len(expense_entries)
-            })
-
-        income_total = sum(e['amount'] for e in income_entries if e['amount'])
-        expense_total = sum(e['amount'] for e in expense_entries if e['amount'])
-
         book_type_display = '예금출납장' if book_type == 'BANK' else '현금출납장'
 
         year_range = list(range(2024, 2028))
@@ -256,12 +194,7 @@ class CashBookAdminMixin:
             'year': year,
             'month': month,
             'bank_accounts': bank_accounts,
-            'income_categories': income_categories,
-            'expense_items': expense_items,
-            'income_entries': income_entries,
-            'expense_entries': expense_entries,
-            'income_total': income_total,
-            'expense_total': expense_total,
+            **get_cashbook_data(book_type, year, month, get_cashbook_catalog(year)),
             'last_day': last_day,
             'year_range': year_range,
             'month_range': month_range,
@@ -269,8 +202,124 @@ class CashBookAdminMixin:
 
         return TemplateResponse(request, 'admin/cashbook_form.html', context)
 
+    def _collect_cashbook_rows(self, request, prefix, year, month):
+        """출납장 화면 제출값을 sync_cashbook_month 행 목록으로 변환 (빈 행/잘못된 행 제외)"""
+        income_rows = [
+            row for row in get_posted_rows(request.POST, f'{prefix}income_', ['id', 'day', 'category', 'amount', 'bank', 'note'])
+            if row['day'] and row['category']
+        ]
+        expense_rows = [
+            row for row in get_posted_rows(request.POST, f'{prefix}expense_', ['id', 'day', 'item', 'amount', 'note'])
+            if row['day'] and row['item']
+        ]
+        income, expense = self._build_cashbook_rows(income_rows, expense_rows, year, month)
+        return [row for row in income + expense if row]
+
+    def _build_cashbook_rows(self, income_rows, expense_rows, year, month):
+        """행 입력값(문자열)을 sync_cashbook_month 행으로 변환
+
+        과목/계정/계좌는 제출된 ID를 모아 모델별 in_bulk() 한 번으로 조회한다.
+
+        Returns:
+            (수입 행 목록, 지출 행 목록) - 입력 순서대로이며 변환할 수 없는 행은 None
+        """
+        from datetime import date
+
+        category_ids, account_ids, bank_account_ids = set(), set(), set()
+        for row in income_rows:
+            category_ids.add(parse_posted_id(row['category']))
+            bank_account_ids.add(parse_posted_id(row['bank']))
+        for row in expense_rows:
+            item_type, _, item_id = row['item'].partition(':')
+            (account_ids if item_type == 'account' else category_ids).add(parse_posted_id(item_id))
+
+        categories = CashBookCategory.objects.in_bulk(category_ids - {None})
+        accounts = Account.objects.in_bulk(account_ids - {None})
+        bank_accounts = BankAccount.objects.in_bulk(bank_account_ids - {None})
+
+        income, expense = [], []
+
+        for row in income_rows:
+            try:
+                category = categories[parse_posted_id(row['category'])]
+                fields = {
+                    'date': date(year, month, int(row['day'])),
+                    'category_id': category.pk,
+                    'amount': Decimal((row['amount'] or '0').replace(',', '') or '0'),
+                    'note': row['note'] or '',
+                }
+                # 계좌 입력칸이 있는 화면에서만 계좌를 갱신
+                if row['bank'] is not None:
+                    fields['bank_account_id'] = (
+                        bank_accounts[parse_posted_id(row['bank'])].pk if row['bank'] else None
+                    )
+                income.append({
+                    'id': parse_posted_id(row['id']),
+                    'entry_type': 'INCOME',
+                    'fields': fields,
+                    'transaction': None,
+                })
+            except Exception:
+                income.append(None)
+
+        for row in expense_rows:
+            try:
+                entry_date = date(year, month, int(row['day']))
+                amount = Decimal((row['amount'] or '0').replace(',', '') or '0')
+                note = row['note'] or ''
+
+                item_type, item_id = row['item'].split(':')
+                account = None
+                category = None
+                display_name = ''
+
+                if item_type == 'account':
+                    account = accounts[parse_posted_id(item_id)]
+                    display_name = account.account_name
+                elif item_type == 'category':
+                    category = categories[parse_posted_id(item_id)]
+                    display_name = category.name
+
+                # 마이너스 금액도 Transaction 연동 (환급 등)
+                linked = None
+                if account and amount != 0:
+                    linked = {
+                        'account_id': account.pk,
+                        'description': display_name + (f' ({note})' if note else ''),
+                    }
+
+                expense.append({
+                    'id': parse_posted_id(row['id']),
+                    'entry_type': 'EXPENSE',
+                    'fields': {
+                        'date': entry_date,
+                        'account_id': account.pk if account else None,
+                        'category_id': category.pk if category else None,
+                        'description': display_name,
+                        'amount': amount,
+                        'note': note,
+                    },
+                    'transaction': linked,
+                })
+            except Exception:
+                expense.append(None)
+
+        return income, expense
+
+    @staticmethod
+    def _cashbook_save_message(label, saved_count, result):
+        """출납장 저장 결과 메시지"""
+        msg = (
+            f'{label} 저장 완료 ({saved_count}건 / 추가 {result["created"]}, '
+            f'수정 {result["updated"]}, 삭제 {result["deleted"]})'
+        )
+        if result['transactions'] > 0:
+            msg += f' - 거래내역 {result["transactions"]}건 동시 반영'
+        return msg
+
+    @transaction.atomic
     def cashbook_save(self, request):
-        """출납장 저장"""
+        """출납장 저장 (기존 행과 비교해 변경분만 반영)"""
         if request.method != 'POST':
             return redirect('admin:monthly_report')
 
@@ -278,128 +327,19 @@ class CashBookAdminMixin:
         year = int(request.POST.get('year'))
         month = int(request.POST.get('month'))
 
-        old_cashbooks = CashBook.objects.filter(book_type=book_type, year=year, month=month)
-        linked_transaction_ids = list(old_cashbooks.exclude(
-            linked_transaction__isnull=True
-        ).values_list('linked_transaction_id', flat=True))
-        old_cashbooks.delete()
-        if linked_transaction_ids:
-            Transaction.objects.filter(id__in=linked_transaction_ids).delete()
-
-        saved_count = 0
-
-        idx = 0
-        while True:
-            day = request.POST.get(f'income_day_{idx}')
-            if day is None:
-                break
-
-            category_id = request.POST.get(f'income_category_{idx}', '').strip()
-            amount_str = request.POST.get(f'income_amount_{idx}', '0').replace(',', '')
-            bank_account_id = request.POST.get(f'income_bank_{idx}', '').strip()
-            note = request.POST.get(f'income_note_{idx}', '').strip()
-
-            if day and category_id:
-                try:
-                    from datetime import date
-                    entry_date = date(year, month, int(day))
-                    amount = Decimal(amount_str) if amount_str else Decimal('0')
-
-                    category = CashBookCategory.objects.get(pk=category_id)
-                    bank_account = BankAccount.objects.get(pk=bank_account_id) if bank_account_id else None
-
-                    CashBook.objects.create(
-                        book_type=book_type,
-                        year=year,
-                        month=month,
-                        entry_type='INCOME',
-                        date=entry_date,
-                        category=category,
-                        amount=amount,
-                        bank_account=bank_account,
-                        note=note,
-                        order=saved_count,
-                    )
-                    saved_count += 1
-                except Exception:
-                    pass
-
-            idx += 1
-
-        idx = 0
-        transaction_saved = 0
-        while True:
-            day = request.POST.get(f'expense_day_{idx}')
-            if day is None:
-                break
-
-            item_value = request.POST.get(f'expense_item_{idx}', '').strip()
-            amount_str = request.POST.get(f'expense_amount_{idx}', '0').replace(',', '')
-            note = request.POST.get(f'expense_note_{idx}', '').strip()
-
-            if day and item_value:
-                try:
-                    from datetime import date
-                    entry_date = date(year, month, int(day))
-                    amount = Decimal(amount_str) if amount_str else Decimal('0')
-
-                    item_type, item_id = item_value.split(':')
-                    account = None
-                    category = None
-                    display_name = ''
-
-                    if item_type == 'account':
-                        account = Account.objects.get(pk=int(item_id))
-                        display_name = account.account_name
-                    elif item_type == 'category':
-                        category = CashBookCategory.objects.get(pk=int(item_id))
-                        display_name = category.name
-
-                    linked_trans = None
-                    if account and amount != 0:
-                        # 마이너스 금액도 Transaction 생성 (환급 등)
-                        payment_method = 'BANK' if book_type == 'BANK' else 'CASH'
-                        linked_trans = Transaction.objects.create(
-                            date=entry_date,
-                            transaction_type='EXPENSE',
-                            account=account,
-                            description=display_name + (f' ({note})' if note else ''),
-                            amount=amount,
-                            payment_method=payment_method,
-                            status='APPROVED',
-                        )
-                        transaction_saved += 1
-
-                    CashBook.objects.create(
-                        book_type=book_type,
-                        year=year,
-                        month=month,
-                        entry_type='EXPENSE',
-                        date=entry_date,
-                        account=account,
-                        category=category,
-                        description=display_name,
-                        amount=amount,
-                        note=note,
-                        order=saved_count,
-                        linked_transaction=linked_trans,
-                    )
-                    saved_count += 1
-                except Exception:
-                    pass
-
-            idx += 1
+        rows = self._collect_cashbook_rows(request, '', year, month)
+        result = sync_cashbook_month(book_type, year, month, rows)
 
         book_type_display = '예금출납장' if book_type == 'BANK' else '현금출납장'
-        msg = f'{year}년 {month}월 {book_type_display} 저장 완료 ({saved_count}건)'
-        if transaction_saved > 0:
-            msg += f' - 거래내역 {transaction_saved}건 동시 저장'
-        messages.success(request, msg)
+        messages.success(request, self._cashbook_save_message(
+            f'{year}년 {month}월 {book_type_display}', len(rows), result
+        ))
 
         return redirect('admin:cashbook_combined', year=year, month=month)
 
+    @transaction.atomic
     def cashbook_combined_save(self, request):
-        """예금/현금출납장 통합 저장"""
+        """예금/현금출납장 통합 저장 (기존 행과 비교해 변경분만 반영)"""
         if request.method != 'POST':
             return redirect('admin:monthly_report')
 
@@ -407,128 +347,149 @@ class CashBookAdminMixin:
         month = int(request.POST.get('month'))
 
         total_saved = 0
-        total_transactions = 0
-
-        for book_type, prefix in [('BANK', 'bank'), ('CASH', 'cash')]:
-            old_cashbooks = CashBook.objects.filter(book_type=book_type, year=year, month=month)
-            linked_transaction_ids = list(old_cashbooks.exclude(
-                linked_transaction__isnull=True
-            ).values_list('linked_transaction_id', flat=True))
-            old_cashbooks.delete()
-            if linked_transaction_ids:
-                Transaction.objects.filter(id__in=linked_transaction_ids).delete()
-
-            saved_count = 0
-
-            idx = 0
-            while True:
-                day = request.POST.get(f'{prefix}_income_day_{idx}')
-                if day is None:
-                    break
-
-                category_id = request.POST.get(f'{prefix}_income_category_{idx}', '').strip()
-                amount_str = request.POST.get(f'{prefix}_income_amount_{idx}', '0').replace(',', '')
-                note = request.POST.get(f'{prefix}_income_note_{idx}', '').strip()
-
-                if day and category_id:
-                    try:
-                        from datetime import date
-                        entry_date = date(year, month, int(day))
-                        amount = Decimal(amount_str) if amount_str else Decimal('0')
-
-                        category = CashBookCategory.objects.get(pk=category_id)
-
-                        CashBook.objects.create(
-                            book_type=book_type,
-                            year=year,
-                            month=month,
-                            entry_type='INCOME',
-                            date=entry_date,
-                            category=category,
-                            amount=amount,
-                            note=note,
-                            order=saved_count,
-                        )
-                        saved_count += 1
-                    except Exception:
-                        pass
-
-                idx += 1
-
-            idx = 0
-            transaction_saved = 0
-            while True:
-                day = request.POST.get(f'{prefix}_expense_day_{idx}')
-                if day is None:
-                    break
-
-                item_value = request.POST.get(f'{prefix}_expense_item_{idx}', '').strip()
-                amount_str = request.POST.get(f'{prefix}_expense_amount_{idx}', '0').replace(',', '')
-                note = request.POST.get(f'{prefix}_expense_note_{idx}', '').strip()
-
-                if day and item_value:
-                    try:
-                        from datetime import date
-                        entry_date = date(year, month, int(day))
-                        amount = Decimal(amount_str) if amount_str else Decimal('0')
-
-                        item_type, item_id = item_value.split(':')
-                        account = None
-                        category = None
-                        display_name = ''
-
-                        if item_type == 'account':
-                            account = Account.objects.get(pk=int(item_id))
-                            display_name = account.account_name
-                        elif item_type == 'category':
-                            category = CashBookCategory.objects.get(pk=int(item_id))
-                            display_name = category.name
-
-                        linked_trans = None
-                        if account and amount != 0:
-                            # 마이너스 금액도 Transaction 생성 (환급 등)
-                            payment_method = 'BANK' if book_type == 'BANK' else 'CASH'
-                            linked_trans = Transaction.objects.create(
-                                date=entry_date,
-                                transaction_type='EXPENSE',
-                                account=account,
-                                description=display_name + (f' ({note})' if note else ''),
-                                amount=amount,
-                                payment_method=payment_method,
-                                status='APPROVED',
-                            )
-                            transaction_saved += 1
-
-                        CashBook.objects.create(
-                            book_type=book_type,
-                            year=year,
-                            month=month,
-                            entry_type='EXPENSE',
-                            date=entry_date,
-                            account=account,
-                            category=category,
-                            description=display_name,
-                            amount=amount,
-                            note=note,
-                            order=saved_count,
-                            linked_transaction=linked_trans,
-                        )
-                        saved_count += 1
-                    except Exception:
-                        pass
-
-                idx += 1
-
-            total_saved += saved_count
-            total_transactions += transaction_saved
-
-        msg = f'{year}년 {month}월 예금/현금출납장 저장 완료 ({total_saved}건)'
-        if total_transactions > 0:
-            msg += f' - 거래내역 {total_transactions}건 동시 저장'
-        messages.success(request, msg)
+        total = {'created': 0, 'updated': 0, 'deleted': 0, 'transactions': 0}
+
+        for book_type, prefix in [('BANK', 'bank_'), ('CASH', 'cash_')]:
+            rows = self._collect_cashbook_rows(request, prefix, year, month)
+            result = sync_cashbook_month(book_type, year, month, rows)
+            total_saved += len(rows)
+            for key in total:
+                total[key] += result[key]
+
+        messages.success(request, self._cashbook_save_message(
+            f'{year}년 {month}월 예금/현금출납장', total_saved, total
+        ))
 
         return redirect('admin:cashbook_combined', year=year, month=month)
 
+    @staticmethod
+    def _load_cashbook_patch_payload(body):
+        """행 단위 저장 요청 본문(JSON)에서 (출납장 유형, 연도, 월, ops) 추출
+
+        Raises:
+            ValueError: 본문 형식이나 출납장 유형/월이 올바르지 않은 경우
+        """
+        import json
+
+        try:
+            payload = json.loads(body)
+            book_type = payload['book_type']
+            year = int(payload['year'])
+            month = int(payload['month'])
+            ops = list(payload['ops'])
+            if book_type not in dict(CashBook.BOOK_TYPES) or not 1 <= month <= 12:
+                raise ValueError
+        except (ValueError, TypeError, KeyError):
+            raise ValueError('잘못된 요청입니다.')
+        return book_type, year, month, ops
+
+    @staticmethod
+    def _parse_cashbook_patch_ops(ops):
+        """행 단위 저장 요청의 ops를 구분별 행 입력값(문자열)과 삭제할 행 ID로 분류
+
+        Returns:
+            (수입 행 목록, 지출 행 목록, 삭제할 행 ID 목록, targets) - targets는 ops 순서대로
+            (구분, 구분별 행 위치) 또는 삭제면 None
+
+        Raises:
+            ValueError: 작업/행 ID/구분이 올바르지 않은 경우
+        """
+        def text(value):
+            return str(value).strip() if value is not None else None
+
+        income_rows, expense_rows, deleted_ids, targets = [], [], [], []
+        for op in ops:
+            kind = op.get('op') if isinstance(op, dict) else None
+            row_id = parse_posted_id(text(op.get('id'))) if kind else None
+            if kind == 'delete' and row_id:
+                deleted_ids.append(row_id)
+                targets.append(None)
+                continue
+            if kind not in ('create', 'update') or (kind == 'update' and not row_id):
+                raise ValueError('작업(op) 또는 행 ID가 올바르지 않습니다.')
+
+            row = {
+                'id': text(row_id) if kind == 'update' else None,
+                'day': text(op.get('day')),
+                'amount': text(op.get('amount')),
+                'note': text(op.get('note')),
+            }
+            if op.get('entry_type') == 'INCOME':
+                row.update(category=text(op.get('category')), bank=text(op.get('bank')) if 'bank' in op else None)
+                targets.append(('INCOME', len(income_rows)))
+                income_rows.append(row)
+            elif op.get('entry_type') == 'EXPENSE':
+                row['item'] = text(op.get('item')) or ''
+                targets.append(('EXPENSE', len(expense_rows)))
+                expense_rows.append(row)
+            else:
+                raise ValueError('구분(entry_type)이 올바르지 않습니다.')
+
+        return income_rows, expense_rows, deleted_ids, targets
+
+    def _build_cashbook_patch_rows(self, income_rows, expense_rows, targets, year, month):
+        """행 입력값을 ops 순서대로 patch_cashbook_month 행으로 변환
+
+        Returns:
+            (행 목록, 변환할 수 없는 첫 행의 ops 위치 또는 None)
+        """
+        income, expense = self._build_cashbook_rows(income_rows, expense_rows, year, month)
+        built = {'INCOME': income, 'EXPENSE': expense}
+        rows = []
+        for index, target in enumerate(targets):
+            if target is None:
+                continue
+            row = built[target[0]][target[1]]
+            if row is None:
+                return rows, index
+            rows.append(row)
+        return rows, None
+
+    @transaction.atomic
+    def cashbook_patch(self, request):
+        """출납장 행 단위 저장 (AJAX) - 변경된 행만 추가/수정/삭제하고 월 합계 반환
+
+        요청 본문(JSON):
+            {"book_type": "BANK", "year": 2025, "month": 6, "ops": [
+                {"op": "create", "entry_type": "INCOME", "day": 3, "category": 4, "amount": "1,000", "note": ""},
+                {"op": "update", "id": 12, "entry_type": "EXPENSE", "day": 5, "item": "account:7", "amount": 500},
+                {"op": "delete", "id": 13}]}
+        수입 행은 "bank"(계좌 ID)를 보내면 계좌도 갱신한다.
+        응답의 ids는 ops 순서대로 반영된 행 ID이다 (삭제는 null).
+        """
+        from django.http import JsonResponse
+
+        if request.method != 'POST':
+            return JsonResponse({'success': False, 'error': 'POST 요청만 허용됩니다.'}, status=405)
+
+        try:
+            book_type, year, month, ops = self._load_cashbook_patch_payload(request.body)
+            income_rows, expense_rows, deleted_ids, targets = self._parse_cashbook_patch_ops(ops)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+        rows, invalid_index = self._build_cashbook_patch_rows(income_rows, expense_rows, targets, year, month)
+        if invalid_index is not None:
+            return JsonResponse({
+                'success': False, 'error': f'{invalid_index + 1}번째 행의 일자/내용/금액을 확인해주세요.',
+                'index': invalid_index,
+            }, status=400)
+
+        try:
+            result = patch_cashbook_month(book_type, year, month, rows, deleted_ids)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=409)
+
+        row_ids = iter(result['row_ids'])
+        return JsonResponse({
+            'success': True,
+            'ids': [next(row_ids) if target else None for target in targets],
+            'created': result['created'],
+            'updated': result['updated'],
+            'deleted': result['deleted'],
+            'totals': get_cashbook_balance(book_type, year, month),
+        })
+
     def cashbook_pdf(self, request, book_type, year, month):
         """출납장 PDF 출력"""
         income_entries = CashBook.objects.filter(
@@ -565,7 +526,7 @@ class CashBookAdminMixin:
 
         _, last_day = monthrange(year, month)
 
-        expense_categories = list(get_cashbook_categories('DEPOSIT', 'EXPENSE', year))
+        expense_categories = get_cashbook_catalog(year)['DEPOSIT']['expense_categories']
 
         expense_entries = list(DepositLedger.objects.filter(
             year=year, month=month
@@ -584,6 +545,8 @@ class CashBookAdminMixin:
         year_range = list(range(2024, 2028))
         month_range = list(range(1, 13))
 
+        deposit_snapshot = get_snapshot_index('CASHBOOK_DEPOSIT', year, month)
+
         context = {
             **self.admin_site.each_context(request),
             'title': f'예수금출납장(월간보고용) ({year}. {month}월)',
@@ -596,6 +559,9 @@ class CashBookAdminMixin:
             'last_day': last_day,
             'year_range': year_range,
             'month_range': month_range,
+            'is_confirmed': deposit_snapshot is not None,
+            'is_stale': deposit_snapshot is not None and deposit_snapshot.is_stale,
+            'confirmed_at': deposit_snapshot.confirmed_at if deposit_snapshot else None,
         }
 
         return TemplateResponse(request, 'admin/deposit_ledger_form.html', context)
@@ -608,43 +574,35 @@ class CashBookAdminMixin:
         year = int(request.POST.get('year'))
         month = int(request.POST.get('month'))
 
-        DepositLedger.objects.filter(year=year, month=month).delete()
-
-        saved_count = 0
-
-        idx = 0
-        while True:
-            day = request.POST.get(f'expense_day_{idx}')
-            if day is None:
-                break
-
-            category_id = request.POST.get(f'expense_category_{idx}', '').strip()
-            amount_str = request.POST.get(f'expense_amount_{idx}', '0').replace(',', '')
-            note = request.POST.get(f'expense_note_{idx}', '').strip()
-
-            if day and category_id:
-                try:
-                    from datetime import date
-                    entry_date = date(year, month, int(day))
-                    amount = Decimal(amount_str) if amount_str else Decimal('0')
-
-                    category = CashBookCategory.objects.get(pk=category_id)
-
-                    DepositLedger.objects.create(
-                        year=year,
-                        month=month,
-                        date=entry_date,
-                        category=category,
-                        description=category.name,
-                        amount=amount,
-                        note=note,
-                        order=saved_count,
-                    )
-                    saved_count += 1
-                except Exception:
-                    pass
-
-            idx += 1
+        from datetime import date
+
+        posted = [
+            row for row in get_posted_rows(request.POST, 'expense_', ['id', 'day', 'category', 'amount', 'note'])
+            if row['day'] and row['category']
+        ]
+        categories = CashBookCategory.objects.in_bulk(
+            {parse_posted_id(row['category']) for row in posted} - {None}
+        )
+
+        rows = []
+        for row in posted:
+            try:
+                category = categories[parse_posted_id(row['category'])]
+                rows.append({
+                    'id': parse_posted_id(row['id']),
+                    'fields': {
+                        'date': date(year, month, int(row['day'])),
+                        'category_id': category.pk,
+                        'description': category.name,
+                        'amount': Decimal((row['amount'] or '0').replace(',', '') or '0'),
+                        'note': row['note'] or '',
+                    },
+                })
+            except Exception:
+                pass
+
+        sync_deposit_ledger_month(year, month, rows)
+        saved_count = len(rows)
 
         messages.success(request, f'{year}년 {month}월 예수금출납장(월간보고용) 저장 완료 ({saved_count}건)')
 
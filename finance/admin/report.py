@@ -1,170 +1,150 @@
 # finance/admin/report.py
 # 월간보고서 및 스냅샷 관련 Admin
 
+import hashlib
+
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.template.response import TemplateResponse
-from django.http import JsonResponse
-from django.db.models import Sum
-from decimal import Decimal
-from collections import OrderedDict
+from django.http import JsonResponse, HttpResponse
+from django.db import transaction
+from django.utils.cache import (
+    add_never_cache_headers, get_conditional_response, patch_cache_control, patch_vary_headers,
+)
 
-from ..models import (
-    Budget, Transaction, CashBook, MonthlySnapshot, DepositLedger
+from ..models import CashBook, MonthlySnapshot, SnapshotIndex, SnapshotVersion
+from common.constants import REPORT_PERIODS, REPORT_COMPARES
+from common.utils import get_period_range, get_compare_range
+from ..selectors import (
+    get_expense_totals_by_account, get_expense_totals_by_window, get_monthly_expense_matrix, get_budget_skeleton,
+    get_cashbook_balance, get_cashbook_balances, get_cashbook_snapshot_entries, get_deposit_snapshot_entries,
+    get_card_snapshot_items, get_snapshot_index, get_cashbook_year_balances, get_deposit_month_totals,
+)
+from ..services import (
+    build_execution_tree, build_matrix_tree, build_period_tree, flatten_execution_lines, diff_execution_lines,
+    build_cashbook_snapshot, build_deposit_snapshot, build_card_snapshot, load_snapshot_version_data,
+    merge_budget_snapshot_months, build_annual_cashbook,
+)
+from ..cache import get_or_build, get_data_version, get_cached_version, get_or_build_immutable
+from ..snapshots import (
+    encode_snapshot, decode_snapshot, serialize_execution_tree, serialize_matrix_tree, normalize_snapshot,
+    iter_execution_items,
+    diff_snapshot_rows, diff_snapshot_totals, SNAPSHOT_SUMMARY_KEYS,
 )
 
 
+# 확정본 비교(snapshot_diff_view) 설정
+# sections: (제목, 행 목록 조회 함수, ID 키, 비교 필드, 표시명 필드)
+CASHBOOK_DIFF_SPEC = {
+    'sections': [
+        ('수입내역', lambda data: data.get('income_entries', []), 'id',
+         ('date', 'category__name', 'description', 'amount', 'bank_account__bank_name', 'note'),
+         ('category__name', 'description')),
+        ('지출내역', lambda data: data.get('expense_entries', []), 'id',
+         ('date', 'account__account_name', 'category__name', 'description', 'amount', 'bank_account__bank_name', 'note'),
+         ('account__account_name', 'category__name', 'description')),
+    ],
+    'totals': [
+        ('prev_balance', '전월이월'), ('income_total', '수입 합계'),
+        ('expense_total', '지출 합계'), ('next_balance', '차월이월'),
+    ],
+}
+
+SNAPSHOT_DIFF_SPECS = {
+    'CASHBOOK_BANK': CASHBOOK_DIFF_SPEC,
+    'CASHBOOK_CASH': CASHBOOK_DIFF_SPEC,
+    'CASHBOOK_DEPOSIT': {
+        'sections': [
+            ('지출내역', lambda data: data.get('expense_entries', []), 'id',
+             ('date', 'category__name', 'description', 'amount', 'note'),
+             ('category__name', 'description')),
+        ],
+        'totals': [('expense_total', '지출 합계')],
+    },
+    'BUDGET': {
+        'sections': [
+            ('계정별 집행내역', iter_execution_items, 'account_id',
+             ('annual_budget', 'cumulative', 'monthly', 'remaining'),
+             ('display_name',)),
+        ],
+        'totals': [
+            ('grand_total_budget', '예산 합계'), ('grand_total_executed', '누계 집행액'),
+            ('grand_total_month', '당월 집행액'), ('grand_total_remaining', '잔액'),
+        ],
+    },
+    'CARD_EXPENSE': {
+        'sections': [
+            ('카드사용내역', lambda data: data.get('card_items', []), 'id',
+             ('date', 'account_name', 'description', 'amount', 'approval_number'),
+             ('account_name', 'description')),
+        ],
+        'totals': [('total_amount', '사용 합계'), ('item_count', '건수')],
+    },
+    'ANNUAL': {
+        'sections': [
+            ('계정별 연간 집행내역', iter_execution_items, 'account_id',
+             ('annual_budget', 'cumulative', 'remaining'),
+             ('display_name',)),
+        ],
+        'totals': [
+            ('grand_total_budget', '예산 합계'), ('grand_total_executed', '연간 집행액'),
+            ('grand_total_remaining', '잔액'),
+        ],
+    },
+}
+
+# 연간결산에 포함하는 출납장 유형
+ANNUAL_CASHBOOK_TYPES = ('BANK', 'CASH', 'DEPOSIT')
+
+SNAPSHOT_DIFF_FIELD_LABELS = {
+    'date': '일자', 'category__name': '과목', 'account__account_name': '계정과목', 'account_name': '계정과목',
+    'description': '적요', 'amount': '금액', 'bank_account__bank_name': '은행', 'note': '비고',
+    'annual_budget': '예산', 'cumulative': '누계 집행액', 'monthly': '당월 집행액', 'remaining': '잔액',
+    'approval_number': '승인번호',
+}
+
+
 class ReportAdminMixin:
     """월간보고서 및 스냅샷 관련 Mixin"""
 
     def _get_budget_execution_data(self, year, month):
-        """월간예산집행내역 데이터 조회 (공통 로직)"""
-        from datetime import date
-
-        budgets = Budget.objects.filter(fiscal_year=year).select_related('account').order_by('account__code')
+        """월간예산집행내역 데이터 조회 (공통 로직) - 데이터 버전별 캐시"""
+        return get_or_build(
+            'budget_execution', (year, month),
+            lambda: self._build_budget_execution_data(year, month),
+        )
 
-        year_start = date(year, 1, 1)
-        month_start = date(year, month, 1)
-        if month == 12:
-            next_month_start = date(year + 1, 1, 1)
-        else:
-            next_month_start = date(year, month + 1, 1)
-
-        # 예수금출납장에서 '예수금(4대보험)', '예수금(원천세)' 합계 조회 (급여 항목에 합산용)
-        # 당월 예수금 합계
-        deposit_monthly = DepositLedger.objects.filter(
-            year=year, month=month,
-            category__name__in=['예수금(4대보험)', '예수금(원천세)']
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-
-        # 누계 예수금 합계 (1월부터 해당 월까지)
-        deposit_cumulative = DepositLedger.objects.filter(
-            year=year, month__lte=month,
-            category__name__in=['예수금(4대보험)', '예수금(원천세)']
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-
-        # 원본 PDF 형식: 대분류 > 중분류 > 계정명 구조
-        # 대분류별로 그룹화하고, 중분류별 소계 표시
-        execution_data = OrderedDict()
-
-        for budget in budgets:
-            acc = budget.account
-            large_cat = acc.category_large  # 인건비, 사업비
-            medium_cat = acc.category_medium  # 급여, 복리후생비 등
-
-            # 대분류별로 그룹화
-            if large_cat not in execution_data:
-                execution_data[large_cat] = {
-                    'medium_categories': OrderedDict(),
-                    'total_budget': Decimal('0'),
-                    'total_executed': Decimal('0'),
-                    'total_month': Decimal('0'),
-                }
+    def _build_budget_execution_data(self, year, month):
+        """월간예산집행내역 데이터 계산"""
+        # 원본 PDF 형식: 대분류 > 중분류 > 계정명 구조 (중분류별 소계 표시) - 편성 구조는 캐시 사용
+        skeleton = get_budget_skeleton(year)
 
-            # 중분류별로 그룹화
-            if medium_cat not in execution_data[large_cat]['medium_categories']:
-                execution_data[large_cat]['medium_categories'][medium_cat] = {
-                    'items': [],
-                    'subtotal_budget': Decimal('0'),
-                    'subtotal_executed': Decimal('0'),
-                    'subtotal_month': Decimal('0'),
-                }
+        # 전 계정의 누계/당월 집행액(예수금 합산 포함)을 그룹 쿼리로 일괄 조회
+        expense_totals = get_expense_totals_by_account(year, month, skeleton['accounts'])
 
-            # 누계 집행액 (연초부터 해당 월까지)
-            cumulative = Transaction.objects.filter(
-                account=acc,
-                date__gte=year_start,
-                date__lt=next_month_start,
-                transaction_type='EXPENSE',
-                status='APPROVED'
-            ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-
-            # 당월 집행액
-            monthly = Transaction.objects.filter(
-                account=acc,
-                date__gte=month_start,
-                date__lt=next_month_start,
-                transaction_type='EXPENSE',
-                status='APPROVED'
-            ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-
-            # '급여' 계정인 경우 예수금출납장 금액 합산
-            if acc.account_name == '급여':
-                cumulative += deposit_cumulative
-                monthly += deposit_monthly
-
-            annual_budget = budget.total_budget
-            exec_rate = (cumulative / annual_budget * 100) if annual_budget > 0 else Decimal('0')
-            remaining = annual_budget - cumulative
-
-            item = {
-                'account': acc,
-                'display_name': acc.account_name,
-                'annual_budget': annual_budget,
-                'cumulative': cumulative,
-                'exec_rate': exec_rate,
-                'monthly': monthly,
-                'remaining': remaining,
-                'note': '',
-            }
+        return build_execution_tree(skeleton, expense_totals)
 
-            med_data = execution_data[large_cat]['medium_categories'][medium_cat]
-            med_data['items'].append(item)
-            med_data['subtotal_budget'] += annual_budget
-            med_data['subtotal_executed'] += cumulative
-            med_data['subtotal_month'] += monthly
-
-            # 대분류 합계
-            execution_data[large_cat]['total_budget'] += annual_budget
-            execution_data[large_cat]['total_executed'] += cumulative
-            execution_data[large_cat]['total_month'] += monthly
-
-        # 각 레벨별 잔여예산 및 집행률 계산, row_count 계산
-        for large_cat, large_data in execution_data.items():
-            row_count = 0
-            for med_cat, med_data in large_data['medium_categories'].items():
-                med_data['subtotal_remaining'] = med_data['subtotal_budget'] - med_data['subtotal_executed']
-                med_data['subtotal_rate'] = (med_data['subtotal_executed'] / med_data['subtotal_budget'] * 100) if med_data['subtotal_budget'] > 0 else Decimal('0')
-                # 중분류별 행 수 = 항목 수 + (항목이 2개 이상일 때만 소계 1행)
-                item_count = len(med_data['items'])
-                med_data['show_subtotal'] = item_count > 1
-                med_data['row_count'] = item_count + (1 if item_count > 1 else 0)
-                row_count += med_data['row_count']
-
-            # 대분류 합계 행은 rowspan 밖에 있으므로 제외
-            large_data['row_count'] = row_count
-
-            large_data['total_remaining'] = large_data['total_budget'] - large_data['total_executed']
-            large_data['total_rate'] = (large_data['total_executed'] / large_data['total_budget'] * 100) if large_data['total_budget'] > 0 else Decimal('0')
-
-        # 전체 합계
-        grand_total_budget = sum(d['total_budget'] for d in execution_data.values())
-        grand_total_executed = sum(d['total_executed'] for d in execution_data.values())
-        grand_total_month = sum(d['total_month'] for d in execution_data.values())
-        grand_total_remaining = grand_total_budget - grand_total_executed
-        grand_total_rate = (grand_total_executed / grand_total_budget * 100) if grand_total_budget > 0 else Decimal('0')
-
-        return {
-            'execution_data': execution_data,
-            'grand_total_budget': grand_total_budget,
-            'grand_total_executed': grand_total_executed,
-            'grand_total_month': grand_total_month,
-            'grand_total_remaining': grand_total_remaining,
-            'grand_total_rate': grand_total_rate,
-        }
+    def _get_budget_execution_lines(self, year, month, version):
+        """월간예산집행내역 행 단위 값 (변경분 비교용) - 데이터 버전별 캐시"""
+        return get_or_build(
+            'budget_execution_lines', (year, month),
+            lambda: flatten_execution_lines(self._get_budget_execution_data(year, month)),
+            version=version,
+        )
 
     def budget_execution_view(self, request, year, month):
         """월간예산집행내역 조회"""
+        data_version = get_data_version()
         data = self._get_budget_execution_data(year, month)
+        # 변경분 조회 기준 버전의 행 값을 미리 캐시
+        self._get_budget_execution_lines(year, month, data_version)
 
         # 연월 선택용 범위 (기본 2025년)
         year_range = list(range(2024, 2028))
         month_range = list(range(1, 13))
 
-        # 확정 상태 조회 (스냅샷 존재 여부로 판단)
-        budget_snapshot = MonthlySnapshot.objects.filter(
-            snapshot_type='BUDGET', fiscal_year=year, month=month
-        ).first()
+        # 확정 상태 조회 (스냅샷 색인 존재 여부로 판단 - snapshot_data 미조회)
+        budget_snapshot = get_snapshot_index('BUDGET', year, month)
         is_confirmed = budget_snapshot is not None
         confirmed_at = budget_snapshot.confirmed_at if budget_snapshot else None
 
@@ -178,11 +158,40 @@ class ReportAdminMixin:
             'month_range': month_range,
             'is_confirmed': is_confirmed,
             'confirmed_at': confirmed_at,
+            'data_version': data_version,
             **data,
         }
 
         return TemplateResponse(request, 'admin/budget_execution.html', context)
 
+    def budget_execution_delta(self, request, year, month):
+        """월간예산집행내역 변경분 조회 (AJAX)
+
+        since(클라이언트가 가진 데이터 버전) 이후 값이 바뀐 행만 반환한다.
+        기준 버전의 캐시가 없으면 전체 행(full), 행 구성이 바뀌었으면 reload를 반환한다.
+        """
+        try:
+            since = int(request.GET.get('since', ''))
+        except ValueError:
+            since = None
+
+        version = get_data_version()
+        if since == version:
+            return JsonResponse({'success': True, 'version': version, 'lines': {}})
+
+        lines = self._get_budget_execution_lines(year, month, version)
+        old_lines = get_cached_version('budget_execution_lines', (year, month), since) if since else None
+        if old_lines is None:
+            return JsonResponse({'success': True, 'version': version, 'lines': lines, 'full': True})
+
+        changed, structure_changed = diff_execution_lines(old_lines, lines)
+        return JsonResponse({
+            'success': True,
+            'version': version,
+            'lines': changed,
+            'reload': structure_changed,
+        })
+
     def budget_execution_print(self, request, year, month):
         """월간예산집행내역 출력용"""
         data = self._get_budget_execution_data(year, month)
@@ -196,6 +205,272 @@ class ReportAdminMixin:
 
         return TemplateResponse(request, 'admin/budget_execution_print.html', context)
 
+    def _get_budget_matrix_data(self, year):
+        """연간 월별 예산집행 현황 데이터 조회 - 데이터 버전별 캐시"""
+        return get_or_build(
+            'budget_matrix', (year,),
+            lambda: self._build_budget_matrix_data(year),
+        )
+
+    def _build_budget_matrix_data(self, year):
+        """연간 월별 예산집행 현황 계산 (계정 × 1~12월)"""
+        skeleton = get_budget_skeleton(year)
+
+        # 계정 × 월 집행액(예수금 합산 포함)을 그룹 쿼리로 일괄 조회
+        expense_matrix = get_monthly_expense_matrix(year)
+
+        return build_matrix_tree(skeleton, expense_matrix)
+
+    def budget_matrix_view(self, request, year):
+        """연간 월별 예산집행 현황 조회"""
+        data = self._get_budget_matrix_data(year)
+
+        year_range = list(range(2024, 2028))
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f'{year}년 월별 예산집행 현황',
+            'opts': self.model._meta,
+            'year': year,
+            'year_range': year_range,
+            'month_range': list(range(1, 13)),
+            **data,
+        }
+
+        return TemplateResponse(request, 'admin/budget_matrix.html', context)
+
+    def budget_matrix_print(self, request, year):
+        """연간 월별 예산집행 현황 출력용"""
+        data = self._get_budget_matrix_data(year)
+
+        context = {
+            'title': f'{year}년 월별 예산집행 현황',
+            'year': year,
+            'month_range': list(range(1, 13)),
+            **data,
+        }
+
+        return TemplateResponse(request, 'admin/budget_matrix_print.html', context)
+
+    def _build_annual_snapshot_data(self, year):
+        """연간결산 데이터 구성 - 월별 확정 스냅샷 병합
+
+        확정된(재확정필요 제외) 월은 스냅샷 값을 그대로 쓰고, 확정되지 않은 월만 집계 테이블에서 조회한다.
+        출납장은 색인에 보관된 월 합계만 사용하므로 스냅샷 JSON은 예산집행 스냅샷만 읽는다.
+        """
+        skeleton = get_budget_skeleton(year)
+        budget_snapshots = {
+            month: decode_snapshot(raw) for month, raw in MonthlySnapshot.objects.filter(
+                snapshot_type='BUDGET', fiscal_year=year, is_confirmed=True, is_stale=False,
+            ).values_list('month', 'snapshot_data')
+        }
+        live_months = [month for month in range(1, 13) if month not in budget_snapshots]
+        matrix = get_monthly_expense_matrix(year, live_months) if live_months else {}
+        merge_budget_snapshot_months(matrix, budget_snapshots)
+        data = serialize_matrix_tree(build_matrix_tree(skeleton, matrix))
+
+        snapshot_types = [f'CASHBOOK_{book_type}' for book_type in ANNUAL_CASHBOOK_TYPES]
+        confirmed_totals = {
+            (row['snapshot_type'], row['month']): row['totals'] for row in SnapshotIndex.objects.filter(
+                fiscal_year=year, snapshot_type__in=snapshot_types, is_stale=False,
+            ).values('snapshot_type', 'month', 'totals')
+        }
+
+        cashbooks = {}
+        for book_type, snapshot_type in zip(ANNUAL_CASHBOOK_TYPES, snapshot_types):
+            live = None
+            if any((snapshot_type, month) not in confirmed_totals for month in range(1, 13)):
+                if book_type == 'DEPOSIT':
+                    deposit_totals = get_deposit_month_totals(year)
+                    live = [{'expense_total': deposit_totals.get(month, 0)} for month in range(1, 13)]
+                else:
+                    live = get_cashbook_year_balances(book_type, year)
+
+            months = []
+            for month in range(1, 13):
+                totals = confirmed_totals.get((snapshot_type, month))
+                source = totals if totals is not None else live[month - 1]
+                months.append({
+                    'month': month,
+                    **{key: source.get(key, 0) for key in SNAPSHOT_SUMMARY_KEYS[snapshot_type][1]},
+                    'is_confirmed': totals is not None,
+                })
+            cashbooks[book_type] = build_annual_cashbook(months)
+
+        data['cashbooks'] = cashbooks
+        data['confirmed_months'] = {
+            'BUDGET': sorted(budget_snapshots),
+            **{
+                snapshot_type: [row['month'] for row in cashbooks[book_type]['months'] if row['is_confirmed']]
+                for book_type, snapshot_type in zip(ANNUAL_CASHBOOK_TYPES, snapshot_types)
+            },
+        }
+        return data
+
+    def annual_report_view(self, request, year):
+        """연간결산 조회 - 확정본이 있으면 확정본, 없으면 월별 확정 스냅샷 병합 결과"""
+        snapshot = MonthlySnapshot.objects.filter(snapshot_type='ANNUAL', fiscal_year=year, month=12).first()
+        return self._render_annual_report(request, year, snapshot)
+
+    def _render_annual_report(self, request, year, snapshot=None):
+        data = decode_snapshot(snapshot.snapshot_data) if snapshot else self._build_annual_snapshot_data(year)
+
+        cashbooks = data.get('cashbooks', {})
+        cashbook_rows = [
+            {book_type: cashbooks[book_type]['months'][i] for book_type in ANNUAL_CASHBOOK_TYPES if book_type in cashbooks}
+            for i in range(12)
+        ]
+        type_names = dict(MonthlySnapshot.SNAPSHOT_TYPES)
+        sources = [
+            (type_names.get(snapshot_type, snapshot_type), len(months))
+            for snapshot_type, months in data.get('confirmed_months', {}).items()
+        ]
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f'{year}년 연간결산',
+            'opts': self.model._meta,
+            'year': year,
+            'year_range': list(range(2024, 2028)),
+            'month_range': list(range(1, 13)),
+            'snapshot': snapshot,
+            'is_confirmed': snapshot is not None,
+            'is_stale': snapshot is not None and snapshot.is_stale,
+            'sources': sources,
+            'cashbooks': cashbooks,
+            'cashbook_rows': cashbook_rows,
+            **{key: data.get(key) for key in (
+                'execution_data', 'grand_total_budget', 'grand_total_executed', 'grand_total_months',
+                'grand_total_remaining', 'grand_total_rate',
+            )},
+        }
+
+        return TemplateResponse(request, 'admin/annual_report.html', context)
+
+    def snapshot_confirm_annual(self, request):
+        """연간결산 스냅샷 확정 (월별 확정 스냅샷 병합, 미확정 월은 집계 테이블 기준)"""
+        from django.utils import timezone
+
+        if request.method != 'POST':
+            return redirect('admin:confirmed_report')
+
+        year = int(request.POST.get('year'))
+        snapshot_data = self._build_annual_snapshot_data(year)
+
+        MonthlySnapshot.objects.update_or_create(
+            snapshot_type='ANNUAL',
+            fiscal_year=year,
+            month=12,
+            defaults={
+                'snapshot_data': encode_snapshot(snapshot_data),
+                'is_confirmed': True,
+                'confirmed_at': timezone.now(),
+                'confirmed_by': request.user.username if request.user.is_authenticated else '',
+                'is_stale': False,
+            }
+        )
+
+        messages.success(request, f'{year}년 연간결산이 확정되었습니다.')
+        unconfirmed = [month for month in range(1, 13) if month not in snapshot_data['confirmed_months']['BUDGET']]
+        if unconfirmed:
+            messages.warning(
+                request,
+                f"예산집행내역 미확정 월({', '.join(map(str, unconfirmed))}월)은 현재 데이터로 반영되었습니다.",
+            )
+        return redirect('admin:annual_report', year=year)
+
+    def _get_budget_period_data(self, start, end, compare_range):
+        """기간별 예산집행 데이터 조회 - 데이터 버전별 캐시"""
+        return get_or_build(
+            'budget_period', (start, end, *(compare_range or ())),
+            lambda: self._build_budget_period_data(start, end, compare_range),
+        )
+
+    def _build_budget_period_data(self, start, end, compare_range):
+        """기간별 예산집행 데이터 계산 (조회 기간 + 비교 기간을 한 번의 그룹 쿼리로 집계)"""
+        # 편성 구조와 예산액은 조회 시작일의 회계연도 기준
+        skeleton = get_budget_skeleton(start.year)
+
+        windows = {'current': (start, end)}
+        if compare_range:
+            windows['compare'] = compare_range
+        totals = get_expense_totals_by_window(windows, skeleton['accounts'])
+
+        return build_period_tree(skeleton, totals)
+
+    def budget_period_view(self, request):
+        """기간별(분기/반기/임의 기간) 예산집행 현황 조회
+
+        GET 파라미터:
+            year, period: Q1~Q4, H1, H2, YEAR 또는 CUSTOM (CUSTOM이면 start, end 사용)
+            compare: PREV_YEAR, PREV_PERIOD, NONE 또는 CUSTOM (CUSTOM이면 compare_start, compare_end 사용)
+        """
+        from datetime import date
+
+        today = date.today()
+        period = request.GET.get('period', 'Q1')
+        compare = request.GET.get('compare', 'PREV_YEAR')
+
+        try:
+            year = int(request.GET.get('year') or today.year)
+            if period == 'CUSTOM':
+                start = date.fromisoformat(request.GET.get('start', ''))
+                end = date.fromisoformat(request.GET.get('end', ''))
+            else:
+                start, end = get_period_range(year, period)
+
+            if compare == 'CUSTOM':
+                compare_range = (
+                    date.fromisoformat(request.GET.get('compare_start', '')),
+                    date.fromisoformat(request.GET.get('compare_end', '')),
+                )
+            else:
+                compare_range = get_compare_range(start, end, compare)
+        except (ValueError, KeyError):
+            messages.error(request, '조회 기간이 올바르지 않습니다.')
+            period, compare, year = 'Q1', 'PREV_YEAR', today.year
+            start, end = get_period_range(year, period)
+            compare_range = get_compare_range(start, end, compare)
+
+        if start > end or (compare_range and compare_range[0] > compare_range[1]):
+            messages.error(request, '시작일이 종료일보다 늦습니다.')
+            start, end = end, start
+            if compare_range and compare_range[0] > compare_range[1]:
+                compare_range = (compare_range[1], compare_range[0])
+
+        data = self._get_budget_period_data(start, end, compare_range)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f'기간별 예산집행 현황 ({start:%Y.%m.%d} ~ {end:%Y.%m.%d})',
+            'opts': self.model._meta,
+            'year': start.year,
+            'year_range': list(range(2024, 2028)),
+            'period': period,
+            'compare': compare,
+            'period_choices': REPORT_PERIODS,
+            'compare_choices': REPORT_COMPARES,
+            'start': start,
+            'end': end,
+            'compare_range': compare_range,
+            **data,
+        }
+
+        return TemplateResponse(request, 'admin/budget_period.html', context)
+
+    def _build_cashbook_snapshot_data(self, book_type, year, month):
+        """출납장 스냅샷 데이터 구성 (예수금출납장은 DepositLedger 기준)"""
+        if book_type == 'DEPOSIT':
+            return build_deposit_snapshot(get_deposit_snapshot_entries((year, month), (year, month)).get((year, month), []))
+
+        entries = get_cashbook_snapshot_entries([book_type], (year, month), (year, month)).get(
+            (book_type, year, month), {'INCOME': [], 'EXPENSE': []}
+        )
+
+        # 전월이월 (출납장월별잔액 색인에서 조회 - 이전 월 확정 여부와 무관)
+        prev_balance = get_cashbook_balance(book_type, year, month)['prev_balance']
+        return build_cashbook_snapshot(entries['INCOME'], entries['EXPENSE'], prev_balance)
+
     def snapshot_confirm_cashbook(self, request):
         """예금/현금출납장 스냅샷 확정"""
         from django.utils import timezone
@@ -205,73 +480,21 @@ class ReportAdminMixin:
 
         year = int(request.POST.get('year'))
         month = int(request.POST.get('month'))
-        requested_snapshot_type = request.POST.get('snapshot_type')  # CASHBOOK_BANK or CASHBOOK_CASH
+        requested_snapshot_type = request.POST.get('snapshot_type')  # CASHBOOK_BANK, CASHBOOK_CASH or CASHBOOK_DEPOSIT
 
         # 특정 타입만 확정 (지정된 경우)
         if requested_snapshot_type == 'CASHBOOK_BANK':
             types_to_confirm = [('BANK', 'CASHBOOK_BANK')]
         elif requested_snapshot_type == 'CASHBOOK_CASH':
             types_to_confirm = [('CASH', 'CASHBOOK_CASH')]
+        elif requested_snapshot_type == 'CASHBOOK_DEPOSIT':
+            types_to_confirm = [('DEPOSIT', 'CASHBOOK_DEPOSIT')]
         else:
             # 둘 다 확정 (이전 호환성)
             types_to_confirm = [('BANK', 'CASHBOOK_BANK'), ('CASH', 'CASHBOOK_CASH')]
 
         for book_type, snapshot_type in types_to_confirm:
-            # 현재 데이터 조회
-            income_entries = list(CashBook.objects.filter(
-                book_type=book_type, year=year, month=month, entry_type='INCOME'
-            ).select_related('category', 'bank_account').order_by('order').values(
-                'id', 'date', 'category__name', 'description', 'amount', 'bank_account__bank_name', 'note', 'order'
-            ))
-
-            expense_entries = list(CashBook.objects.filter(
-                book_type=book_type, year=year, month=month, entry_type='EXPENSE'
-            ).select_related('account', 'category', 'bank_account').order_by('order').values(
-                'id', 'date', 'account__account_name', 'category__name', 'description', 'amount', 'bank_account__bank_name', 'note', 'order'
-            ))
-
-            # 합계 계산
-            income_total = sum(e['amount'] or 0 for e in income_entries)
-            expense_total = sum(e['amount'] or 0 for e in expense_entries)
-
-            # 전월이월 계산 (직전 월 스냅샷에서 차월이월 가져오기)
-            prev_balance = Decimal('0')
-            if month == 1:
-                prev_snapshot = MonthlySnapshot.objects.filter(
-                    snapshot_type=snapshot_type, fiscal_year=year-1, month=12
-                ).first()
-            else:
-                prev_snapshot = MonthlySnapshot.objects.filter(
-                    snapshot_type=snapshot_type, fiscal_year=year, month=month-1
-                ).first()
-            if prev_snapshot and prev_snapshot.snapshot_data.get('next_balance'):
-                prev_balance = Decimal(str(prev_snapshot.snapshot_data['next_balance']))
-
-            # 차월이월 계산
-            next_balance = prev_balance + income_total - expense_total
-
-            # 날짜 직렬화를 위한 변환
-            def serialize_entries(entries):
-                result = []
-                for e in entries:
-                    item = dict(e)
-                    if item.get('date'):
-                        item['date'] = item['date'].isoformat()
-                    # Decimal을 float로 변환
-                    if item.get('amount'):
-                        item['amount'] = float(item['amount'])
-                    result.append(item)
-                return result
-
-            # 스냅샷 데이터 구성
-            snapshot_data = {
-                'income_entries': serialize_entries(income_entries),
-                'expense_entries': serialize_entries(expense_entries),
-                'income_total': float(income_total),
-                'expense_total': float(expense_total),
-                'prev_balance': float(prev_balance),
-                'next_balance': float(next_balance),
-            }
+            snapshot_data = self._build_cashbook_snapshot_data(book_type, year, month)
 
             # 스냅샷 생성 또는 업데이트
             snapshot, created = MonthlySnapshot.objects.update_or_create(
@@ -279,8 +502,9 @@ class ReportAdminMixin:
                 fiscal_year=year,
                 month=month,
                 defaults={
-                    'snapshot_data': snapshot_data,
+                    'snapshot_data': encode_snapshot(snapshot_data),
                     'is_confirmed': True,
+                    'is_stale': False,
                     'confirmed_at': timezone.now(),
                     'confirmed_by': request.user.username if request.user.is_authenticated else '',
                 }
@@ -291,11 +515,146 @@ class ReportAdminMixin:
             msg = f'{year}년 {month}월 예금출납장이 확정되었습니다.'
         elif requested_snapshot_type == 'CASHBOOK_CASH':
             msg = f'{year}년 {month}월 현금출납장이 확정되었습니다.'
+        elif requested_snapshot_type == 'CASHBOOK_DEPOSIT':
+            messages.success(request, f'{year}년 {month}월 예수금출납장이 확정되었습니다.')
+            return redirect('admin:deposit_ledger', year=year, month=month)
         else:
             msg = f'{year}년 {month}월 예금/현금출납장이 확정되었습니다.'
         messages.success(request, msg)
         return redirect('admin:cashbook_combined', year=year, month=month)
 
+    def snapshot_reconfirm_chain(self, request):
+        """재확정필요 출납장 스냅샷 일괄 재확정
+
+        가장 이른 재확정필요 월의 전월이월만 색인에서 조회하고, 이후 월은 직전 월에서 계산한
+        차월이월을 그대로 이어받아 한 트랜잭션 안에서 다시 확정한다.
+        """
+        from django.utils import timezone
+
+        if request.method != 'POST':
+            return redirect('admin:confirmed_report')
+
+        snapshot_type = request.POST.get('snapshot_type')
+        book_type = snapshot_type.replace('CASHBOOK_', '', 1) if snapshot_type else ''
+        if book_type not in dict(CashBook.BOOK_TYPES):
+            messages.error(request, '재확정할 출납장 유형이 올바르지 않습니다.')
+            return redirect('admin:confirmed_report')
+
+        confirmed_by = request.user.username if request.user.is_authenticated else ''
+        with transaction.atomic():
+            stale_snapshots = list(MonthlySnapshot.objects.select_for_update().filter(
+                snapshot_type=snapshot_type, is_stale=True
+            ).order_by('fiscal_year', 'month'))
+
+            if not stale_snapshots:
+                messages.info(request, '재확정이 필요한 스냅샷이 없습니다.')
+                return redirect('admin:confirmed_report')
+
+            first, last = stale_snapshots[0], stale_snapshots[-1]
+            start, end = (first.fiscal_year, first.month), (last.fiscal_year, last.month)
+            now = timezone.now()
+
+            def reconfirm(snapshot, snapshot_data):
+                snapshot.snapshot_data = encode_snapshot(snapshot_data)
+                snapshot.is_stale = False
+                snapshot.confirmed_at = now
+                snapshot.confirmed_by = confirmed_by
+                snapshot.save(update_fields=[
+                    'snapshot_data', 'content_hash', 'is_stale', 'confirmed_at', 'confirmed_by', 'updated_at',
+                ])
+
+            if book_type == 'DEPOSIT':
+                # 예수금출납장은 이월 잔액이 없으므로 월별로 독립 재확정
+                entries_by_month = get_deposit_snapshot_entries(start, end)
+                for snapshot in stale_snapshots:
+                    reconfirm(snapshot, build_deposit_snapshot(
+                        entries_by_month.get((snapshot.fiscal_year, snapshot.month), [])
+                    ))
+            else:
+                entries_by_month = get_cashbook_snapshot_entries([book_type], start, end)
+                stale_by_month = {(snap.fiscal_year, snap.month): snap for snap in stale_snapshots}
+
+                balance = get_cashbook_balance(book_type, *start)['prev_balance']
+                year, month = start
+                while (year, month) <= end:
+                    entries = entries_by_month.get((book_type, year, month), {'INCOME': [], 'EXPENSE': []})
+                    snapshot_data = build_cashbook_snapshot(entries['INCOME'], entries['EXPENSE'], balance)
+                    if (year, month) in stale_by_month:
+                        reconfirm(stale_by_month[(year, month)], snapshot_data)
+
+                    # 다음 월의 전월이월은 방금 계산한 차월이월
+                    balance = snapshot_data['next_balance']
+                    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+        type_name = dict(MonthlySnapshot.SNAPSHOT_TYPES).get(snapshot_type, snapshot_type)
+        messages.success(
+            request,
+            f'{type_name} {first.fiscal_year}년 {first.month}월 ~ {last.fiscal_year}년 {last.month}월 '
+            f'{len(stale_snapshots)}건이 재확정되었습니다.'
+        )
+        return redirect('admin:confirmed_report')
+
+    def _build_month_close_data(self, year, month):
+        """월 마감 스냅샷 5종 데이터 구성
+
+        출납장(예금/현금) 내역과 두 유형의 전월이월, 예수금출납장, 카드 지출을 원본별로 한 번씩만
+        조회해 메모리에서 구성한다. 예산집행내역은 예산집행 화면과 같은 데이터 버전별 캐시를 사용한다.
+        """
+        period = (year, month)
+        cashbook_entries = get_cashbook_snapshot_entries(['BANK', 'CASH'], period, period)
+        balances = get_cashbook_balances(['BANK', 'CASH'], year, month)
+
+        snapshot_data = {}
+        for book_type in ('BANK', 'CASH'):
+            entries = cashbook_entries.get((book_type, year, month), {'INCOME': [], 'EXPENSE': []})
+            snapshot_data[f'CASHBOOK_{book_type}'] = build_cashbook_snapshot(
+                entries['INCOME'], entries['EXPENSE'], balances[book_type]['prev_balance']
+            )
+        snapshot_data['CASHBOOK_DEPOSIT'] = build_deposit_snapshot(
+            get_deposit_snapshot_entries(period, period).get(period, [])
+        )
+        snapshot_data['CARD_EXPENSE'] = build_card_snapshot(get_card_snapshot_items(year, month))
+        snapshot_data['BUDGET'] = serialize_execution_tree(self._get_budget_execution_data(year, month))
+        return snapshot_data
+
+    def snapshot_confirm_month(self, request):
+        """월 마감 일괄 확정 (예금/현금/예수금출납장, 카드사용내역, 예산집행내역)
+
+        모든 스냅샷 데이터를 _build_month_close_data로 구성해 한 트랜잭션으로 저장한다.
+        하나라도 실패하면 전체가 확정되지 않는다.
+        """
+        from django.urls import reverse
+        from django.utils import timezone
+
+        if request.method != 'POST':
+            return redirect('admin:confirmed_report')
+
+        year = int(request.POST.get('year'))
+        month = int(request.POST.get('month'))
+        confirmed_by = request.user.username if request.user.is_authenticated else ''
+
+        with transaction.atomic():
+            snapshot_data = self._build_month_close_data(year, month)
+
+            now = timezone.now()
+            existing = {
+                snapshot.snapshot_type: snapshot
+                for snapshot in MonthlySnapshot.objects.select_for_update().filter(fiscal_year=year, month=month)
+            }
+            for snapshot_type, data in snapshot_data.items():
+                snapshot = existing.get(snapshot_type) or MonthlySnapshot(
+                    snapshot_type=snapshot_type, fiscal_year=year, month=month
+                )
+                snapshot.snapshot_data = encode_snapshot(data)
+                snapshot.is_confirmed = True
+                snapshot.is_stale = False
+                snapshot.confirmed_at = now
+                snapshot.confirmed_by = confirmed_by
+                snapshot.save()
+
+        messages.success(request, f'{year}년 {month}월 월 마감 확정이 완료되었습니다. ({len(snapshot_data)}종)')
+        return redirect(f"{reverse('admin:confirmed_report')}?year={year}&month={month}")
+
     def snapshot_confirm_budget(self, request):
         """예산집행내역 스냅샷 확정"""
         from django.utils import timezone
@@ -309,54 +668,8 @@ class ReportAdminMixin:
         # 예산집행 데이터 조회
         data = self._get_budget_execution_data(year, month)
 
-        # execution_data를 JSON 직렬화 가능한 형태로 변환
-        def serialize_execution_data(execution_data):
-            result = {}
-            for large_cat, large_data in execution_data.items():
-                result[large_cat] = {
-                    'medium_categories': {},
-                    'total_budget': float(large_data['total_budget']),
-                    'total_executed': float(large_data['total_executed']),
-                    'total_month': float(large_data['total_month']),
-                    'total_remaining': float(large_data['total_remaining']),
-                    'total_rate': float(large_data['total_rate']),
-                    'row_count': large_data['row_count'],
-                }
-                for med_cat, med_data in large_data['medium_categories'].items():
-                    items = []
-                    for item in med_data['items']:
-                        items.append({
-                            'account_id': item['account'].id,
-                            'account_code': item['account'].code,
-                            'display_name': item['display_name'],
-                            'annual_budget': float(item['annual_budget']),
-                            'cumulative': float(item['cumulative']),
-                            'exec_rate': float(item['exec_rate']),
-                            'monthly': float(item['monthly']),
-                            'remaining': float(item['remaining']),
-                            'note': item['note'],
-                        })
-                    result[large_cat]['medium_categories'][med_cat] = {
-                        'items': items,
-                        'subtotal_budget': float(med_data['subtotal_budget']),
-                        'subtotal_executed': float(med_data['subtotal_executed']),
-                        'subtotal_month': float(med_data['subtotal_month']),
-                        'subtotal_remaining': float(med_data['subtotal_remaining']),
-                        'subtotal_rate': float(med_data['subtotal_rate']),
-                        'row_count': med_data['row_count'],
-                        'show_subtotal': med_data['show_subtotal'],
-                    }
-            return result
-
         # 스냅샷 데이터 구성
-        snapshot_data = {
-            'execution_data': serialize_execution_data(data['execution_data']),
-            'grand_total_budget': float(data['grand_total_budget']),
-            'grand_total_executed': float(data['grand_total_executed']),
-            'grand_total_month': float(data['grand_total_month']),
-            'grand_total_remaining': float(data['grand_total_remaining']),
-            'grand_total_rate': float(data['grand_total_rate']),
-        }
+        snapshot_data = serialize_execution_tree(data)
 
         # 스냅샷 생성 또는 업데이트
         snapshot, created = MonthlySnapshot.objects.update_or_create(
@@ -364,8 +677,9 @@ class ReportAdminMixin:
             fiscal_year=year,
             month=month,
             defaults={
-                'snapshot_data': snapshot_data,
+                'snapshot_data': encode_snapshot(snapshot_data),
                 'is_confirmed': True,
+                'is_stale': False,
                 'confirmed_at': timezone.now(),
                 'confirmed_by': request.user.username if request.user.is_authenticated else '',
             }
@@ -374,6 +688,147 @@ class ReportAdminMixin:
         messages.success(request, f'{year}년 {month}월 예산집행내역이 확정되었습니다.')
         return redirect('admin:budget_execution', year=year, month=month)
 
+    def _build_live_snapshot_data(self, snapshot_type, year, month):
+        """스냅샷 유형별 현재 데이터를 확정 시와 같은 구조로 구성"""
+        if snapshot_type == 'BUDGET':
+            return serialize_execution_tree(self._get_budget_execution_data(year, month))
+        if snapshot_type == 'CARD_EXPENSE':
+            return self._build_card_snapshot_data(year, month)
+        if snapshot_type == 'ANNUAL':
+            return self._build_annual_snapshot_data(year)
+        return self._build_cashbook_snapshot_data(snapshot_type.replace('CASHBOOK_', '', 1), year, month)
+
+    def snapshot_diff_view(self, request, snapshot_type, year, month):
+        """확정본과 현재 데이터 비교 (확정해제 전 변경내역 확인용)"""
+        type_name = dict(MonthlySnapshot.SNAPSHOT_TYPES).get(snapshot_type)
+        spec = SNAPSHOT_DIFF_SPECS.get(snapshot_type)
+        if not type_name or not spec:
+            messages.error(request, '비교할 수 없는 스냅샷 유형입니다.')
+            return redirect('admin:confirmed_report')
+
+        snapshot = MonthlySnapshot.objects.filter(
+            snapshot_type=snapshot_type, fiscal_year=year, month=month
+        ).first()
+        if not snapshot:
+            messages.warning(request, f'{year}년 {month}월 {type_name}이(가) 확정되지 않았습니다.')
+            return redirect('admin:confirmed_report')
+
+        confirmed = decode_snapshot(snapshot.snapshot_data)
+        live = normalize_snapshot(self._build_live_snapshot_data(snapshot_type, year, month))
+
+        def describe(row, label_fields):
+            return {
+                'label': ' / '.join(dict.fromkeys(str(row[field]) for field in label_fields if row.get(field))) or '-',
+                'date': row.get('date'),
+                'amount': row.get('amount', row.get('cumulative')),
+            }
+
+        sections = []
+        change_count = 0
+        for title, get_rows, key, fields, label_fields in spec['sections']:
+            diff = diff_snapshot_rows(get_rows(confirmed), get_rows(live), key, fields)
+            change_count += len(diff['added']) + len(diff['removed']) + len(diff['changed'])
+            sections.append({
+                'title': title,
+                'added': [describe(row, label_fields) for row in diff['added']],
+                'removed': [describe(row, label_fields) for row in diff['removed']],
+                'changed': [{
+                    **describe(item['new'], label_fields),
+                    'fields': [
+                        {'name': SNAPSHOT_DIFF_FIELD_LABELS.get(field, field), 'old': old, 'new': new}
+                        for field, (old, new) in item['fields'].items()
+                    ],
+                } for item in diff['changed']],
+            })
+
+        totals = diff_snapshot_totals(confirmed, live, [key for key, _ in spec['totals']])
+        total_labels = dict(spec['totals'])
+        for total in totals:
+            total['label'] = total_labels[total['key']]
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f'{type_name} 확정본 비교 ({year}. {month}월)',
+            'opts': self.model._meta,
+            'snapshot': snapshot,
+            'snapshot_type': snapshot_type,
+            'type_name': type_name,
+            'year': year,
+            'month': month,
+            'sections': sections,
+            'totals': totals,
+            'change_count': change_count,
+            'has_changes': change_count > 0 or any(total['delta'] for total in totals),
+        }
+
+        return TemplateResponse(request, 'admin/snapshot_diff.html', context)
+
+    def snapshot_history_view(self, request, snapshot_type, year, month):
+        """스냅샷 확정 이력 조회 - ?version=N 이면 해당 버전 확정본을 그대로 표시"""
+        type_name = dict(MonthlySnapshot.SNAPSHOT_TYPES).get(snapshot_type)
+        if not type_name:
+            messages.error(request, '조회할 수 없는 스냅샷 유형입니다.')
+            return redirect('admin:confirmed_report')
+
+        versions = list(SnapshotVersion.objects.filter(
+            snapshot_type=snapshot_type, fiscal_year=year, month=month
+        ).order_by('-version').values(
+            'version', 'action', 'is_full', 'row_count', 'totals', 'confirmed_at', 'confirmed_by'
+        ))
+
+        selected = request.GET.get('version')
+        if selected:
+            version = next((v for v in versions if str(v['version']) == selected and v['action'] == 'CONFIRM'), None)
+            if version:
+                return self._render_snapshot_version(request, snapshot_type, year, month, version)
+            messages.warning(request, f'{selected} 버전 확정본이 없습니다.')
+
+        summary_keys = SNAPSHOT_SUMMARY_KEYS.get(snapshot_type, ((), ()))[1]
+        total_columns = [
+            (key, label) for key, label in SNAPSHOT_DIFF_SPECS.get(snapshot_type, {}).get('totals', [])
+            if key in summary_keys
+        ]
+        action_names = dict(SnapshotVersion.ACTIONS)
+        for version in versions:
+            version['action_display'] = action_names.get(version['action'], version['action'])
+            version['total_values'] = [version['totals'].get(key) for key, _ in total_columns]
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f'{type_name} 확정 이력 ({year}. {month}월)',
+            'opts': self.model._meta,
+            'snapshot_type': snapshot_type,
+            'type_name': type_name,
+            'year': year,
+            'month': month,
+            'versions': versions,
+            'total_labels': [label for _, label in total_columns],
+        }
+
+        return TemplateResponse(request, 'admin/snapshot_history.html', context)
+
+    def _render_snapshot_version(self, request, snapshot_type, year, month, version):
+        """이력 버전을 복원해 확정본 화면으로 표시"""
+        data, _ = load_snapshot_version_data(snapshot_type, year, month, version['version'])
+        snapshot = MonthlySnapshot(
+            snapshot_type=snapshot_type, fiscal_year=year, month=month, snapshot_data=data,
+            confirmed_at=version['confirmed_at'], confirmed_by=version['confirmed_by'],
+        )
+
+        if snapshot_type == 'ANNUAL':
+            response = self._render_annual_report(request, year, snapshot)
+        elif snapshot_type == 'BUDGET':
+            response = self._render_confirmed_budget(request, snapshot, year, month)
+        elif snapshot_type == 'CARD_EXPENSE':
+            response = self._render_confirmed_card(request, snapshot, year, month)
+        else:
+            book_type = snapshot_type.replace('CASHBOOK_', '')
+            book_type_display = dict(CashBook.BOOK_TYPES).get(book_type, '출납장')
+            response = self._render_confirmed_cashbook(request, snapshot, book_type, book_type_display, year, month)
+
+        response.context_data['title'] += f" - 이력 v{version['version']}"
+        return response
+
     def snapshot_cancel(self, request, snapshot_type, year, month):
         """스냅샷 확정 해제"""
         if request.method != 'POST':
@@ -390,9 +845,13 @@ class ReportAdminMixin:
                 'BUDGET': '예산집행내역',
                 'CASHBOOK_BANK': '예금출납장',
                 'CASHBOOK_CASH': '현금출납장',
+                'CASHBOOK_DEPOSIT': '예수금출납장',
                 'CARD_EXPENSE': '카드사용내역',
+                'ANNUAL': '연간결산',
             }
             type_name = type_names.get(snapshot_type, snapshot_type)
+            # 확정해제 이력의 처리자
+            snapshot._cancelled_by = request.user.username if request.user.is_authenticated else ''
             snapshot.delete()
             msg = f'{year}년 {month}월 {type_name} 확정이 해제되었습니다.'
 
@@ -406,6 +865,10 @@ class ReportAdminMixin:
             return redirect('admin:budget_execution', year=year, month=month)
         elif snapshot_type == 'CARD_EXPENSE':
             return redirect('admin:card_upload')
+        elif snapshot_type == 'CASHBOOK_DEPOSIT':
+            return redirect('admin:deposit_ledger', year=year, month=month)
+        elif snapshot_type == 'ANNUAL':
+            return redirect('admin:annual_report', year=year)
         else:
             return redirect('admin:cashbook_combined', year=year, month=month)
 
@@ -421,9 +884,15 @@ class ReportAdminMixin:
         years = list(range(2027, 2023, -1))
         months = list(range(1, 13))
 
-        # 확정된 스냅샷 목록 조회
-        confirmed_snapshots = MonthlySnapshot.objects.filter(
-                    ).values('snapshot_type', 'fiscal_year', 'month', 'confirmed_at').order_by('-fiscal_year', '-month')
+        # 확정된 스냅샷 목록 조회 (색인 테이블 - snapshot_data 미조회)
+        confirmed_snapshots = SnapshotIndex.objects.values(
+            'snapshot_type', 'fiscal_year', 'month', 'confirmed_at', 'confirmed_by', 'is_stale', 'row_count', 'totals'
+        ).order_by('-fiscal_year', '-month')
+
+        # 재확정필요 출납장 유형 (일괄 재확정 버튼 표시용)
+        stale_cashbook_types = list(SnapshotIndex.objects.filter(
+            snapshot_type__startswith='CASHBOOK_', is_stale=True
+        ).values_list('snapshot_type', flat=True).distinct().order_by('snapshot_type'))
 
         context = {
             **self.admin_site.each_context(request),
@@ -434,23 +903,66 @@ class ReportAdminMixin:
             'selected_year': selected_year,
             'selected_month': selected_month,
             'confirmed_snapshots': confirmed_snapshots,
+            'stale_cashbook_types': [
+                (snapshot_type, dict(MonthlySnapshot.SNAPSHOT_TYPES).get(snapshot_type, snapshot_type))
+                for snapshot_type in stale_cashbook_types
+            ],
         }
 
         return TemplateResponse(request, 'admin/confirmed_report_main.html', context)
 
+    def _confirmed_snapshot_response(self, request, index, render):
+        """확정본 화면 공통 응답
+
+        확정본은 재확정/확정해제 전까지 바뀌지 않으므로 스냅샷 ID + 확정일시로 ETag를 만든다.
+        브라우저가 같은 ETag로 재요청하면 304, 아니면 사용자별로 캐시한 렌더링 HTML을 그대로 반환한다.
+        """
+        confirmed_ts = int(index.confirmed_at.timestamp() * 1_000_000) if index.confirmed_at else 0
+        version = f'{index.snapshot_id}-{confirmed_ts}'
+        # 화면 상단(사용자명, 로그아웃 폼의 CSRF 토큰)이 사용자/세션별이므로 함께 구분
+        csrf_secret = request.META.get('CSRF_COOKIE')
+        if not csrf_secret:
+            response = render()
+            add_never_cache_headers(response)
+            return response
+        client = hashlib.sha256(f'{request.user.pk}:{csrf_secret}'.encode()).hexdigest()[:16]
+        etag = f'"snapshot-{version}-{client}"'
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            if len(messages.get_messages(request)):
+                # 표시할 메시지가 있으면 캐시 없이 렌더링 (메시지가 캐시 HTML에 남지 않도록)
+                response = render().render()
+            else:
+                content = get_or_build_immutable(
+                    'confirmed_html', (request.path, version, client),
+                    lambda: render().render().content,
+                )
+                response = HttpResponse(content)
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Cookie'])
+        return response
+
     def confirmed_cashbook_view(self, request, book_type, year, month):
         """확정된 출납장 조회"""
-        snapshot_type = f'CASHBOOK_{book_type}'
-        snapshot = MonthlySnapshot.objects.filter(
-            snapshot_type=snapshot_type, fiscal_year=year, month=month
-        ).first()
+        index = get_snapshot_index(f'CASHBOOK_{book_type}', year, month)
 
-        if not snapshot:
-            messages.warning(request, f'{year}년 {month}월 {"예금" if book_type == "BANK" else "현금"}출납장이 확정되지 않았습니다.')
+        book_type_display = dict(CashBook.BOOK_TYPES).get(book_type, '출납장')
+        if not index:
+            messages.warning(request, f'{year}년 {month}월 {book_type_display}이 확정되지 않았습니다.')
             return redirect('admin:confirmed_report')
 
-        data = snapshot.snapshot_data
-        book_type_display = '예금출납장' if book_type == 'BANK' else '현금출납장'
+        return self._confirmed_snapshot_response(
+            request, index,
+            lambda: self._render_confirmed_cashbook(
+                request, MonthlySnapshot.objects.get(pk=index.snapshot_id), book_type, book_type_display, year, month
+            ),
+        )
+
+    def _render_confirmed_cashbook(self, request, snapshot, book_type, book_type_display, year, month):
+        data = decode_snapshot(snapshot.snapshot_data)
 
         year_range = list(range(2024, 2028))
         month_range = list(range(1, 13))
@@ -461,6 +973,7 @@ class ReportAdminMixin:
             'opts': self.model._meta,
             'book_type': book_type,
             'book_type_display': book_type_display,
+            'is_deposit': book_type == 'DEPOSIT',
             'year': year,
             'month': month,
             'year_range': year_range,
@@ -479,15 +992,21 @@ class ReportAdminMixin:
 
     def confirmed_budget_view(self, request, year, month):
         """확정된 예산집행내역 조회"""
-        snapshot = MonthlySnapshot.objects.filter(
-            snapshot_type='BUDGET', fiscal_year=year, month=month
-        ).first()
+        index = get_snapshot_index('BUDGET', year, month)
 
-        if not snapshot:
+        if not index:
             messages.warning(request, f'{year}년 {month}월 예산집행내역이 확정되지 않았습니다.')
             return redirect('admin:confirmed_report')
 
-        data = snapshot.snapshot_data
+        return self._confirmed_snapshot_response(
+            request, index,
+            lambda: self._render_confirmed_budget(
+                request, MonthlySnapshot.objects.get(pk=index.snapshot_id), year, month
+            ),
+        )
+
+    def _render_confirmed_budget(self, request, snapshot, year, month):
+        data = decode_snapshot(snapshot.snapshot_data)
 
         year_range = list(range(2024, 2028))
         month_range = list(range(1, 13))
@@ -512,6 +1031,10 @@ class ReportAdminMixin:
 
         return TemplateResponse(request, 'admin/confirmed_budget.html', context)
 
+    def _build_card_snapshot_data(self, year, month):
+        """카드사용내역 스냅샷 데이터 구성"""
+        return build_card_snapshot(get_card_snapshot_items(year, month))
+
     def snapshot_confirm_card(self, request):
         """카드사용내역 스냅샷 확정"""
         from django.utils import timezone
@@ -522,38 +1045,7 @@ class ReportAdminMixin:
         year = int(request.POST.get('year'))
         month = int(request.POST.get('month'))
 
-        # 해당 월의 카드 지출 조회
-        card_items = list(Transaction.objects.filter(
-            date__year=year,
-            date__month=month,
-            payment_method='CARD',
-            transaction_type='EXPENSE',
-        ).order_by('date').select_related('account').values(
-            'id', 'date', 'account__account_name', 'description', 'amount', 'approval_number'
-        ))
-
-        # 합계 계산
-        total_amount = sum(item['amount'] or 0 for item in card_items)
-
-        # 날짜 직렬화
-        serialized_items = []
-        for item in card_items:
-            serialized_items.append({
-                'id': item['id'],
-                'date': item['date'].isoformat() if item['date'] else None,
-                'day': item['date'].day if item['date'] else None,
-                'account_name': item['account__account_name'] or '',
-                'description': item['description'] or '',
-                'amount': float(item['amount']) if item['amount'] else 0,
-                'approval_number': item['approval_number'] or '',
-            })
-
-        # 스냅샷 데이터 구성
-        snapshot_data = {
-            'card_items': serialized_items,
-            'total_amount': float(total_amount),
-            'item_count': len(card_items),
-        }
+        snapshot_data = self._build_card_snapshot_data(year, month)
 
         # 스냅샷 생성 또는 업데이트
         snapshot, created = MonthlySnapshot.objects.update_or_create(
@@ -561,8 +1053,9 @@ class ReportAdminMixin:
             fiscal_year=year,
             month=month,
             defaults={
-                'snapshot_data': snapshot_data,
+                'snapshot_data': encode_snapshot(snapshot_data),
                 'is_confirmed': True,
+                'is_stale': False,
                 'confirmed_at': timezone.now(),
                 'confirmed_by': request.user.username if request.user.is_authenticated else '',
             }
@@ -582,15 +1075,21 @@ class ReportAdminMixin:
 
     def confirmed_card_view(self, request, year, month):
         """확정된 카드사용내역 조회"""
-        snapshot = MonthlySnapshot.objects.filter(
-            snapshot_type='CARD_EXPENSE', fiscal_year=year, month=month
-        ).first()
+        index = get_snapshot_index('CARD_EXPENSE', year, month)
 
-        if not snapshot:
+        if not index:
             messages.warning(request, f'{year}년 {month}월 카드사용내역이 확정되지 않았습니다.')
             return redirect('admin:confirmed_report')
 
-        data = snapshot.snapshot_data
+        return self._confirmed_snapshot_response(
+            request, index,
+            lambda: self._render_confirmed_card(
+                request, MonthlySnapshot.objects.get(pk=index.snapshot_id), year, month
+            ),
+        )
+
+    def _render_confirmed_card(self, request, snapshot, year, month):
+        data = decode_snapshot(snapshot.snapshot_data)
 
         year_range = list(range(2024, 2028))
         month_range = list(range(1, 13))
@@ -2,14 +2,17 @@
 # 단순 ModelAdmin 클래스들
 
 from django.contrib import admin
+from django.db.models import Q
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
-from django.urls import path
+from django.urls import path, reverse
+from django.utils.html import format_html
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.template.response import TemplateResponse
 
-from ..models import Member, FixedAsset, CashBookCategory, BankAccount, Settlement
+from ..models import Account, Member, FixedAsset, CashBookCategory, BankAccount, Settlement
+from ..cache import bump_data_version, bump_structure_version
 
 
 # 사용자 Admin 커스터마이징
@@ -72,17 +75,25 @@ class CashBookCategoryAdmin(admin.ModelAdmin):
         fiscal_year = int(request.GET.get('fiscal_year', current_year))
         book_type = request.GET.get('book_type', 'BANK')
 
-        # 해당 회계연도, 장부유형의 과목 조회
+        # 해당 회계연도, 장부유형의 과목 조회 (회계연도 미지정 공통 과목 포함 - 출납장 입력 항목과 같은 범위)
+        year_filter = Q(fiscal_year=fiscal_year) | Q(fiscal_year__isnull=True)
         income_categories = CashBookCategory.objects.filter(
-            fiscal_year=fiscal_year, book_type=book_type, entry_type='INCOME'
-        ).order_by('name')
+            year_filter, book_type=book_type, entry_type='INCOME'
+        ).order_by('name', 'fiscal_year')
         expense_categories = CashBookCategory.objects.filter(
-            fiscal_year=fiscal_year, book_type=book_type, entry_type='EXPENSE'
-        ).order_by('name')
+            year_filter, book_type=book_type, entry_type='EXPENSE'
+        ).order_by('name', 'fiscal_year')
+
+        # 예수금출납장 지출과목의 합산계정 선택 목록 (해당 회계연도 지출 계정)
+        addback_accounts = []
+        if book_type == 'DEPOSIT':
+            addback_accounts = Account.objects.filter(
+                fiscal_year=fiscal_year, account_type='EXPENSE', is_active=True
+            ).order_by('code')
 
         # 조회용 데이터 (해당 회계연도)
         all_categories = CashBookCategory.objects.filter(
-            fiscal_year=fiscal_year, is_active=True
+            year_filter, is_active=True
         ).order_by('book_type', 'entry_type', 'name')
         fiscal_years = list(range(current_year + 1, current_year - 5, -1))
         years = list(range(current_year, current_year - 5, -1))
@@ -97,6 +108,7 @@ class CashBookCategoryAdmin(admin.ModelAdmin):
             'book_type': book_type,
             'income_categories': income_categories,
             'expense_categories': expense_categories,
+            'addback_accounts': addback_accounts,
             'all_categories': all_categories,
             'years': years,
             'months': months,
@@ -162,12 +174,16 @@ class CashBookCategoryAdmin(admin.ModelAdmin):
             is_active = request.POST.get(f'expense_active_{idx}') == 'on'
             is_deleted = request.POST.get(f'expense_delete_{idx}') == '1'
             cat_book_type = request.POST.get(f'expense_book_type_{idx}', 'BANK')
+            addback = request.POST.get(f'expense_addback_{idx}')  # 예수금출납장 화면에서만 전송
 
             if cat_id and is_deleted:
                 CashBookCategory.objects.filter(pk=cat_id).delete()
                 deleted_count += 1
             elif cat_id and name:
-                CashBookCategory.objects.filter(pk=cat_id).update(name=name, is_active=is_active)
+                fields = {'name': name, 'is_active': is_active}
+                if addback is not None:
+                    fields['addback_account_id'] = int(addback) if addback.isdigit() else None
+                CashBookCategory.objects.filter(pk=cat_id).update(**fields)
                 saved_count += 1
 
             idx += 1
@@ -175,16 +191,22 @@ class CashBookCategoryAdmin(admin.ModelAdmin):
         # 새 지출과목
         new_expense_name = request.POST.get('expense_name_new', '').strip()
         new_expense_book_type = request.POST.get('expense_book_type_new', 'BANK')
+        new_expense_addback = request.POST.get('expense_addback_new', '')
         if new_expense_name:
             CashBookCategory.objects.create(
                 fiscal_year=fiscal_year,
                 book_type=new_expense_book_type,
                 entry_type='EXPENSE',
                 name=new_expense_name,
-                is_active=True
+                is_active=True,
+                addback_account_id=int(new_expense_addback) if new_expense_addback.isdigit() else None,
             )
             saved_count += 1
 
+        # QuerySet.update()는 signal을 발생시키지 않으므로 직접 캐시 무효화 (출납장 입력 항목 포함)
+        bump_data_version()
+        bump_structure_version()
+
         msg = f'출납장과목 저장 완료 ({saved_count}건)'
         if deleted_count > 0:
             msg += f', 삭제 {deleted_count}건'
@@ -300,6 +322,10 @@ class BankAccountAdmin(admin.ModelAdmin):
 
 @admin.register(Settlement)
 class SettlementAdmin(admin.ModelAdmin):
-    list_display = ['fiscal_year', 'closing_date', 'status', 'created_at']
+    list_display = ['fiscal_year', 'closing_date', 'status', 'created_at', 'annual_report_link']
     list_filter = ['status', 'fiscal_year']
     ordering = ['-fiscal_year']
+
+    @admin.display(description='연간결산')
+    def annual_report_link(self, obj):
+        return format_html('<a href="{}">조회</a>', reverse('admin:annual_report', args=[obj.fiscal_year]))
@@ -12,7 +12,8 @@ from decimal import Decimal, InvalidOperation
 import pandas as pd
 import json
 
-from ..models import Account, Transaction, MonthlySnapshot
+from ..models import Account, Transaction
+from ..selectors import get_remaining_budget, get_snapshot_index
 
 
 @admin.register(Transaction)
@@ -31,6 +32,7 @@ class TransactionAdmin(admin.ModelAdmin):
             path('card-delete/', self.admin_site.admin_view(self.card_delete_items), name='card_delete_items'),
             path('card-query/', self.admin_site.admin_view(self.card_query), name='card_query'),
             path('card-manual-save/', self.admin_site.admin_view(self.card_manual_save), name='card_manual_save'),
+            path('remaining-budget/', self.admin_site.admin_view(self.remaining_budget), name='remaining_budget'),
         ]
         return custom_urls + urls
 
@@ -312,12 +314,7 @@ class TransactionAdmin(admin.ModelAdmin):
                 context['upload_year'] = upload_year
                 context['upload_month'] = upload_month
 
-                snapshot = MonthlySnapshot.objects.filter(
-                    fiscal_year=upload_year,
-                    month=upload_month,
-                    snapshot_type='CARD_EXPENSE',
-                    is_confirmed=True
-                ).first()
+                snapshot = get_snapshot_index('CARD_EXPENSE', upload_year, upload_month)
 
                 if snapshot:
                     context['is_confirmed'] = True
@@ -457,12 +454,7 @@ class TransactionAdmin(admin.ModelAdmin):
             is_confirmed = False
             confirmed_at = None
             if card_items:
-                snapshot = MonthlySnapshot.objects.filter(
-                    snapshot_type='CARD_EXPENSE',
-                    fiscal_year=year,
-                    month=month,
-                    is_confirmed=True
-                ).first()
+                snapshot = get_snapshot_index('CARD_EXPENSE', year, month)
                 if snapshot:
                     is_confirmed = True
                     confirmed_at = snapshot.confirmed_at.strftime('%Y-%m-%d %H:%M') if snapshot.confirmed_at else None
@@ -566,12 +558,7 @@ class TransactionAdmin(admin.ModelAdmin):
                 total_amount += txn.amount
 
             # 확정 여부 확인
-            snapshot = MonthlySnapshot.objects.filter(
-                fiscal_year=year,
-                month=month,
-                snapshot_type='CARD_EXPENSE',
-                is_confirmed=True
-            ).first()
+            snapshot = get_snapshot_index('CARD_EXPENSE', year, month)
 
             is_confirmed = snapshot is not None
             confirmed_at = snapshot.confirmed_at.strftime('%Y-%m-%d %H:%M') if snapshot and snapshot.confirmed_at else None
@@ -650,3 +637,20 @@ class TransactionAdmin(admin.ModelAdmin):
             return JsonResponse({'success': False, 'error': f'입력값 오류: {e}'}, status=400)
         except Exception as e:
             return JsonResponse({'success': False, 'error': f'저장 중 오류: {e}'}, status=500)
+
+    def remaining_budget(self, request):
+        """계정 잔여예산 조회 (AJAX) - 거래 입력, 카드 업로드, 출납장 지출 입력 시 사용"""
+        from datetime import datetime
+
+        try:
+            account_id = int(request.GET.get('account', ''))
+            year = int(request.GET.get('year') or datetime.now().year)
+            amount = int(request.GET.get('amount', '0').replace(',', '') or 0)
+        except ValueError:
+            return JsonResponse({'success': False, 'error': '잘못된 요청입니다.'}, status=400)
+
+        status = get_remaining_budget(account_id, year, amount)
+        if status is None:
+            return JsonResponse({'success': False, 'error': f'{year}년 예산이 편성되지 않은 계정입니다.'})
+
+        return JsonResponse({'success': True, 'year': year, **status})
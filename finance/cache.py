@@ -0,0 +1,81 @@
+# 조회 결과 캐시 (데이터 버전 기반 무효화)
+#
+# 캐시 항목은 프로세스별 캐시(LocMemCache)에 두지만 버전 카운터는 DB(CacheVersion)에 두어
+# 어느 워커에서 변경하더라도 모든 워커가 다음 조회부터 새 버전 키를 사용한다.
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from .models import CacheVersion
+
+DATA_VERSION_KEY = 'finance:data_version'
+# 계정/예산/출납장 과목 편성 구조 버전 (거래 입력과 무관하게 Account/Budget/CashBookCategory 변경 시에만 증가)
+STRUCTURE_VERSION_KEY = 'finance:structure_version'
+
+
+def _get_version(key):
+    version = CacheVersion.objects.filter(key=key).values_list('version', flat=True).first()
+    if version is None:
+        version = CacheVersion.objects.get_or_create(key=key)[0].version
+    return version
+
+
+def _bump_version(key):
+    def _bump():
+        if not CacheVersion.objects.filter(key=key).update(version=F('version') + 1):
+            CacheVersion.objects.get_or_create(key=key, defaults={'version': 2})
+
+    transaction.on_commit(_bump)
+
+
+def get_data_version():
+    """현재 데이터 버전 조회 (없으면 1로 초기화)"""
+    return _get_version(DATA_VERSION_KEY)
+
+
+def bump_data_version():
+    """데이터 버전 증가 - 커밋 이후에 반영하여 롤백/동시 조회 시 오래된 캐시가 남지 않도록 함"""
+    _bump_version(DATA_VERSION_KEY)
+
+
+def get_structure_version():
+    """현재 편성 구조 버전 조회 (없으면 1로 초기화)"""
+    return _get_version(STRUCTURE_VERSION_KEY)
+
+
+def bump_structure_version():
+    """편성 구조 버전 증가 (커밋 이후 반영)"""
+    _bump_version(STRUCTURE_VERSION_KEY)
+
+
+def _make_key(prefix, params, version):
+    return ':'.join(['finance', prefix, *[str(p) for p in params], f'v{version}'])
+
+
+def get_or_build(prefix, params, builder, version=None):
+    """(prefix, params, 데이터 버전) 키로 캐시된 결과 반환, 없으면 builder() 결과 저장
+
+    Args:
+        version: 지정 시 해당 버전 키 사용 (응답에 버전을 함께 내려줄 때 조회 시점 고정용)
+    """
+    if version is None:
+        version = get_data_version()
+    key = _make_key(prefix, params, version)
+    result = cache.get(key)
+    if result is None:
+        result = builder()
+        cache.set(key, result, timeout=None)
+    return result
+
+
+def get_cached_version(prefix, params, version):
+    """특정 데이터 버전에서 캐시된 결과 조회 (없거나 만료되었으면 None)"""
+    return cache.get(_make_key(prefix, params, version))
+
+
+def get_or_build_immutable(prefix, params, builder):
+    """내용이 바뀌지 않는 결과 캐시 (확정 스냅샷 화면 등)
+
+    데이터 버전과 무관하게 유지되므로 params에 스냅샷 ID/확정일시처럼 내용이 바뀌면 달라지는 값을 포함해야 한다.
+    """
+    return get_or_build(prefix, params, builder, version=0)
@@ -0,0 +1,150 @@
+# 예산집행내역 계산 성능 비교 명령 (Decimal 방식 vs 정수 원 단위 방식)
+import random
+import timeit
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from finance.models import Account, Budget
+from finance.services import build_budget_skeleton, build_execution_tree
+
+
+def _build_synthetic_budget(account_count, seed):
+    """가상 예산 데이터 생성 (DB 저장 없음)
+
+    Returns:
+        (budgets, int_totals, decimal_totals)
+    """
+    rng = random.Random(seed)
+    budgets = []
+    int_totals = {}
+    decimal_totals = {}
+
+    for i in range(account_count):
+        account = Account(
+            id=i + 1,
+            code=f'{i + 1:05d}',
+            category_large=f'대분류{i // 100}',
+            category_medium=f'중분류{i // 10}',
+            category_small=f'소분류{i}',
+            account_name=f'계정{i}',
+        )
+        annual = rng.randrange(1_000_000, 500_000_000, 1000)
+        budgets.append(Budget(
+            fiscal_year=2025, account=account,
+            annual_amount=Decimal(annual), supplementary_amount=Decimal(0),
+        ))
+
+        cumulative = rng.randrange(0, annual)
+        monthly = rng.randrange(0, cumulative + 1)
+        int_totals[account.id] = {'cumulative': cumulative, 'monthly': monthly}
+        decimal_totals[account.id] = {'cumulative': Decimal(cumulative), 'monthly': Decimal(monthly)}
+
+    return budgets, int_totals, decimal_totals
+
+
+def _legacy_execution_tree(budgets, totals):
+    """기존 방식: Decimal 합산 + 단계마다 Decimal 나눗셈 집행률"""
+    zero = Decimal('0')
+    execution_data = OrderedDict()
+
+    for budget in budgets:
+        acc = budget.account
+        large = execution_data.setdefault(acc.category_large, {
+            'medium_categories': OrderedDict(),
+            'total_budget': zero, 'total_executed': zero, 'total_month': zero,
+        })
+        med = large['medium_categories'].setdefault(acc.category_medium, {
+            'items': [], 'subtotal_budget': zero, 'subtotal_executed': zero, 'subtotal_month': zero,
+        })
+
+        account_totals = totals.get(acc.id, {})
+        cumulative = account_totals.get('cumulative', zero)
+        monthly = account_totals.get('monthly', zero)
+        annual_budget = budget.total_budget
+        med['items'].append({
+            'account': acc,
+            'display_name': acc.account_name,
+            'annual_budget': annual_budget,
+            'cumulative': cumulative,
+            'exec_rate': (cumulative / annual_budget * 100) if annual_budget > 0 else zero,
+            'monthly': monthly,
+            'remaining': annual_budget - cumulative,
+            'note': '',
+        })
+        med['subtotal_budget'] += annual_budget
+        med['subtotal_executed'] += cumulative
+        med['subtotal_month'] += monthly
+        large['total_budget'] += annual_budget
+        large['total_executed'] += cumulative
+        large['total_month'] += monthly
+
+    for large in execution_data.values():
+        row_count = 0
+        for med in large['medium_categories'].values():
+            med['subtotal_remaining'] = med['subtotal_budget'] - med['subtotal_executed']
+            med['subtotal_rate'] = (med['subtotal_executed'] / med['subtotal_budget'] * 100) if med['subtotal_budget'] > 0 else zero
+            item_count = len(med['items'])
+            med['show_subtotal'] = item_count > 1
+            med['row_count'] = item_count + (1 if item_count > 1 else 0)
+            row_count += med['row_count']
+        large['row_count'] = row_count
+        large['total_remaining'] = large['total_budget'] - large['total_executed']
+        large['total_rate'] = (large['total_executed'] / large['total_budget'] * 100) if large['total_budget'] > 0 else zero
+
+    return execution_data
+
+
+def _serialize_items(execution_data, convert):
+    """스냅샷 저장용 항목 직렬화 (convert: 금액/집행률 변환 함수)"""
+    result = []
+    for large in execution_data.values():
+        for med in large['medium_categories'].values():
+            for item in med['items']:
+                result.append({
+                    'account_id': item['account'].id,
+                    'annual_budget': convert(item['annual_budget']),
+                    'cumulative': convert(item['cumulative']),
+                    'exec_rate': convert(item['exec_rate']),
+                    'monthly': convert(item['monthly']),
+                    'remaining': convert(item['remaining']),
+                })
+    return result
+
+
+class Command(BaseCommand):
+    help = '가상 예산(기본 500개 계정)으로 예산집행내역 계산/직렬화 속도를 비교합니다. (DB 미사용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--accounts', type=int, default=500, help='가상 계정 수 (기본 500)')
+        parser.add_argument('--repeat', type=int, default=200, help='반복 횟수 (기본 200)')
+        parser.add_argument('--seed', type=int, default=1, help='난수 시드')
+
+    def handle(self, *args, **options):
+        budgets, int_totals, decimal_totals = _build_synthetic_budget(options['accounts'], options['seed'])
+        skeleton = build_budget_skeleton(budgets)
+        repeat = options['repeat']
+
+        def run_legacy():
+            _serialize_items(_legacy_execution_tree(budgets, decimal_totals), float)
+
+        def run_integer():
+            _serialize_items(build_execution_tree(skeleton, int_totals)['execution_data'], lambda value: value)
+
+        # 결과 일치 확인 (금액 기준)
+        legacy = _legacy_execution_tree(budgets, decimal_totals)
+        current = build_execution_tree(skeleton, int_totals)['execution_data']
+        legacy_amounts = [(i['cumulative'], i['remaining']) for i in _serialize_items(legacy, int)]
+        current_amounts = [(i['cumulative'], i['remaining']) for i in _serialize_items(current, int)]
+        if legacy_amounts != current_amounts:
+            self.stdout.write(self.style.ERROR('두 방식의 금액 결과가 일치하지 않습니다.'))
+            return
+
+        legacy_time = min(timeit.repeat(run_legacy, number=repeat, repeat=3)) / repeat
+        integer_time = min(timeit.repeat(run_integer, number=repeat, repeat=3)) / repeat
+
+        self.stdout.write(f'계정 {len(budgets)}개, {repeat}회 반복 (3회 중 최솟값)')
+        self.stdout.write(f'  Decimal 방식 : {legacy_time * 1000:8.3f} ms/회')
+        self.stdout.write(f'  정수 원 단위 : {integer_time * 1000:8.3f} ms/회')
+        self.stdout.write(self.style.SUCCESS(f'  속도 향상    : {legacy_time / integer_time:.2f}배'))
@@ -0,0 +1,78 @@
+# 출납장월별잔액 검증/복구 명령
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from finance.cache import bump_data_version
+from finance.models import CashBookBalance
+from finance.selectors import get_ledger_cashbook_balances
+from finance.services import mark_cashbook_snapshots_stale
+
+
+class Command(BaseCommand):
+    help = '출납장 원장과 출납장월별잔액(CashBookBalance)을 비교하여 불일치를 복구합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='복구하지 않고 불일치 내역만 출력',
+        )
+
+    def handle(self, *args, **options):
+        expected = get_ledger_cashbook_balances()
+        current = {
+            (row.book_type, row.year, row.month): row
+            for row in CashBookBalance.objects.all()
+        }
+
+        missing = [key for key in expected if key not in current]
+        extra = [key for key in current if key not in expected]
+        changed = [
+            key for key in expected.keys() & current.keys()
+            if (current[key].income_total, current[key].expense_total, current[key].closing_balance) != expected[key]
+        ]
+
+        for key in missing:
+            self.stdout.write(f'[누락] {self._format_key(key)} 원장 차월이월 {expected[key][2]:,.0f}원')
+        for key in extra:
+            self.stdout.write(f'[초과] {self._format_key(key)} 잔액 {current[key].closing_balance:,.0f}원')
+        for key in changed:
+            row = current[key]
+            self.stdout.write(
+                f'[불일치] {self._format_key(key)} 잔액 수입 {row.income_total:,.0f} / 지출 {row.expense_total:,.0f}'
+                f' / 차월이월 {row.closing_balance:,.0f}원, 원장 수입 {expected[key][0]:,.0f}'
+                f' / 지출 {expected[key][1]:,.0f} / 차월이월 {expected[key][2]:,.0f}원'
+            )
+
+        problem_count = len(missing) + len(extra) + len(changed)
+        if not problem_count:
+            self.stdout.write(self.style.SUCCESS(f'출납장월별잔액 정상 ({len(expected)}건)'))
+            return
+
+        if options['check']:
+            self.stdout.write(self.style.WARNING(f'불일치 {problem_count}건 발견 (--check: 복구하지 않음)'))
+            return
+
+        with transaction.atomic():
+            CashBookBalance.objects.filter(pk__in=[current[key].pk for key in extra]).delete()
+            for key in changed:
+                row = current[key]
+                row.income_total, row.expense_total, row.closing_balance = expected[key]
+                row.save(update_fields=['income_total', 'expense_total', 'closing_balance'])
+            CashBookBalance.objects.bulk_create([
+                CashBookBalance(
+                    book_type=key[0], year=key[1], month=key[2],
+                    income_total=expected[key][0], expense_total=expected[key][1], closing_balance=expected[key][2],
+                )
+                for key in missing
+            ])
+            # 잔액이 바뀐 달부터 확정 스냅샷/보고서 캐시가 옛 잔액을 담고 있으므로 무효화
+            for book_type, year, month in [*missing, *extra, *changed]:
+                mark_cashbook_snapshots_stale(book_type, year, month)
+            bump_data_version()
+
+        self.stdout.write(self.style.SUCCESS(f'불일치 {problem_count}건 복구 완료'))
+
+    @staticmethod
+    def _format_key(key):
+        book_type, year, month = key
+        return f'{year}.{month} [{book_type}]'
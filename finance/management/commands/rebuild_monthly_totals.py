@@ -0,0 +1,74 @@
+# 월별계정집계 검증/복구 명령
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from finance.cache import bump_data_version
+from finance.models import MonthlyAccountTotal
+from finance.selectors import get_ledger_monthly_totals
+
+
+class Command(BaseCommand):
+    help = '거래내역 원장과 월별계정집계(MonthlyAccountTotal)를 비교하여 불일치를 복구합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='복구하지 않고 불일치 내역만 출력',
+        )
+
+    def handle(self, *args, **options):
+        expected = get_ledger_monthly_totals()
+        current = {
+            (row.account_id, row.year, row.month, row.payment_method): row
+            for row in MonthlyAccountTotal.objects.all()
+        }
+
+        missing = [key for key in expected if key not in current]
+        extra = [key for key in current if key not in expected]
+        changed = [
+            key for key in expected.keys() & current.keys()
+            if (current[key].amount, current[key].item_count) != expected[key]
+        ]
+
+        for key in missing:
+            self.stdout.write(f'[누락] {self._format_key(key)} 원장 {expected[key][0]:,.0f}원 ({expected[key][1]}건)')
+        for key in extra:
+            self.stdout.write(f'[초과] {self._format_key(key)} 집계 {current[key].amount:,.0f}원 ({current[key].item_count}건)')
+        for key in changed:
+            row = current[key]
+            self.stdout.write(
+                f'[불일치] {self._format_key(key)} 집계 {row.amount:,.0f}원 ({row.item_count}건)'
+                f' / 원장 {expected[key][0]:,.0f}원 ({expected[key][1]}건)'
+            )
+
+        problem_count = len(missing) + len(extra) + len(changed)
+        if not problem_count:
+            self.stdout.write(self.style.SUCCESS(f'월별계정집계 정상 ({len(expected)}건)'))
+            return
+
+        if options['check']:
+            self.stdout.write(self.style.WARNING(f'불일치 {problem_count}건 발견 (--check: 복구하지 않음)'))
+            return
+
+        with transaction.atomic():
+            MonthlyAccountTotal.objects.filter(pk__in=[current[key].pk for key in extra]).delete()
+            for key in changed:
+                row = current[key]
+                row.amount, row.item_count = expected[key]
+                row.save(update_fields=['amount', 'item_count'])
+            MonthlyAccountTotal.objects.bulk_create([
+                MonthlyAccountTotal(
+                    account_id=key[0], year=key[1], month=key[2], payment_method=key[3],
+                    amount=expected[key][0], item_count=expected[key][1],
+                )
+                for key in missing
+            ])
+
+            bump_data_version()
+
+        self.stdout.write(self.style.SUCCESS(f'불일치 {problem_count}건 복구 완료'))
+
+    @staticmethod
+    def _format_key(key):
+        account_id, year, month, payment_method = key
+        return f'{year}.{month} 계정ID {account_id} [{payment_method}]'
@@ -0,0 +1,53 @@
+# 월별스냅샷 내용해시 검증 명령
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.models import MonthlySnapshot
+from finance.snapshots import snapshot_checksum
+
+
+class Command(BaseCommand):
+    help = '월별스냅샷(MonthlySnapshot)의 내용해시를 다시 계산하여 변조/손상 여부를 검사합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='검사할 회계연도 (미지정 시 전체)')
+        parser.add_argument(
+            '--chunk-size', type=int, default=200,
+            help='한 번에 읽어올 스냅샷 수 (메모리 사용량 제한)',
+        )
+
+    def handle(self, *args, **options):
+        queryset = MonthlySnapshot.objects.order_by('pk')
+        if options['year']:
+            queryset = queryset.filter(fiscal_year=options['year'])
+
+        # 모델 인스턴스를 만들지 않고 필요한 열만 청크 단위로 스트리밍
+        rows = queryset.values_list('pk', 'snapshot_type', 'fiscal_year', 'month', 'snapshot_data', 'content_hash')
+
+        checked = 0
+        problem_count = 0
+        for pk, snapshot_type, fiscal_year, month, snapshot_data, content_hash in rows.iterator(
+            chunk_size=options['chunk_size']
+        ):
+            checked += 1
+            label = f'{fiscal_year}.{month} [{snapshot_type}] (ID {pk})'
+
+            if not content_hash:
+                self.stdout.write(f'[해시없음] {label}')
+                problem_count += 1
+                continue
+
+            try:
+                actual = snapshot_checksum(snapshot_type, fiscal_year, month, snapshot_data)
+            except (TypeError, ValueError) as e:
+                self.stdout.write(f'[손상] {label} 데이터를 직렬화할 수 없습니다: {e}')
+                problem_count += 1
+                continue
+
+            if actual != content_hash:
+                self.stdout.write(f'[불일치] {label} 저장 해시 {content_hash[:12]}…, 재계산 해시 {actual[:12]}…')
+                problem_count += 1
+
+        if problem_count:
+            raise CommandError(f'스냅샷 {checked}건 중 이상 {problem_count}건 발견')
+
+        self.stdout.write(self.style.SUCCESS(f'월별스냅샷 내용해시 정상 ({checked}건)'))
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def populate_monthly_totals(apps, schema_editor):
+    """기존 거래내역으로 월별계정집계 초기화"""
+    Transaction = apps.get_model('finance', 'Transaction')
+    MonthlyAccountTotal = apps.get_model('finance', 'MonthlyAccountTotal')
+
+    rows = Transaction.objects.filter(
+        transaction_type='EXPENSE', status='APPROVED'
+    ).annotate(
+        year=ExtractYear('date'), month=ExtractMonth('date')
+    ).values('account_id', 'year', 'month', 'payment_method').annotate(
+        total=Sum('amount'), count=Count('id')
+    ).order_by()
+
+    MonthlyAccountTotal.objects.bulk_create([
+        MonthlyAccountTotal(
+            account_id=row['account_id'], year=row['year'], month=row['month'],
+            payment_method=row['payment_method'], amount=row['total'], item_count=row['count'],
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0016_add_fiscal_year_to_cashbookcategory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyAccountTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(verbose_name='년도')),
+                ('month', models.IntegerField(verbose_name='월')),
+                ('payment_method', models.CharField(choices=[('CASH', '현금'), ('BANK', '예금'), ('CARD', '법인카드'), ('OTHER', '기타')], max_length=10, verbose_name='결제수단')),
+                ('amount', models.DecimalField(decimal_places=0, default=0, max_digits=15, verbose_name='합계금액')),
+                ('item_count', models.IntegerField(default=0, verbose_name='건수')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_totals', to='finance.account', verbose_name='계정과목')),
+            ],
+            options={
+                'verbose_name': '월별계정집계',
+                'verbose_name_plural': '월별계정집계',
+                'ordering': ['year', 'month', 'account', 'payment_method'],
+                'unique_together': {('account', 'year', 'month', 'payment_method')},
+            },
+        ),
+        migrations.RunPython(populate_monthly_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:43
+
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+
+def populate_cashbook_balances(apps, schema_editor):
+    """기존 출납장으로 출납장월별잔액 초기화 (월 순서대로 누적 잔액 계산)"""
+    CashBook = apps.get_model('finance', 'CashBook')
+    CashBookBalance = apps.get_model('finance', 'CashBookBalance')
+
+    rows = CashBook.objects.values('book_type', 'year', 'month').annotate(
+        income=Sum('amount', filter=Q(entry_type='INCOME')),
+        expense=Sum('amount', filter=Q(entry_type='EXPENSE')),
+    ).order_by('book_type', 'year', 'month')
+
+    balances = []
+    running = {}
+    for row in rows:
+        income = row['income'] or 0
+        expense = row['expense'] or 0
+        if not income and not expense:
+            continue
+        running[row['book_type']] = running.get(row['book_type'], 0) + income - expense
+        balances.append(CashBookBalance(
+            book_type=row['book_type'], year=row['year'], month=row['month'],
+            income_total=income, expense_total=expense, closing_balance=running[row['book_type']],
+        ))
+    CashBookBalance.objects.bulk_create(balances)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0017_add_monthly_account_total'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CashBookBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('book_type', models.CharField(choices=[('BANK', '예금출납장'), ('CASH', '현금출납장'), ('DEPOSIT', '예수금출납장')], max_length=10, verbose_name='출납장유형')),
+                ('year', models.IntegerField(verbose_name='년도')),
+                ('month', models.IntegerField(verbose_name='월')),
+                ('income_total', models.DecimalField(decimal_places=0, default=0, max_digits=15, verbose_name='수입합계')),
+                ('expense_total', models.DecimalField(decimal_places=0, default=0, max_digits=15, verbose_name='지출합계')),
+                ('closing_balance', models.DecimalField(decimal_places=0, default=0, max_digits=15, verbose_name='차월이월')),
+            ],
+            options={
+                'verbose_name': '출납장월별잔액',
+                'verbose_name_plural': '출납장월별잔액',
+                'ordering': ['book_type', 'year', 'month'],
+                'unique_together': {('book_type', 'year', 'month')},
+            },
+        ),
+        migrations.RunPython(populate_cashbook_balances, migrations.RunPython.noop),
+    ]
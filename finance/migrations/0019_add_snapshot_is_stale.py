@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0018_add_cashbook_balance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlysnapshot',
+            name='is_stale',
+            field=models.BooleanField(default=False, verbose_name='재확정필요'),
+        ),
+    ]
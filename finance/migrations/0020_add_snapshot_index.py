@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:52
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# 스냅샷 요약 규칙 (이 마이그레이션 시점 기준으로 고정 - finance.snapshots 변경의 영향을 받지 않도록 복사)
+SUMMARY_KEYS = {
+    'CASHBOOK_BANK': (('income_entries', 'expense_entries'), ('prev_balance', 'income_total', 'expense_total', 'next_balance')),
+    'CASHBOOK_CASH': (('income_entries', 'expense_entries'), ('prev_balance', 'income_total', 'expense_total', 'next_balance')),
+    'CASHBOOK_DEPOSIT': (('expense_entries',), ('expense_total',)),
+    'CARD_EXPENSE': (('card_items',), ('total_amount',)),
+    'BUDGET': ((), ('grand_total_budget', 'grand_total_executed', 'grand_total_month', 'grand_total_remaining')),
+}
+
+
+def _row_count(value):
+    """저장 형식 행 목록 건수 (열 단위 {'_columns', '_rows'} 또는 일반 목록)"""
+    if isinstance(value, dict):
+        return len(value.get('_rows') or [])
+    return len(value or [])
+
+
+def summarize_snapshot(snapshot_type, raw):
+    """스냅샷 행 수와 주요 합계 산출 - (row_count, {키: 원 단위 정수})"""
+    raw = raw or {}
+    row_keys, total_keys = SUMMARY_KEYS.get(snapshot_type, ((), ()))
+
+    if snapshot_type == 'BUDGET':
+        row_count = sum(
+            _row_count(med_data.get('items'))
+            for large_data in (raw.get('execution_data') or {}).values()
+            for med_data in large_data['medium_categories'].values()
+        )
+    else:
+        row_count = sum(_row_count(raw.get(key)) for key in row_keys)
+
+    totals = {key: int(Decimal(str(raw.get(key) or 0))) for key in total_keys}
+    return row_count, totals
+
+
+def populate_snapshot_index(apps, schema_editor):
+    """기존 확정 스냅샷으로 스냅샷 색인 초기화"""
+    MonthlySnapshot = apps.get_model('finance', 'MonthlySnapshot')
+    SnapshotIndex = apps.get_model('finance', 'SnapshotIndex')
+
+    indexes = []
+    for snapshot in MonthlySnapshot.objects.filter(is_confirmed=True).iterator():
+        row_count, totals = summarize_snapshot(snapshot.snapshot_type, snapshot.snapshot_data)
+        indexes.append(SnapshotIndex(
+            snapshot_id=snapshot.pk, snapshot_type=snapshot.snapshot_type,
+            fiscal_year=snapshot.fiscal_year, month=snapshot.month,
+            confirmed_at=snapshot.confirmed_at, confirmed_by=snapshot.confirmed_by,
+            is_stale=snapshot.is_stale, row_count=row_count, totals=totals,
+        ))
+    SnapshotIndex.objects.bulk_create(indexes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0019_add_snapshot_is_stale'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SnapshotIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('snapshot_type', models.CharField(choices=[('BUDGET', '예산집행'), ('CASHBOOK_BANK', '예금출납장'), ('CASHBOOK_CASH', '현금출납장'), ('CASHBOOK_DEPOSIT', '예수금출납장'), ('CARD_EXPENSE', '카드사용내역')], max_length=20, verbose_name='스냅샷유형')),
+                ('fiscal_year', models.IntegerField(verbose_name='회계연도')),
+                ('month', models.IntegerField(verbose_name='월')),
+                ('confirmed_at', models.DateTimeField(blank=True, null=True, verbose_name='확정일시')),
+                ('confirmed_by', models.CharField(blank=True, max_length=50, verbose_name='확정자')),
+                ('is_stale', models.BooleanField(default=False, verbose_name='재확정필요')),
+                ('row_count', models.IntegerField(default=0, verbose_name='행수')),
+                ('totals', models.JSONField(default=dict, verbose_name='합계')),
+                ('snapshot', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='index', to='finance.monthlysnapshot', verbose_name='스냅샷')),
+            ],
+            options={
+                'verbose_name': '월별스냅샷색인',
+                'verbose_name_plural': '월별스냅샷색인',
+                'ordering': ['fiscal_year', 'month', 'snapshot_type'],
+                'unique_together': {('snapshot_type', 'fiscal_year', 'month')},
+            },
+        ),
+        migrations.RunPython(populate_snapshot_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0021_add_snapshot_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='monthlysnapshot',
+            name='snapshot_type',
+            field=models.CharField(choices=[('BUDGET', '예산집행'), ('CASHBOOK_BANK', '예금출납장'), ('CASHBOOK_CASH', '현금출납장'), ('CASHBOOK_DEPOSIT', '예수금출납장'), ('CARD_EXPENSE', '카드사용내역'), ('ANNUAL', '연간결산')], max_length=20, verbose_name='스냅샷유형'),
+        ),
+        migrations.AlterField(
+            model_name='snapshotindex',
+            name='snapshot_type',
+            field=models.CharField(choices=[('BUDGET', '예산집행'), ('CASHBOOK_BANK', '예금출납장'), ('CASHBOOK_CASH', '현금출납장'), ('CASHBOOK_DEPOSIT', '예수금출납장'), ('CARD_EXPENSE', '카드사용내역'), ('ANNUAL', '연간결산')], max_length=20, verbose_name='스냅샷유형'),
+        ),
+        migrations.AlterField(
+            model_name='snapshotversion',
+            name='snapshot_type',
+            field=models.CharField(choices=[('BUDGET', '예산집행'), ('CASHBOOK_BANK', '예금출납장'), ('CASHBOOK_CASH', '현금출납장'), ('CASHBOOK_DEPOSIT', '예수금출납장'), ('CARD_EXPENSE', '카드사용내역'), ('ANNUAL', '연간결산')], max_length=20, verbose_name='스냅샷유형'),
+        ),
+    ]
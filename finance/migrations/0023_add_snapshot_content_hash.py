@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:02
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+def snapshot_checksum(snapshot_type, fiscal_year, month, raw):
+    """스냅샷 내용해시 (SHA-256) - 이 마이그레이션 시점의 정규화 규칙으로 고정 (finance.snapshots와 독립)"""
+    canonical = json.dumps(
+        [snapshot_type, fiscal_year, month, raw],
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def populate_content_hash(apps, schema_editor):
+    """기존 스냅샷의 내용해시 계산 (500건 단위로 저장)"""
+    MonthlySnapshot = apps.get_model('finance', 'MonthlySnapshot')
+
+    batch = []
+    rows = MonthlySnapshot.objects.values_list('pk', 'snapshot_type', 'fiscal_year', 'month', 'snapshot_data')
+    for pk, snapshot_type, fiscal_year, month, snapshot_data in rows.iterator(chunk_size=500):
+        batch.append(MonthlySnapshot(
+            pk=pk, content_hash=snapshot_checksum(snapshot_type, fiscal_year, month, snapshot_data),
+        ))
+        if len(batch) >= 500:
+            MonthlySnapshot.objects.bulk_update(batch, ['content_hash'])
+            batch = []
+    MonthlySnapshot.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0022_add_annual_snapshot_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlysnapshot',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, verbose_name='내용해시'),
+        ),
+        migrations.RunPython(populate_content_hash, migrations.RunPython.noop),
+    ]
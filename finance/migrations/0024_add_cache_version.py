@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0023_add_snapshot_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('key', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='구분')),
+                ('version', models.PositiveBigIntegerField(default=1, verbose_name='버전')),
+            ],
+            options={
+                'verbose_name': '캐시버전',
+                'verbose_name_plural': '캐시버전',
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# 기존 common.constants.DEPOSIT_ADDBACK_ACCOUNTS 매핑 (예수금 과목명 → 합산 대상 계정명) - 이 시점 값으로 고정
+LEGACY_ADDBACK_ACCOUNTS = {
+    '예수금(4대보험)': '급여',
+    '예수금(원천세)': '급여',
+}
+
+
+def populate_addback_account(apps, schema_editor):
+    """기존 과목명 매핑을 같은 회계연도의 대상 계정으로 변환
+
+    회계연도 미지정 과목은 예수금출납장 행이 있는 연도마다 해당 연도 과목(없으면 생성)으로
+    행을 옮기고 그 연도의 대상 계정을 지정한다. 행을 모두 옮긴 미지정 과목은 사용 중지한다.
+    """
+    Account = apps.get_model('finance', 'Account')
+    CashBookCategory = apps.get_model('finance', 'CashBookCategory')
+    DepositLedger = apps.get_model('finance', 'DepositLedger')
+
+    account_ids = {}
+    for account_id, fiscal_year, account_name in Account.objects.filter(
+        account_name__in=set(LEGACY_ADDBACK_ACCOUNTS.values())
+    ).order_by('code', 'id').values_list('id', 'fiscal_year', 'account_name'):
+        account_ids.setdefault((fiscal_year, account_name), account_id)
+
+    categories = CashBookCategory.objects.filter(book_type='DEPOSIT', name__in=list(LEGACY_ADDBACK_ACCOUNTS))
+    for category in categories.filter(fiscal_year__isnull=False):
+        category.addback_account_id = account_ids.get((category.fiscal_year, LEGACY_ADDBACK_ACCOUNTS[category.name]))
+        if category.addback_account_id:
+            category.save(update_fields=['addback_account'])
+
+    for category in categories.filter(fiscal_year__isnull=True):
+        years = sorted(set(DepositLedger.objects.filter(category=category).values_list('year', flat=True)))
+        for year in years:
+            year_category, _ = CashBookCategory.objects.get_or_create(
+                fiscal_year=year, book_type=category.book_type, entry_type=category.entry_type, name=category.name,
+                defaults={'is_active': category.is_active},
+            )
+            if year_category.addback_account_id is None:
+                year_category.addback_account_id = account_ids.get((year, LEGACY_ADDBACK_ACCOUNTS[category.name]))
+                year_category.save(update_fields=['addback_account'])
+            DepositLedger.objects.filter(category=category, year=year).update(category=year_category)
+        if years:
+            category.is_active = False
+            category.save(update_fields=['is_active'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0024_add_cache_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cashbookcategory',
+            name='addback_account',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deposit_addback_categories', to='finance.account', verbose_name='합산계정'),
+        ),
+        migrations.RunPython(populate_addback_account, migrations.RunPython.noop),
+    ]
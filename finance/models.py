@@ -141,6 +141,27 @@ class Transaction(models.Model):
         return f"{self.date} [{self.get_transaction_type_display()}] {self.description}"
 
 
+class MonthlyAccountTotal(models.Model):
+    """월별 계정 지출 합계 (승인된 지출 집계) - 거래내역 저장/삭제 시 자동 갱신"""
+    account = models.ForeignKey(
+        Account, on_delete=models.CASCADE, verbose_name='계정과목', related_name='monthly_totals'
+    )
+    year = models.IntegerField('년도')
+    month = models.IntegerField('월')
+    payment_method = models.CharField('결제수단', max_length=10, choices=Transaction.PAYMENT_METHODS)
+    amount = models.DecimalField('합계금액', max_digits=15, decimal_places=0, default=0)
+    item_count = models.IntegerField('건수', default=0)
+
+    class Meta:
+        verbose_name = '월별계정집계'
+        verbose_name_plural = '월별계정집계'
+        unique_together = ['account', 'year', 'month', 'payment_method']
+        ordering = ['year', 'month', 'account', 'payment_method']
+
+    def __str__(self):
+        return f"{self.year}.{self.month} {self.account} [{self.get_payment_method_display()}] {self.amount}"
+
+
 class Settlement(models.Model):
     """결산"""
     fiscal_year = models.IntegerField('회계연도', unique=True)
@@ -177,6 +198,11 @@ class CashBookCategory(models.Model):
     entry_type = models.CharField('구분', max_length=10, choices=ENTRY_TYPES, default='INCOME')
     name = models.CharField('과목명', max_length=50)
     is_active = models.BooleanField('사용여부', default=True)
+    # 예수금출납장 과목: 예산집행내역에서 이 과목의 예수금 금액을 더할 계정 (회계연도별 과목마다 지정)
+    addback_account = models.ForeignKey(
+        Account, on_delete=models.SET_NULL, verbose_name='합산계정',
+        null=True, blank=True, related_name='deposit_addback_categories'
+    )
 
     class Meta:
         verbose_name = '출납장과목등록및내역조회'
@@ -257,6 +283,31 @@ class CashBook(models.Model):
         return f"{self.year}.{self.month} [{self.get_book_type_display()}] {category_name}"
 
 
+class CashBookBalance(models.Model):
+    """출납장 월별 잔액 (수입/지출 합계 및 누적 잔액) - 출납장 저장/삭제 시 자동 갱신"""
+    book_type = models.CharField('출납장유형', max_length=10, choices=CashBook.BOOK_TYPES)
+    year = models.IntegerField('년도')
+    month = models.IntegerField('월')
+    income_total = models.DecimalField('수입합계', max_digits=15, decimal_places=0, default=0)
+    expense_total = models.DecimalField('지출합계', max_digits=15, decimal_places=0, default=0)
+    # 해당 월까지의 누적 잔액 (= 차월이월)
+    closing_balance = models.DecimalField('차월이월', max_digits=15, decimal_places=0, default=0)
+
+    class Meta:
+        verbose_name = '출납장월별잔액'
+        verbose_name_plural = '출납장월별잔액'
+        unique_together = ['book_type', 'year', 'month']
+        ordering = ['book_type', 'year', 'month']
+
+    def __str__(self):
+        return f"{self.year}.{self.month} [{self.get_book_type_display()}] {self.closing_balance}"
+
+    @property
+    def opening_balance(self):
+        """전월이월"""
+        return self.closing_balance - self.income_total + self.expense_total
+
+
 class MonthlySnapshot(models.Model):
     """월별 스냅샷 (예산집행내역, 출납장 월 마감용) - JSON 방식으로 모든 데이터 저장"""
     SNAPSHOT_TYPES = [
@@ -265,6 +316,8 @@ class MonthlySnapshot(models.Model):
         ('CASHBOOK_CASH', '현금출납장'),
         ('CASHBOOK_DEPOSIT', '예수금출납장'),
         ('CARD_EXPENSE', '카드사용내역'),
+        # 연간결산은 12월(month=12) 행으로 저장 - 월별 확정 스냅샷 병합 결과
+        ('ANNUAL', '연간결산'),
     ]
 
     snapshot_type = models.CharField('스냅샷유형', max_length=20, choices=SNAPSHOT_TYPES)
@@ -280,6 +333,10 @@ class MonthlySnapshot(models.Model):
     is_confirmed = models.BooleanField('확정여부', default=False)
     confirmed_at = models.DateTimeField('확정일시', null=True, blank=True)
     confirmed_by = models.CharField('확정자', max_length=50, blank=True)
+    # 확정 이후 해당 월 또는 이전 월 원본이 변경되어 재확정이 필요한 상태
+    is_stale = models.BooleanField('재확정필요', default=False)
+    # 확정 시점의 snapshot_data 해시 (snapshots.snapshot_checksum) - verify_snapshots 명령으로 변조/손상 검사
+    content_hash = models.CharField('내용해시', max_length=64, blank=True)
     note = models.TextField('비고', blank=True)
 
     created_at = models.DateTimeField('생성일시', auto_now_add=True)
@@ -296,6 +353,72 @@ class MonthlySnapshot(models.Model):
         status = '확정' if self.is_confirmed else '미확정'
         return f"{self.fiscal_year}년 {self.month}월 {type_display} ({status})"
 
+    def save(self, *args, update_fields=None, **kwargs):
+        # 내용해시는 pre_save 신호에서 다시 계산하므로 update_fields 저장(update_or_create 등)에도 함께 저장
+        if update_fields is not None and 'snapshot_data' in update_fields:
+            update_fields = {*update_fields, 'content_hash'}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+
+class SnapshotIndex(models.Model):
+    """월별스냅샷 색인 (확정 목록/상태 표시용) - snapshot_data를 읽지 않고 조회, 스냅샷 저장 시 자동 갱신"""
+    snapshot = models.OneToOneField(
+        MonthlySnapshot, on_delete=models.CASCADE, related_name='index', verbose_name='스냅샷'
+    )
+    snapshot_type = models.CharField('스냅샷유형', max_length=20, choices=MonthlySnapshot.SNAPSHOT_TYPES)
+    fiscal_year = models.IntegerField('회계연도')
+    month = models.IntegerField('월')
+    confirmed_at = models.DateTimeField('확정일시', null=True, blank=True)
+    confirmed_by = models.CharField('확정자', max_length=50, blank=True)
+    is_stale = models.BooleanField('재확정필요', default=False)
+    row_count = models.IntegerField('행수', default=0)
+    # 유형별 주요 합계 (출납장: 전월이월/수입/지출/차월이월, 카드: 사용합계, 예산집행: 예산/집행 합계)
+    totals = models.JSONField('합계', default=dict)
+
+    class Meta:
+        verbose_name = '월별스냅샷색인'
+        verbose_name_plural = '월별스냅샷색인'
+        unique_together = ['snapshot_type', 'fiscal_year', 'month']
+        ordering = ['fiscal_year', 'month', 'snapshot_type']
+
+    def __str__(self):
+        return f"{self.fiscal_year}년 {self.month}월 {self.get_snapshot_type_display()} 색인"
+
+
+class SnapshotVersion(models.Model):
+    """월별스냅샷 확정 이력 (추가만 가능) - 직전 확정 버전 대비 변경분 저장, 일정 간격마다 전체 저장"""
+    ACTIONS = [
+        ('CONFIRM', '확정'),
+        ('CANCEL', '확정해제'),
+    ]
+
+    snapshot_type = models.CharField('스냅샷유형', max_length=20, choices=MonthlySnapshot.SNAPSHOT_TYPES)
+    fiscal_year = models.IntegerField('회계연도')
+    month = models.IntegerField('월')
+    version = models.PositiveIntegerField('버전')
+    action = models.CharField('구분', max_length=10, choices=ACTIONS, default='CONFIRM')
+    # is_full이면 저장 형식 스냅샷 전체, 아니면 직전 확정 버전 대비 변경분 (확정해제는 빈 값)
+    is_full = models.BooleanField('전체저장', default=False)
+    data = models.JSONField('데이터', default=dict)
+    row_count = models.IntegerField('행수', default=0)
+    totals = models.JSONField('합계', default=dict)
+    confirmed_at = models.DateTimeField('처리일시')
+    confirmed_by = models.CharField('처리자', max_length=50, blank=True)
+
+    class Meta:
+        verbose_name = '월별스냅샷이력'
+        verbose_name_plural = '월별스냅샷이력'
+        unique_together = ['snapshot_type', 'fiscal_year', 'month', 'version']
+        ordering = ['fiscal_year', 'month', 'snapshot_type', 'version']
+
+    def __str__(self):
+        return f"{self.fiscal_year}년 {self.month}월 {self.get_snapshot_type_display()} v{self.version} ({self.get_action_display()})"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('스냅샷 이력은 수정할 수 없습니다.')
+        super().save(*args, **kwargs)
+
 
 class DepositLedger(models.Model):
     """예수금출납장(월간보고용) - 별도 테이블로 관리"""
@@ -320,3 +443,16 @@ class DepositLedger(models.Model):
 
     def __str__(self):
         return f"{self.year}.{self.month} 예수금출납장 - {self.category.name if self.category else self.description}"
+
+
+class CacheVersion(models.Model):
+    """조회 캐시 버전 (데이터/편성 구조 변경 시 증가) - 여러 프로세스가 같은 버전을 보도록 DB에 보관"""
+    key = models.CharField('구분', max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField('버전', default=1)
+
+    class Meta:
+        verbose_name = '캐시버전'
+        verbose_name_plural = '캐시버전'
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
@@ -1 +1,495 @@
 # 데이터 조회 로직
+from datetime import date
+
+from django.db.models import Sum, Q, Count, F, OuterRef, Subquery
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from common.utils import calc_rate, is_month_aligned, month_end
+from .models import (
+    Account, Budget, Transaction, MonthlyAccountTotal, DepositLedger, CashBook, CashBookBalance, CashBookCategory,
+    SnapshotIndex,
+)
+from .cache import get_or_build, get_structure_version
+from .services import build_budget_skeleton
+
+
+def get_expense_totals_by_account(year, month, accounts):
+    """계정별 누계/당월 지출 합계 조회 (예수금 합산 포함)
+
+    연초~해당 월(누계)과 해당 월(당월) 두 기간을 get_expense_totals_by_window로
+    함께 집계한다. 월 단위 기간이므로 월별계정집계(MonthlyAccountTotal)를 사용하며
+    예수금출납장은 과목별 합산계정(CashBookCategory.addback_account)에 더한다.
+
+    Args:
+        accounts: 보고서 대상 계정 목록
+
+    Returns:
+        {account_id: {'cumulative': int, 'monthly': int}} (원 단위 정수)
+    """
+    return get_expense_totals_by_window({
+        'cumulative': (date(year, 1, 1), month_end(year, month)),
+        'monthly': (date(year, month, 1), month_end(year, month)),
+    }, accounts)
+
+
+def _month_index_q(start, end):
+    """(year, month) 필드 기준 월 구간 조건 - period 주석 필드 사용"""
+    return Q(period__gte=start.year * 12 + start.month - 1, period__lte=end.year * 12 + end.month - 1)
+
+
+def get_expense_totals_by_window(windows, accounts):
+    """임의 기간별 계정 지출 합계 조회 (예수금 합산 포함)
+
+    모든 기간을 하나의 그룹 쿼리에서 조건부 집계로 함께 계산한다.
+    기간이 모두 월 단위(월초~월말)이면 월별계정집계를, 아니면 거래내역 원장을 사용한다.
+    기본은 계정ID 기준으로 집계한다. 계정은 연도별로 따로 관리되므로 기간이 대상 계정과 다른
+    회계연도에 걸치면(전년 동기 비교, 연도를 넘는 조회 기간 등) 그 연도의 계정을 계정코드로
+    대상 계정에 매핑한다. (코드가 비어 있거나 대상 계정에 없는 코드, 기간 밖 연도의 계정은 제외)
+
+    Args:
+        windows: {기간명: (시작일, 종료일)} - 종료일 포함
+        accounts: 보고서 대상 계정 목록
+
+    Returns:
+        {account_id: {기간명: int}} (원 단위 정수)
+    """
+    account_ids = {acc.id for acc in accounts}
+    account_years = {acc.fiscal_year for acc in accounts}
+    id_by_code = {acc.code: acc.id for acc in accounts if acc.code}
+    first_day = min(start for start, _ in windows.values())
+    last_day = max(end for _, end in windows.values())
+    month_aligned = all(is_month_aligned(start, end) for start, end in windows.values())
+
+    if month_aligned:
+        rows = MonthlyAccountTotal.objects.annotate(
+            period=F('year') * 12 + F('month') - 1
+        ).filter(_month_index_q(first_day, last_day)).values(
+            'account_id', 'account__code', 'account__fiscal_year'
+        ).annotate(**{
+            name: Sum('amount', filter=_month_index_q(start, end))
+            for name, (start, end) in windows.items()
+        }).order_by()
+    else:
+        rows = Transaction.objects.filter(
+            transaction_type='EXPENSE', status='APPROVED', date__range=(first_day, last_day)
+        ).values('account_id', 'account__code', 'account__fiscal_year').annotate(**{
+            name: Sum('amount', filter=Q(date__range=(start, end)))
+            for name, (start, end) in windows.items()
+        }).order_by()
+
+    totals = {}
+
+    def target_account(account_id, code, fiscal_year, window):
+        if account_id in account_ids:
+            return account_id
+        start, end = window
+        if fiscal_year in account_years or not start.year <= fiscal_year <= end.year:
+            return None
+        return id_by_code.get(code)
+
+    def add_rows(rows, prefix):
+        for row in rows:
+            for name, window in windows.items():
+                amount = int(row[name] or 0)
+                if not amount:
+                    continue
+                account_id = target_account(
+                    row[f'{prefix}_id'], row[f'{prefix}__code'], row[f'{prefix}__fiscal_year'], window
+                )
+                if account_id is not None:
+                    totals.setdefault(account_id, dict.fromkeys(windows, 0))[name] += amount
+
+    add_rows(rows, 'account')
+
+    # 예수금출납장은 과목의 합산계정에 더함 (월 단위 기간이면 보고 연월, 아니면 일자 기준)
+    deposit_rows = DepositLedger.objects.filter(category__addback_account__isnull=False)
+    if month_aligned:
+        deposit_rows = deposit_rows.annotate(period=F('year') * 12 + F('month') - 1).filter(
+            _month_index_q(first_day, last_day)
+        )
+        deposit_windows = {name: _month_index_q(start, end) for name, (start, end) in windows.items()}
+    else:
+        deposit_rows = deposit_rows.filter(date__range=(first_day, last_day))
+        deposit_windows = {name: Q(date__range=(start, end)) for name, (start, end) in windows.items()}
+    deposit_rows = deposit_rows.values(
+        'category__addback_account_id', 'category__addback_account__code',
+        'category__addback_account__fiscal_year',
+    ).annotate(**{
+        name: Sum('amount', filter=condition) for name, condition in deposit_windows.items()
+    }).order_by()
+    add_rows(deposit_rows, 'category__addback_account')
+
+    return totals
+
+
+def get_monthly_expense_matrix(year, months=None):
+    """계정 × 월 지출 합계 행렬 조회 (예수금 합산 포함)
+
+    Args:
+        months: 조회할 월 목록 (미지정 시 1~12월 전체, 나머지 월은 0)
+
+    Returns:
+        {account_id: [1월, 2월, ..., 12월]} (원 단위 정수 12개)
+    """
+    month_filter = {} if months is None else {'month__in': list(months)}
+    rows = MonthlyAccountTotal.objects.filter(year=year, **month_filter).values(
+        'account_id', 'month'
+    ).annotate(total=Sum('amount')).order_by()
+
+    matrix = {}
+    for row in rows:
+        months = matrix.setdefault(row['account_id'], [0] * 12)
+        months[row['month'] - 1] += int(row['total'] or 0)
+
+    deposit_rows = DepositLedger.objects.filter(
+        year=year,
+        category__addback_account__isnull=False,
+        **month_filter,
+    ).values('category__addback_account_id', 'month').annotate(total=Sum('amount')).order_by()
+
+    for row in deposit_rows:
+        months = matrix.setdefault(row['category__addback_account_id'], [0] * 12)
+        months[row['month'] - 1] += int(row['total'] or 0)
+
+    return matrix
+
+
+def get_ledger_monthly_totals():
+    """거래내역 원장 기준 월별계정집계 재계산 (검증/복구용)
+
+    Returns:
+        {(account_id, year, month, payment_method): (amount, item_count)}
+    """
+    rows = Transaction.objects.filter(
+        transaction_type='EXPENSE', status='APPROVED'
+    ).annotate(
+        year=ExtractYear('date'), month=ExtractMonth('date')
+    ).values('account_id', 'year', 'month', 'payment_method').annotate(
+        total=Sum('amount'), count=Count('id')
+    ).order_by()
+
+    return {
+        (row['account_id'], row['year'], row['month'], row['payment_method']): (row['total'], row['count'])
+        for row in rows
+    }
+
+
+CASHBOOK_EXPENSE_ACCOUNT_TYPES = ['EXPENSE', 'LIABILITY', 'EQUITY']
+
+
+def _build_cashbook_catalog(year):
+    accounts = list(Account.objects.filter(
+        fiscal_year=year, account_type__in=CASHBOOK_EXPENSE_ACCOUNT_TYPES, is_active=True,
+    ).order_by('code').values('id', 'account_name'))
+
+    if not accounts:
+        # 해당 연도 계정과목이 아직 없으면 가장 최근 연도 계정과목 사용
+        latest_year = Account.objects.filter(
+            account_type__in=CASHBOOK_EXPENSE_ACCOUNT_TYPES,
+        ).order_by('-fiscal_year').values_list('fiscal_year', flat=True).first()
+        if latest_year:
+            accounts = list(Account.objects.filter(
+                fiscal_year=latest_year, account_type__in=CASHBOOK_EXPENSE_ACCOUNT_TYPES, is_active=True,
+            ).order_by('code').values('id', 'account_name'))
+
+    catalog = {
+        book_type: {'income_categories': [], 'expense_categories': []}
+        for book_type, _ in CashBookCategory.BOOK_TYPES
+    }
+    categories = CashBookCategory.objects.filter(
+        Q(fiscal_year=year) | Q(fiscal_year__isnull=True), is_active=True,
+    ).order_by('name').values('id', 'name', 'book_type', 'entry_type')
+    for cat in categories:
+        key = 'income_categories' if cat['entry_type'] == 'INCOME' else 'expense_categories'
+        catalog[cat['book_type']][key].append({'id': cat['id'], 'name': cat['name']})
+
+    account_items = [{'value': f"account:{acc['id']}", 'display_name': acc['account_name']} for acc in accounts]
+    for book in catalog.values():
+        book['expense_items'] = account_items + [
+            {'value': f"category:{cat['id']}", 'display_name': cat['name']} for cat in book['expense_categories']
+        ]
+    return catalog
+
+
+def get_cashbook_catalog(year):
+    """출납장 화면 입력 항목 조회 (회계연도별 계정과목 + 출납장유형별 과목)
+
+    편성 구조 버전별로 캐시되며 Account/CashBookCategory 변경 시에만 다시 구성한다.
+
+    Returns:
+        {출납장유형: {'income_categories', 'expense_categories', 'expense_items'}}
+        - income_categories/expense_categories: [{'id', 'name'}] (과목명 순)
+        - expense_items: 지출 선택 항목 [{'value': 'account:ID' 또는 'category:ID', 'display_name'}]
+          (계정과목 코드순 다음 지출 과목)
+    """
+    return get_or_build(
+        'cashbook_catalog', (year,), lambda: _build_cashbook_catalog(year), version=get_structure_version()
+    )
+
+
+def get_budget_skeleton(year):
+    """회계연도 예산 편성 구조 조회 (대분류 > 중분류 > 계정, 행 수 포함)
+
+    편성 구조 버전별로 캐시되며 Account/Budget 변경 시에만 다시 구성한다.
+    """
+    def build():
+        budgets = Budget.objects.filter(fiscal_year=year).select_related('account').order_by('account__code')
+        return build_budget_skeleton(budgets)
+
+    return get_or_build('budget_skeleton', (year,), build, version=get_structure_version())
+
+
+def _build_budget_position(year):
+    """연간 계정별/중분류별 예산·집행액 색인 구성 (예수금 합산 포함)"""
+    skeleton = get_budget_skeleton(year)
+    totals = get_expense_totals_by_account(year, 12, skeleton['accounts'])
+
+    accounts = {}
+    mediums = {}
+    for large_cat, large_data in skeleton['execution_data'].items():
+        for med_cat, med_data in large_data['medium_categories'].items():
+            medium_key = f'{large_cat}/{med_cat}'
+            medium_executed = 0
+            for item in med_data['items']:
+                executed = totals.get(item['account'].id, {}).get('cumulative', 0)
+                accounts[item['account'].id] = (item['display_name'], medium_key, item['annual_budget'], executed)
+                medium_executed += executed
+            mediums[medium_key] = (med_cat, med_data['subtotal_budget'], medium_executed)
+
+    return {'accounts': accounts, 'mediums': mediums}
+
+
+def _budget_status(name, annual_budget, executed, amount):
+    remaining = annual_budget - executed
+    return {
+        'name': name,
+        'budget': annual_budget,
+        'executed': executed,
+        'remaining': remaining,
+        'rate': calc_rate(executed, annual_budget),
+        'remaining_after': remaining - amount,
+    }
+
+
+def get_remaining_budget(account_id, year, amount=0):
+    """계정 및 소속 중분류의 잔여예산 조회 (입력 중 즉시 확인용)
+
+    계정별/중분류별 예산·집행액 색인을 데이터 버전별로 캐시해 두고
+    조회 시에는 dict 조회만 수행한다. 집행액은 해당 연도 승인 지출 전체 기준.
+
+    Args:
+        amount: 입력 중인 지출 금액 (remaining_after 계산용)
+
+    Returns:
+        {'account': {...}, 'medium': {...}} 또는 예산 미편성 계정이면 None
+    """
+    position = get_or_build('budget_position', (year,), lambda: _build_budget_position(year))
+
+    account = position['accounts'].get(account_id)
+    if account is None:
+        return None
+
+    name, medium_key, annual_budget, executed = account
+    medium_name, medium_budget, medium_executed = position['mediums'][medium_key]
+    return {
+        'account': _budget_status(name, annual_budget, executed, amount),
+        'medium': _budget_status(medium_name, medium_budget, medium_executed, amount),
+    }
+
+
+CASHBOOK_BALANCE_FIELDS = ('year', 'month', 'income_total', 'expense_total', 'closing_balance')
+
+
+def get_cashbook_balance(book_type, year, month):
+    """출납장 월 잔액 조회 (출납장월별잔액 색인 1건 조회)
+
+    해당 월 또는 그 이전 가장 최근 월의 행에서 전월이월/수입/지출/차월이월을 구한다.
+    해당 월에 기록이 없으면 직전 기록 월의 차월이월이 그대로 이월된다.
+
+    Returns:
+        {'prev_balance', 'income_total', 'expense_total', 'next_balance'} (원 단위 정수)
+    """
+    row = CashBookBalance.objects.filter(
+        Q(year__lt=year) | Q(year=year, month__lte=month), book_type=book_type,
+    ).order_by('-year', '-month').values(*CASHBOOK_BALANCE_FIELDS).first()
+    return _cashbook_balance_from_row(row, year, month)
+
+
+def get_cashbook_balances(book_types, year, month):
+    """여러 출납장 유형의 월 잔액을 한 번에 조회 (유형별 최근 행을 상관 서브쿼리로 1회 조회)
+
+    Returns:
+        {book_type: get_cashbook_balance와 같은 형식}
+    """
+    latest = CashBookBalance.objects.filter(
+        Q(year__lt=year) | Q(year=year, month__lte=month), book_type=OuterRef('book_type'),
+    ).order_by('-year', '-month').values('pk')[:1]
+    rows = {
+        row['book_type']: row
+        for row in CashBookBalance.objects.filter(book_type__in=book_types, pk=Subquery(latest)).values(
+            'book_type', *CASHBOOK_BALANCE_FIELDS
+        )
+    }
+    return {book_type: _cashbook_balance_from_row(rows.get(book_type), year, month) for book_type in book_types}
+
+
+def _cashbook_balance_from_row(row, year, month):
+    """출납장월별잔액 행(해당 월 또는 직전 기록 월)에서 해당 월 잔액 구성"""
+    if row is None:
+        return {'prev_balance': 0, 'income_total': 0, 'expense_total': 0, 'next_balance': 0}
+
+    closing = int(row['closing_balance'])
+    if (row['year'], row['month']) != (year, month):
+        return {'prev_balance': closing, 'income_total': 0, 'expense_total': 0, 'next_balance': closing}
+
+    income = int(row['income_total'])
+    expense = int(row['expense_total'])
+    return {
+        'prev_balance': closing - income + expense,
+        'income_total': income,
+        'expense_total': expense,
+        'next_balance': closing,
+    }
+
+
+def get_cashbook_year_balances(book_type, year):
+    """출납장 연간 월별 잔액 (출납장월별잔액 색인 조회 - 전년도 이월 1건 + 당해 연도 월 행)
+
+    Returns:
+        [{'month', 'prev_balance', 'income_total', 'expense_total', 'next_balance'}, ...] 1~12월 (원 단위 정수)
+    """
+    balance = int(CashBookBalance.objects.filter(
+        book_type=book_type, year__lt=year,
+    ).order_by('-year', '-month').values_list('closing_balance', flat=True).first() or 0)
+
+    rows = {
+        row['month']: row for row in CashBookBalance.objects.filter(book_type=book_type, year=year).values(
+            'month', 'income_total', 'expense_total', 'closing_balance'
+        )
+    }
+
+    months = []
+    for month in range(1, 13):
+        row = rows.get(month)
+        next_balance = int(row['closing_balance']) if row else balance
+        months.append({
+            'month': month,
+            'prev_balance': balance,
+            'income_total': int(row['income_total']) if row else 0,
+            'expense_total': int(row['expense_total']) if row else 0,
+            'next_balance': next_balance,
+        })
+        balance = next_balance
+    return months
+
+
+def get_deposit_month_totals(year):
+    """예수금출납장 월별 지출 합계
+
+    Returns:
+        {month: 원 단위 정수}
+    """
+    rows = DepositLedger.objects.filter(year=year).values('month').annotate(total=Sum('amount')).order_by()
+    return {row['month']: int(row['total'] or 0) for row in rows}
+
+
+def get_ledger_cashbook_balances():
+    """출납장 원장 기준 월별 잔액 재계산 (검증/복구용)
+
+    Returns:
+        {(book_type, year, month): (income_total, expense_total, closing_balance)}
+    """
+    rows = CashBook.objects.values('book_type', 'year', 'month').annotate(
+        income=Sum('amount', filter=Q(entry_type='INCOME')),
+        expense=Sum('amount', filter=Q(entry_type='EXPENSE')),
+    ).order_by('book_type', 'year', 'month')
+
+    balances = {}
+    running = {}
+    for row in rows:
+        income = row['income'] or 0
+        expense = row['expense'] or 0
+        if not income and not expense:
+            continue
+        closing = running.get(row['book_type'], 0) + income - expense
+        running[row['book_type']] = closing
+        balances[(row['book_type'], row['year'], row['month'])] = (income, expense, closing)
+    return balances
+
+
+CASHBOOK_SNAPSHOT_FIELDS = {
+    'INCOME': ('id', 'date', 'category__name', 'description', 'amount', 'bank_account__bank_name', 'note', 'order'),
+    'EXPENSE': ('id', 'date', 'account__account_name', 'category__name', 'description', 'amount',
+                'bank_account__bank_name', 'note', 'order'),
+}
+
+
+def get_cashbook_snapshot_entries(book_types, start, end):
+    """출납장 스냅샷용 수입/지출 내역을 유형/기간 전체에 대해 1회 조회
+
+    Args:
+        book_types: 출납장 유형 목록 (예: ['BANK', 'CASH'])
+        start, end: (year, month) 튜플 (양 끝 포함)
+
+    Returns:
+        {(book_type, year, month): {'INCOME': [...], 'EXPENSE': [...]}} - 항목은 CASHBOOK_SNAPSHOT_FIELDS 형식
+    """
+    (start_year, start_month), (end_year, end_month) = start, end
+    fields = set(CASHBOOK_SNAPSHOT_FIELDS['INCOME']) | set(CASHBOOK_SNAPSHOT_FIELDS['EXPENSE'])
+
+    rows = CashBook.objects.filter(
+        Q(year__gt=start_year) | Q(year=start_year, month__gte=start_month),
+        Q(year__lt=end_year) | Q(year=end_year, month__lte=end_month),
+        book_type__in=book_types,
+    ).order_by('year', 'month', 'order').values('book_type', 'year', 'month', 'entry_type', *fields)
+
+    entries = {}
+    for row in rows:
+        month_entries = entries.setdefault(
+            (row['book_type'], row['year'], row['month']), {'INCOME': [], 'EXPENSE': []}
+        )
+        if row['entry_type'] in month_entries:
+            month_entries[row['entry_type']].append(
+                {field: row[field] for field in CASHBOOK_SNAPSHOT_FIELDS[row['entry_type']]}
+            )
+    return entries
+
+
+DEPOSIT_SNAPSHOT_FIELDS = ('id', 'date', 'category__name', 'description', 'amount', 'note', 'order')
+
+
+def get_deposit_snapshot_entries(start, end):
+    """예수금출납장 스냅샷용 지출 내역을 기간 전체에 대해 1회 조회
+
+    Returns:
+        {(year, month): [...]} - 항목은 DEPOSIT_SNAPSHOT_FIELDS 형식
+    """
+    (start_year, start_month), (end_year, end_month) = start, end
+    rows = DepositLedger.objects.filter(
+        Q(year__gt=start_year) | Q(year=start_year, month__gte=start_month),
+        Q(year__lt=end_year) | Q(year=end_year, month__lte=end_month),
+    ).order_by('year', 'month', 'order').values('year', 'month', *DEPOSIT_SNAPSHOT_FIELDS)
+
+    entries = {}
+    for row in rows:
+        entries.setdefault((row['year'], row['month']), []).append(
+            {field: row[field] for field in DEPOSIT_SNAPSHOT_FIELDS}
+        )
+    return entries
+
+
+def get_card_snapshot_items(year, month):
+    """카드사용내역 스냅샷용 해당 월 카드 지출 조회"""
+    return list(Transaction.objects.filter(
+        date__year=year,
+        date__month=month,
+        payment_method='CARD',
+        transaction_type='EXPENSE',
+    ).order_by('date').values(
+        'id', 'date', 'account__account_name', 'description', 'amount', 'approval_number'
+    ))
+
+
+def get_snapshot_index(snapshot_type, year, month):
+    """확정 스냅샷 색인 조회 (확정 상태/일시 표시용 - snapshot_data 미조회)"""
+    return SnapshotIndex.objects.filter(snapshot_type=snapshot_type, fiscal_year=year, month=month).first()
@@ -1 +1,783 @@
 # 비즈니스 로직 (생성/수정/삭제)
+from collections import OrderedDict
+
+from django.db import transaction
+from django.db.models import F, Q, Max, Subquery
+from django.utils import timezone
+
+from common.utils import calc_rate
+from .cache import bump_data_version
+from .models import (
+    Transaction, CashBook, CashBookCategory, DepositLedger, MonthlyAccountTotal, CashBookBalance, MonthlySnapshot,
+    SnapshotIndex, SnapshotVersion,
+)
+from .snapshots import summarize_snapshot, make_snapshot_delta, apply_snapshot_delta, iter_execution_items
+
+
+def is_counted_expense(transaction_type, status):
+    """월별계정집계 대상 여부 (승인된 지출만 집계)"""
+    return transaction_type == 'EXPENSE' and status == 'APPROVED'
+
+
+def apply_monthly_total(account_id, txn_date, payment_method, amount, sign, count=1):
+    """월별계정집계에 거래를 반영 (sign: 1 추가, -1 차감)
+
+    같은 계정/월/결제수단의 여러 건은 금액 합계와 count로 한 번에 반영할 수 있다.
+    """
+    key = {
+        'account_id': account_id,
+        'year': txn_date.year,
+        'month': txn_date.month,
+        'payment_method': payment_method,
+    }
+
+    with transaction.atomic():
+        updated = MonthlyAccountTotal.objects.filter(**key).update(
+            amount=F('amount') + amount * sign,
+            item_count=F('item_count') + sign * count,
+        )
+        if not updated:
+            MonthlyAccountTotal.objects.create(**key, amount=amount * sign, item_count=sign * count)
+
+        # 거래가 모두 빠진 집계 행은 정리
+        if sign < 0:
+            MonthlyAccountTotal.objects.filter(**key, item_count__lte=0).delete()
+
+
+def apply_cashbook_balance(book_type, year, month, entry_type, amount, sign):
+    """출납장월별잔액에 출납장 1건을 반영 (sign: 1 추가, -1 차감)
+
+    해당 월의 수입/지출 합계와 누적 잔액을 갱신하고, 이후 월의 누적 잔액도
+    같은 차액만큼 한 번의 UPDATE로 이동시킨다.
+    """
+    if not amount:
+        return
+
+    income = amount * sign if entry_type == 'INCOME' else 0
+    expense = amount * sign if entry_type == 'EXPENSE' else 0
+    delta = income - expense
+
+    with transaction.atomic():
+        updated = CashBookBalance.objects.filter(book_type=book_type, year=year, month=month).update(
+            income_total=F('income_total') + income,
+            expense_total=F('expense_total') + expense,
+            closing_balance=F('closing_balance') + delta,
+        )
+        if not updated:
+            previous_closing = CashBookBalance.objects.filter(
+                Q(year__lt=year) | Q(year=year, month__lt=month), book_type=book_type,
+            ).order_by('-year', '-month').values_list('closing_balance', flat=True).first() or 0
+            CashBookBalance.objects.create(
+                book_type=book_type, year=year, month=month,
+                income_total=income, expense_total=expense, closing_balance=previous_closing + delta,
+            )
+        else:
+            # 수입/지출이 모두 없어진 월은 제거 (이후 월은 직전 기록 월의 잔액을 그대로 이월)
+            CashBookBalance.objects.filter(
+                book_type=book_type, year=year, month=month, income_total=0, expense_total=0,
+            ).delete()
+
+        CashBookBalance.objects.filter(
+            Q(year__gt=year) | Q(year=year, month__gt=month), book_type=book_type,
+        ).update(closing_balance=F('closing_balance') + delta)
+
+
+def sync_cashbook_month(book_type, year, month, rows):
+    """출납장 월 내역을 제출된 행과 비교해 추가/수정/삭제분만 반영
+
+    rows는 화면 순서대로 {'id', 'entry_type', 'fields', 'transaction'}를 담는다.
+    - id: 화면에 실려 온 기존 행 ID (없거나 다른 월/구분의 ID이면 새 행으로 추가)
+    - fields: 화면에서 입력받는 CashBook 필드만 (제출되지 않은 필드는 기존 값 유지)
+    - transaction: 연동 거래내역의 {'account_id', 'description'} (연동 대상이 아니면 None)
+
+    제출되지 않은 기존 행은 삭제하고, 순서는 제출 순서로 다시 매긴다.
+    """
+    existing = {
+        entry.pk: entry
+        for entry in CashBook.objects.filter(
+            book_type=book_type, year=year, month=month
+        ).select_related('linked_transaction')
+    }
+    kept = set()
+
+    changes = []
+    for order, row in enumerate(rows):
+        entry = existing.get(row['id'])
+        if entry is None or entry.pk in kept or entry.entry_type != row['entry_type']:
+            entry = None
+        else:
+            kept.add(entry.pk)
+        changes.append((entry, row, dict(row['fields'], order=order)))
+
+    deleted = [entry for pk, entry in existing.items() if pk not in kept]
+    return _apply_cashbook_changes(book_type, year, month, changes, deleted)
+
+
+def patch_cashbook_month(book_type, year, month, rows, deleted_ids):
+    """출납장 월 내역 중 변경된 행만 반영 (행 단위 자동저장용)
+
+    rows는 sync_cashbook_month와 같은 형식이되 추가/수정할 행만 담고, id가 있으면 해당 행을
+    수정한다. 새 행은 월 마지막 순서 뒤에 붙인다. 이미 삭제된 deleted_ids는 무시한다.
+
+    Raises:
+        ValueError: 수정할 행이 해당 출납장/월/구분에 없거나 같은 행을 중복 지정한 경우
+    """
+    update_ids = [row['id'] for row in rows if row['id']]
+    if len(set(update_ids)) != len(update_ids) or set(update_ids) & set(deleted_ids):
+        raise ValueError('같은 행이 중복 지정되었습니다.')
+
+    month_entries = CashBook.objects.filter(book_type=book_type, year=year, month=month)
+    existing = month_entries.select_related('linked_transaction').in_bulk(set(update_ids) | set(deleted_ids))
+    next_order = None
+
+    changes = []
+    for row in rows:
+        fields = dict(row['fields'])
+        entry = existing.get(row['id']) if row['id'] else None
+        if row['id'] and (entry is None or entry.entry_type != row['entry_type']):
+            raise ValueError(f'수정할 행({row["id"]})을 찾을 수 없습니다. 화면을 새로고침해주세요.')
+        if entry is None:
+            if next_order is None:
+                next_order = (month_entries.aggregate(max_order=Max('order'))['max_order'] or 0) + 1
+            fields['order'] = next_order
+            next_order += 1
+        changes.append((entry, row, fields))
+
+    deleted = [existing[pk] for pk in deleted_ids if pk in existing]
+    return _apply_cashbook_changes(book_type, year, month, changes, deleted)
+
+
+def _apply_cashbook_changes(book_type, year, month, changes, deleted):
+    """출납장 행 추가/수정/삭제와 연동 거래내역을 반영
+
+    changes는 (기존 행 또는 None, 제출 행, 반영할 필드) 목록이며, 결과의 row_ids는
+    changes 순서대로 반영된 행 ID를 담는다.
+    추가/수정은 행별 신호 없이 일괄 처리하고 출납장월별잔액/월별계정집계/스냅샷 표시/조회 캐시를
+    변경분을 모아 한 번씩 반영한다. 삭제는 QuerySet.delete()로 처리하므로 행별 신호가 차감한다.
+    """
+    plan = _plan_cashbook_changes(book_type, year, month, changes)
+    txn_deleted_ids = plan['txn_unlinked_ids'] + [
+        entry.linked_transaction_id for entry in deleted if entry.linked_transaction_id
+    ]
+
+    with transaction.atomic():
+        _save_cashbook_plan(plan)
+        _apply_cashbook_plan_totals(book_type, year, month, plan)
+        if deleted:
+            CashBook.objects.filter(pk__in=[entry.pk for entry in deleted]).delete()
+        if txn_deleted_ids:
+            Transaction.objects.filter(pk__in=txn_deleted_ids).delete()
+
+    return {
+        'created': len(plan['created']),
+        'updated': len(plan['updated']),
+        'deleted': len(deleted),
+        'transactions': len(plan['created_links']) + len(plan['txn_updated']) + len(txn_deleted_ids),
+        'row_ids': [entry.pk for entry in plan['row_entries']],
+    }
+
+
+def _plan_cashbook_changes(book_type, year, month, changes):
+    """추가/수정할 출납장 행과 연동 거래내역 변경분을 분류 (DB 반영 전)"""
+    payment_method = 'BANK' if book_type == 'BANK' else 'CASH'
+    plan = {
+        'now': timezone.now(),
+        'created': [], 'updated': [], 'update_fields': set(),
+        'created_links': [],  # (출납장 행, 새 거래내역)
+        'txn_updated': [], 'txn_update_fields': set(),
+        'txn_previous': [],  # 수정 전 거래내역 (집계 차감용)
+        'txn_unlinked_ids': [],  # 연동이 해제되어 삭제할 거래내역
+        'balance_delta': {'INCOME': 0, 'EXPENSE': 0},
+        'row_entries': [],
+    }
+
+    for entry, row, fields in changes:
+        spec = row['transaction']
+        txn_values = spec and {
+            'date': fields['date'], 'account_id': spec['account_id'], 'description': spec['description'],
+            'amount': fields['amount'], 'payment_method': payment_method,
+        }
+        if entry is None:
+            entry = CashBook(book_type=book_type, year=year, month=month, entry_type=row['entry_type'], **fields)
+            plan['created'].append(entry)
+            plan['balance_delta'][entry.entry_type] += entry.amount
+            if txn_values:
+                plan['created_links'].append((entry, Transaction(
+                    transaction_type='EXPENSE', status='APPROVED', **txn_values
+                )))
+        else:
+            _plan_cashbook_update(plan, entry, fields, txn_values)
+        plan['row_entries'].append(entry)
+
+    return plan
+
+
+def _plan_cashbook_update(plan, entry, fields, txn_values):
+    """기존 출납장 행의 변경 필드와 연동 거래내역 수정/추가/해제를 기록"""
+    changed = [name for name, value in fields.items() if getattr(entry, name) != value]
+    if 'amount' in changed:
+        plan['balance_delta'][entry.entry_type] += fields['amount'] - entry.amount
+    for name in changed:
+        setattr(entry, name, fields[name])
+
+    txn = entry.linked_transaction
+    if txn and txn_values:
+        txn_changed = [name for name, value in txn_values.items() if getattr(txn, name) != value]
+        if txn_changed:
+            plan['txn_previous'].append((txn.account_id, txn.date, txn.payment_method, txn.amount,
+                                         is_counted_expense(txn.transaction_type, txn.status)))
+            for name in txn_changed:
+                setattr(txn, name, txn_values[name])
+            txn.updated_at = plan['now']
+            plan['txn_updated'].append(txn)
+            plan['txn_update_fields'].update(txn_changed)
+    elif txn_values:
+        plan['created_links'].append((entry, Transaction(
+            transaction_type='EXPENSE', status='APPROVED', **txn_values
+        )))
+        changed.append('linked_transaction')
+    elif txn:
+        plan['txn_unlinked_ids'].append(txn.pk)
+        entry.linked_transaction = None
+        changed.append('linked_transaction')
+
+    if changed:
+        entry.updated_at = plan['now']
+        plan['updated'].append(entry)
+        plan['update_fields'].update(changed)
+
+
+def _save_cashbook_plan(plan):
+    """추가/수정분을 신호 없이 일괄 저장 (새 거래내역을 먼저 만들어 출납장 행에 연결)"""
+    if plan['created_links']:
+        Transaction.objects.bulk_create([txn for _, txn in plan['created_links']])
+        for entry, txn in plan['created_links']:
+            entry.linked_transaction = txn
+    if plan['created']:
+        CashBook.objects.bulk_create(plan['created'])
+    if plan['updated']:
+        CashBook.objects.bulk_update(plan['updated'], sorted(plan['update_fields'] | {'updated_at'}))
+    if plan['txn_updated']:
+        Transaction.objects.bulk_update(plan['txn_updated'], sorted(plan['txn_update_fields'] | {'updated_at'}))
+
+
+def _apply_cashbook_plan_totals(book_type, year, month, plan):
+    """일괄 저장분의 출납장월별잔액/월별계정집계/스냅샷 표시/조회 캐시를 한 번씩 반영"""
+    for entry_type, amount in plan['balance_delta'].items():
+        apply_cashbook_balance(book_type, year, month, entry_type, amount, 1)
+    if plan['created'] or plan['updated']:
+        mark_cashbook_snapshots_stale(book_type, year, month)
+
+    # 월별계정집계는 계정/월/결제수단별로 묶어 한 번씩 반영
+    removed_totals, added_totals = {}, {}
+    for account_id, txn_date, txn_method, amount, counted in plan['txn_previous']:
+        if counted:
+            _add_monthly_total(removed_totals, account_id, txn_date, txn_method, amount)
+    for txn in [txn for _, txn in plan['created_links']] + plan['txn_updated']:
+        if is_counted_expense(txn.transaction_type, txn.status):
+            _add_monthly_total(added_totals, txn.account_id, txn.date, txn.payment_method, txn.amount)
+
+    txn_months = set()
+    for sign, totals in ((-1, removed_totals), (1, added_totals)):
+        for (account_id, txn_year, txn_month, txn_method), (txn_date, amount, count) in totals.items():
+            apply_monthly_total(account_id, txn_date, txn_method, amount, sign, count)
+            txn_months.add((txn_year, txn_month))
+    for txn_year, txn_month in sorted(txn_months):
+        mark_budget_snapshots_stale(txn_year, txn_month)
+    if plan['created_links'] or plan['txn_updated']:
+        bump_data_version()
+
+
+def _add_monthly_total(totals, account_id, txn_date, payment_method, amount):
+    """월별계정집계 반영분을 계정/월/결제수단별 (대표일자, 금액합계, 건수)로 누적"""
+    key = (account_id, txn_date.year, txn_date.month, payment_method)
+    _, total, count = totals.get(key, (txn_date, 0, 0))
+    totals[key] = (txn_date, total + amount, count + 1)
+
+
+def sync_deposit_ledger_month(year, month, rows):
+    """예수금출납장 월 내역을 제출된 행과 비교해 추가/수정/삭제분만 반영
+
+    rows는 화면 순서대로 {'id', 'fields'}를 담는다 (id가 없거나 다른 월의 ID이면 새 행으로 추가).
+    제출되지 않은 기존 행은 삭제하고, 순서는 제출 순서로 다시 매긴다.
+    추가/수정은 신호 없이 일괄 처리해 스냅샷 표시와 조회 캐시를 한 번만 갱신하고,
+    삭제는 QuerySet.delete()로 처리하므로 행별 신호가 반영한다.
+    """
+    now = timezone.now()
+    existing = DepositLedger.objects.filter(year=year, month=month).in_bulk()
+    kept = set()
+
+    created, updated, update_fields = [], [], set()
+    previous_categories = set()  # 수정된 행의 이전 과목 (예산집행 합산 여부 판단용)
+    for order, row in enumerate(rows):
+        fields = dict(row['fields'], order=order)
+        entry = existing.get(row['id'])
+        if entry is None or entry.pk in kept:
+            created.append(DepositLedger(year=year, month=month, **fields))
+            continue
+        kept.add(entry.pk)
+        changed = [name for name, value in fields.items() if getattr(entry, name) != value]
+        if changed:
+            previous_categories.add(entry.category_id)
+            for name in changed:
+                setattr(entry, name, fields[name])
+            entry.updated_at = now
+            updated.append(entry)
+            update_fields.update(changed)
+
+    deleted_ids = [pk for pk in existing if pk not in kept]
+
+    with transaction.atomic():
+        if created:
+            DepositLedger.objects.bulk_create(created)
+        if updated:
+            DepositLedger.objects.bulk_update(updated, sorted(update_fields | {'updated_at'}))
+        if deleted_ids:
+            DepositLedger.objects.filter(pk__in=deleted_ids).delete()
+        if created or updated:
+            mark_deposit_snapshot_stale(year, month)
+            category_ids = {entry.category_id for entry in created + updated} | previous_categories
+            if deposit_affects_budget(category_ids):
+                mark_budget_snapshots_stale(year, month)
+            bump_data_version()
+
+    return {'created': len(created), 'updated': len(updated), 'deleted': len(deleted_ids)}
+
+
+def mark_cashbook_snapshots_stale(book_type, year, month):
+    """출납장 변경 시 해당 월 및 이후 월의 확정 스냅샷을 재확정필요로 표시
+
+    해당 월은 내역이, 이후 월은 전월이월/차월이월이 달라질 수 있으므로 함께 표시한다.
+    예수금출납장 스냅샷은 DepositLedger 기준이므로 출납장(DEPOSIT) 변경과는 무관하다.
+    """
+    if book_type == 'DEPOSIT':
+        return 0
+    # 연간결산은 월 잔액이 이월되는 이후 연도까지 영향
+    _mark_snapshots_stale(snapshot_type='ANNUAL', fiscal_year__gte=year)
+    return _mark_snapshots_stale(
+        Q(fiscal_year__gt=year) | Q(fiscal_year=year, month__gte=month),
+        snapshot_type=f'CASHBOOK_{book_type}',
+    )
+
+
+def mark_deposit_snapshot_stale(year, month):
+    """예수금출납장 변경 시 해당 월 확정 스냅샷을 재확정필요로 표시 (이월 잔액 없음)"""
+    mark_annual_snapshot_stale(year)
+    return _mark_snapshots_stale(snapshot_type='CASHBOOK_DEPOSIT', fiscal_year=year, month=month)
+
+
+def mark_budget_snapshots_stale(year, month):
+    """지출 집계 변경 시 해당 월 및 같은 연도 이후 월의 예산집행 확정 스냅샷을 재확정필요로 표시
+
+    예산집행내역의 누계는 연초부터 합산하므로 이후 월도 함께 표시하고, 연간결산도 표시한다.
+    """
+    mark_annual_snapshot_stale(year)
+    return _mark_snapshots_stale(snapshot_type='BUDGET', fiscal_year=year, month__gte=month)
+
+
+def deposit_affects_budget(category_ids):
+    """예수금출납장 과목 중 예산집행에 합산되는(합산계정이 있는) 과목이 있는지 여부"""
+    return CashBookCategory.objects.filter(pk__in=category_ids, addback_account__isnull=False).exists()
+
+
+def mark_annual_snapshot_stale(year):
+    """월별 스냅샷 확정/해제 또는 원본 변경 시 해당 연도 연간결산을 재확정필요로 표시"""
+    return _mark_snapshots_stale(snapshot_type='ANNUAL', fiscal_year=year)
+
+
+def _mark_snapshots_stale(*args, **kwargs):
+    """스냅샷과 색인의 재확정필요 표시를 같은 조건으로 갱신"""
+    updated = MonthlySnapshot.objects.filter(*args, is_stale=False, **kwargs).update(is_stale=True)
+    if updated:
+        SnapshotIndex.objects.filter(*args, is_stale=False, **kwargs).update(is_stale=True)
+    return updated
+
+
+def sync_snapshot_index(snapshot):
+    """스냅샷 저장 시 색인 갱신 (확정 스냅샷만 색인에 유지)"""
+    if not snapshot.is_confirmed:
+        SnapshotIndex.objects.filter(snapshot=snapshot).delete()
+        return
+
+    row_count, totals = summarize_snapshot(snapshot.snapshot_type, snapshot.snapshot_data)
+    SnapshotIndex.objects.update_or_create(
+        snapshot=snapshot,
+        defaults={
+            'snapshot_type': snapshot.snapshot_type,
+            'fiscal_year': snapshot.fiscal_year,
+            'month': snapshot.month,
+            'confirmed_at': snapshot.confirmed_at,
+            'confirmed_by': snapshot.confirmed_by,
+            'is_stale': snapshot.is_stale,
+            'row_count': row_count,
+            'totals': totals,
+        },
+    )
+
+
+def merge_budget_snapshot_months(matrix, budget_snapshots):
+    """확정된 월별 예산집행 스냅샷의 계정별 당월 집행액을 계정 × 월 행렬에 병합
+
+    Args:
+        matrix: {account_id: [1월, ..., 12월]} - 확정되지 않은 월만 원본에서 집계한 행렬 (제자리 갱신)
+        budget_snapshots: {month: decode_snapshot() 결과}
+    """
+    for month, data in budget_snapshots.items():
+        for item in iter_execution_items(data):
+            matrix.setdefault(item['account_id'], [0] * 12)[month - 1] = int(item['monthly'] or 0)
+    return matrix
+
+
+def build_annual_cashbook(months):
+    """연간 출납장 요약 구성 (월별 행 목록 → 연간 수입/지출 합계, 연초/연말 잔액)"""
+    return {
+        'months': months,
+        'opening_balance': months[0].get('prev_balance', 0),
+        'income_total': sum(m.get('income_total', 0) for m in months),
+        'expense_total': sum(m.get('expense_total', 0) for m in months),
+        'closing_balance': months[-1].get('next_balance', 0),
+    }
+
+
+# 이력 복원 시 적용할 변경분 수를 제한하기 위해 이 간격마다 전체 데이터로 저장
+SNAPSHOT_FULL_VERSION_INTERVAL = 10
+
+
+def _snapshot_version_chain(snapshot_type, fiscal_year, month, version=None):
+    """마지막 전체저장 확정 버전부터의 이력 (버전 순) - 전체저장 버전은 하위 쿼리로 찾아 한 번에 조회"""
+    versions = SnapshotVersion.objects.filter(snapshot_type=snapshot_type, fiscal_year=fiscal_year, month=month)
+    if version is not None:
+        versions = versions.filter(version__lte=version)
+    last_full = versions.filter(action='CONFIRM', is_full=True).order_by('-version').values('version')[:1]
+    return list(
+        versions.filter(version__gte=Subquery(last_full)).order_by('version')
+        .values_list('version', 'action', 'is_full', 'data')
+    )
+
+
+def _restore_snapshot_version(chain):
+    """이력 목록의 확정 버전을 차례로 적용 - (데이터, 전체저장 이후 변경분 수)"""
+    data, delta_count = None, 0
+    for _, action, is_full, row_data in chain:
+        if action != 'CONFIRM':
+            continue
+        if is_full:
+            data, delta_count = row_data, 0
+        else:
+            data = apply_snapshot_delta(data, row_data)
+            delta_count += 1
+    return data, delta_count
+
+
+def load_snapshot_version_data(snapshot_type, fiscal_year, month, version=None):
+    """확정 이력에서 스냅샷 데이터 복원 (version 미지정 시 마지막 확정 버전)
+
+    마지막 전체저장 버전부터 변경분을 차례로 적용한다.
+
+    Returns:
+        (저장 형식 스냅샷 데이터, 전체저장 이후 적용한 변경분 수) - 확정 이력이 없으면 (None, 0)
+    """
+    return _restore_snapshot_version(_snapshot_version_chain(snapshot_type, fiscal_year, month, version))
+
+
+def record_snapshot_version(snapshot_type, fiscal_year, month, action, confirmed_at, confirmed_by='', snapshot_data=None):
+    """스냅샷 확정/확정해제를 이력에 새 버전으로 추가 (기존 버전은 수정하지 않음)"""
+    key = {'snapshot_type': snapshot_type, 'fiscal_year': fiscal_year, 'month': month}
+    chain = _snapshot_version_chain(**key)
+    if chain:
+        latest = chain[-1][0]
+    else:
+        latest = SnapshotVersion.objects.filter(**key).aggregate(latest=Max('version'))['latest']
+
+    version = SnapshotVersion(
+        **key, version=(latest or 0) + 1, action=action,
+        confirmed_at=confirmed_at, confirmed_by=confirmed_by,
+    )
+    if action == 'CONFIRM':
+        previous, delta_count = _restore_snapshot_version(chain)
+        version.row_count, version.totals = summarize_snapshot(snapshot_type, snapshot_data)
+        if previous is None or delta_count + 1 >= SNAPSHOT_FULL_VERSION_INTERVAL:
+            version.is_full, version.data = True, snapshot_data
+        else:
+            version.data = make_snapshot_delta(previous, snapshot_data)
+    version.save()
+    return version
+
+
+def build_cashbook_snapshot(income_entries, expense_entries, prev_balance):
+    """출납장 스냅샷 데이터 구성 (합계/차월이월은 원 단위 정수)"""
+    income_total = sum(int(e['amount'] or 0) for e in income_entries)
+    expense_total = sum(int(e['amount'] or 0) for e in expense_entries)
+
+    # 날짜/금액 변환 및 열 단위 압축은 encode_snapshot에서 처리
+    return {
+        'income_entries': income_entries,
+        'expense_entries': expense_entries,
+        'income_total': income_total,
+        'expense_total': expense_total,
+        'prev_balance': prev_balance,
+        'next_balance': prev_balance + income_total - expense_total,
+    }
+
+
+def build_deposit_snapshot(expense_entries):
+    """예수금출납장 스냅샷 데이터 구성 (지출 내역만 관리)"""
+    return {
+        'expense_entries': expense_entries,
+        'expense_total': sum(int(e['amount'] or 0) for e in expense_entries),
+    }
+
+
+def build_card_snapshot(card_items):
+    """카드사용내역 스냅샷 데이터 구성 (날짜/금액 변환은 encode_snapshot에서 처리)"""
+    return {
+        'card_items': [{
+            'id': item['id'],
+            'date': item['date'],
+            'day': item['date'].day if item['date'] else None,
+            'account_name': item['account__account_name'] or '',
+            'description': item['description'] or '',
+            'amount': item['amount'] or 0,
+            'approval_number': item['approval_number'] or '',
+        } for item in card_items],
+        'total_amount': sum(int(item['amount'] or 0) for item in card_items),
+        'item_count': len(card_items),
+    }
+
+
+def build_budget_skeleton(budgets):
+    """예산 편성 구조(대분류 > 중분류 > 계정) 구성 - 금액 열 제외, 예산액·행 수만 포함
+
+    계정/예산이 바뀔 때만 달라지므로 회계연도별로 캐시해 두고
+    조회 시 build_execution_tree/build_matrix_tree로 집행액만 채운다.
+
+    Args:
+        budgets: Budget 목록 (account 포함, 계정코드 순)
+
+    Returns:
+        {'execution_data': 트리, 'grand_total_budget': int, 'accounts': [Account]}
+    """
+    execution_data = OrderedDict()
+    accounts = []
+
+    for budget in budgets:
+        acc = budget.account
+        accounts.append(acc)
+        large_data = execution_data.get(acc.category_large)
+        if large_data is None:
+            large_data = execution_data[acc.category_large] = {
+                'medium_categories': OrderedDict(), 'total_budget': 0,
+            }
+        med_data = large_data['medium_categories'].get(acc.category_medium)
+        if med_data is None:
+            med_data = large_data['medium_categories'][acc.category_medium] = {
+                'items': [], 'subtotal_budget': 0,
+            }
+
+        annual_budget = int(budget.total_budget)
+        med_data['items'].append({
+            'account': acc,
+            'display_name': acc.account_name,
+            'annual_budget': annual_budget,
+        })
+        med_data['subtotal_budget'] += annual_budget
+        large_data['total_budget'] += annual_budget
+
+    for large_data in execution_data.values():
+        row_count = 0
+        for med_data in large_data['medium_categories'].values():
+            # 중분류별 행 수 = 항목 수 + (항목이 2개 이상일 때만 소계 1행)
+            item_count = len(med_data['items'])
+            med_data['show_subtotal'] = item_count > 1
+            med_data['row_count'] = item_count + (1 if item_count > 1 else 0)
+            row_count += med_data['row_count']
+        # 대분류 합계 행은 rowspan 밖에 있으므로 제외
+        large_data['row_count'] = row_count
+
+    return {
+        'execution_data': execution_data,
+        'grand_total_budget': sum(d['total_budget'] for d in execution_data.values()),
+        'accounts': accounts,
+    }
+
+
+def _fill_tree(skeleton, month_fields, make_amounts):
+    """편성 구조에 집행액을 채워 새 트리 구성 (캐시된 skeleton은 변경하지 않음, 정수 원 단위)
+
+    Args:
+        month_fields: {항목 필드명: (합계 필드 접미사, 초기값 생성함수)}
+            예) {'monthly': ('month', int)} → item['monthly']를 subtotal_month/total_month에 합산
+        make_amounts: (account_id) -> 금액 dict ('cumulative' 및 month_fields 포함)
+    """
+    execution_data = OrderedDict()
+
+    for large_cat, skel_large in skeleton['execution_data'].items():
+        large_data = {
+            'medium_categories': OrderedDict(),
+            'total_budget': skel_large['total_budget'],
+            'total_executed': 0,
+            'row_count': skel_large['row_count'],
+        }
+        for suffix, empty in month_fields.values():
+            large_data[f'total_{suffix}'] = empty()
+
+        for med_cat, skel_med in skel_large['medium_categories'].items():
+            med_data = {
+                'items': [],
+                'subtotal_budget': skel_med['subtotal_budget'],
+                'subtotal_executed': 0,
+                'row_count': skel_med['row_count'],
+                'show_subtotal': skel_med['show_subtotal'],
+            }
+            for suffix, empty in month_fields.values():
+                med_data[f'subtotal_{suffix}'] = empty()
+
+            for skel_item in skel_med['items']:
+                item = {**skel_item, **make_amounts(skel_item['account'].id)}
+                cumulative = item['cumulative']
+                item['remaining'] = item['annual_budget'] - cumulative
+                item['exec_rate'] = calc_rate(cumulative, item['annual_budget'])
+                med_data['items'].append(item)
+                med_data['subtotal_executed'] += cumulative
+
+                for field, (suffix, _) in month_fields.items():
+                    value = item[field]
+                    if isinstance(value, list):
+                        for i, amount in enumerate(value):
+                            med_data[f'subtotal_{suffix}'][i] += amount
+                            large_data[f'total_{suffix}'][i] += amount
+                    else:
+                        med_data[f'subtotal_{suffix}'] += value
+                        large_data[f'total_{suffix}'] += value
+
+            # 잔여예산/집행률은 합산이 끝난 뒤 한 번만 계산
+            med_data['subtotal_remaining'] = med_data['subtotal_budget'] - med_data['subtotal_executed']
+            med_data['subtotal_rate'] = calc_rate(med_data['subtotal_executed'], med_data['subtotal_budget'])
+            large_data['total_executed'] += med_data['subtotal_executed']
+            large_data['medium_categories'][med_cat] = med_data
+
+        large_data['total_remaining'] = large_data['total_budget'] - large_data['total_executed']
+        large_data['total_rate'] = calc_rate(large_data['total_executed'], large_data['total_budget'])
+        execution_data[large_cat] = large_data
+
+    grand_total_budget = skeleton['grand_total_budget']
+    grand_total_executed = sum(d['total_executed'] for d in execution_data.values())
+
+    return {
+        'execution_data': execution_data,
+        'grand_total_budget': grand_total_budget,
+        'grand_total_executed': grand_total_executed,
+        'grand_total_remaining': grand_total_budget - grand_total_executed,
+        'grand_total_rate': calc_rate(grand_total_executed, grand_total_budget),
+    }
+
+
+def build_execution_tree(skeleton, totals):
+    """월간예산집행내역 트리 구성 (대분류 > 중분류 > 계정, 정수 원 단위)
+
+    Args:
+        skeleton: build_budget_skeleton() 결과
+        totals: {account_id: {'cumulative': int, 'monthly': int}}
+    """
+    zero_totals = {'cumulative': 0, 'monthly': 0}
+
+    def make_amounts(account_id):
+        account_totals = totals.get(account_id, zero_totals)
+        return {
+            'cumulative': account_totals['cumulative'],
+            'monthly': account_totals['monthly'],
+            'note': '',
+        }
+
+    result = _fill_tree(skeleton, {'monthly': ('month', int)}, make_amounts)
+    result['grand_total_month'] = sum(d['total_month'] for d in result['execution_data'].values())
+    return result
+
+
+def build_matrix_tree(skeleton, matrix):
+    """연간 월별 예산집행 현황 트리 구성 (계정 × 1~12월, 정수 원 단위)
+
+    Args:
+        skeleton: build_budget_skeleton() 결과
+        matrix: {account_id: [1월, ..., 12월]}
+    """
+    zero_months = [0] * 12
+
+    def make_amounts(account_id):
+        months = list(matrix.get(account_id, zero_months))
+        return {'months': months, 'cumulative': sum(months)}
+
+    result = _fill_tree(skeleton, {'months': ('months', lambda: [0] * 12)}, make_amounts)
+    result['grand_total_months'] = [
+        sum(d['total_months'][i] for d in result['execution_data'].values()) for i in range(12)
+    ]
+    return result
+
+
+def build_period_tree(skeleton, totals):
+    """기간별 예산집행 트리 구성 (조회 기간 집행액 + 비교 기간 집행액/증감, 정수 원 단위)
+
+    cumulative는 조회 기간 집행액이며 집행률/잔여예산은 연간 예산 대비로 계산한다.
+
+    Args:
+        skeleton: build_budget_skeleton() 결과
+        totals: {account_id: {'current': int, 'compare': int}}
+    """
+    zero_totals = {'current': 0, 'compare': 0}
+
+    def make_amounts(account_id):
+        account_totals = totals.get(account_id, zero_totals)
+        current = account_totals['current']
+        compare = account_totals.get('compare', 0)
+        return {'cumulative': current, 'compare': compare, 'change': current - compare}
+
+    result = _fill_tree(skeleton, {'compare': ('compare', int), 'change': ('change', int)}, make_amounts)
+    result['grand_total_compare'] = sum(d['total_compare'] for d in result['execution_data'].values())
+    result['grand_total_change'] = result['grand_total_executed'] - result['grand_total_compare']
+    return result
+
+
+def _line_values(budget, executed, rate, month, remaining):
+    return {'budget': budget, 'executed': executed, 'rate': rate, 'month': month, 'remaining': remaining}
+
+
+def flatten_execution_lines(data):
+    """예산집행내역 트리를 화면 행 단위 값으로 펼침 (변경분 비교용)
+
+    Returns:
+        {행 키: {'budget', 'executed', 'rate', 'month', 'remaining'}}
+        행 키: 'item:<계정ID>', 'med:<대분류>/<중분류>', 'large:<대분류>', 'grand'
+    """
+    lines = {}
+    for large_cat, large_data in data['execution_data'].items():
+        for med_cat, med_data in large_data['medium_categories'].items():
+            for item in med_data['items']:
+                lines[f"item:{item['account'].id}"] = _line_values(
+                    item['annual_budget'], item['cumulative'], item['exec_rate'],
+                    item['monthly'], item['remaining'],
+                )
+            lines[f'med:{large_cat}/{med_cat}'] = _line_values(
+                med_data['subtotal_budget'], med_data['subtotal_executed'], med_data['subtotal_rate'],
+                med_data['subtotal_month'], med_data['subtotal_remaining'],
+            )
+        lines[f'large:{large_cat}'] = _line_values(
+            large_data['total_budget'], large_data['total_executed'], large_data['total_rate'],
+            large_data['total_month'], large_data['total_remaining'],
+        )
+    lines['grand'] = _line_values(
+        data['grand_total_budget'], data['grand_total_executed'], data['grand_total_rate'],
+        data['grand_total_month'], data['grand_total_remaining'],
+    )
+    return lines
+
+
+def diff_execution_lines(old_lines, new_lines):
+    """두 버전의 행 값 비교
+
+    Returns:
+        (changed, structure_changed) - 값이 바뀐 행 dict, 행 구성(추가/삭제) 변경 여부
+    """
+    if old_lines.keys() != new_lines.keys():
+        return new_lines, True
+    changed = {key: values for key, values in new_lines.items() if old_lines[key] != values}
+    return changed, False
@@ -0,0 +1,184 @@
+# 모델 변경 시 집계 테이블 및 조회 캐시 동기화
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Account, Budget, Transaction, DepositLedger, CashBook, CashBookCategory, MonthlySnapshot
+from .services import (
+    is_counted_expense, apply_monthly_total, apply_cashbook_balance, mark_cashbook_snapshots_stale,
+    mark_deposit_snapshot_stale, mark_annual_snapshot_stale, mark_budget_snapshots_stale, deposit_affects_budget,
+    sync_snapshot_index, record_snapshot_version,
+)
+from .cache import bump_data_version, bump_structure_version
+from .snapshots import snapshot_checksum
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_transaction_state(sender, instance, **kwargs):
+    """수정 전 거래 상태 보관 (집계 차감용)"""
+    instance._totals_previous = None
+    if instance.pk:
+        instance._totals_previous = Transaction.objects.filter(pk=instance.pk).values(
+            'account_id', 'date', 'payment_method', 'amount', 'transaction_type', 'status'
+        ).first()
+
+
+@receiver(post_save, sender=Transaction)
+def update_totals_on_save(sender, instance, raw=False, **kwargs):
+    """거래 저장 시 월별계정집계 갱신"""
+    if raw:
+        return
+
+    previous = getattr(instance, '_totals_previous', None)
+    if previous and is_counted_expense(previous['transaction_type'], previous['status']):
+        apply_monthly_total(
+            previous['account_id'], previous['date'], previous['payment_method'], previous['amount'], -1
+        )
+        mark_budget_snapshots_stale(previous['date'].year, previous['date'].month)
+
+    if is_counted_expense(instance.transaction_type, instance.status):
+        apply_monthly_total(
+            instance.account_id, instance.date, instance.payment_method, instance.amount, 1
+        )
+        mark_budget_snapshots_stale(instance.date.year, instance.date.month)
+
+    instance._totals_previous = None
+
+
+@receiver(post_delete, sender=Transaction)
+def update_totals_on_delete(sender, instance, **kwargs):
+    """거래 삭제 시 월별계정집계 차감 (QuerySet 일괄 삭제 포함)"""
+    if is_counted_expense(instance.transaction_type, instance.status):
+        apply_monthly_total(
+            instance.account_id, instance.date, instance.payment_method, instance.amount, -1
+        )
+        mark_budget_snapshots_stale(instance.date.year, instance.date.month)
+
+
+@receiver(pre_save, sender=CashBook)
+def remember_cashbook_state(sender, instance, **kwargs):
+    """수정 전 출납장 상태 보관 (잔액 차감용)"""
+    instance._balance_previous = None
+    if instance.pk:
+        instance._balance_previous = CashBook.objects.filter(pk=instance.pk).values(
+            'book_type', 'year', 'month', 'entry_type', 'amount'
+        ).first()
+
+
+@receiver(post_save, sender=CashBook)
+def update_balance_on_save(sender, instance, raw=False, **kwargs):
+    """출납장 저장 시 출납장월별잔액 갱신"""
+    if raw:
+        return
+
+    previous = getattr(instance, '_balance_previous', None)
+    if previous:
+        apply_cashbook_balance(
+            previous['book_type'], previous['year'], previous['month'],
+            previous['entry_type'], previous['amount'], -1,
+        )
+        mark_cashbook_snapshots_stale(previous['book_type'], previous['year'], previous['month'])
+
+    apply_cashbook_balance(
+        instance.book_type, instance.year, instance.month, instance.entry_type, instance.amount, 1
+    )
+    mark_cashbook_snapshots_stale(instance.book_type, instance.year, instance.month)
+    instance._balance_previous = None
+
+
+@receiver(post_delete, sender=CashBook)
+def update_balance_on_delete(sender, instance, **kwargs):
+    """출납장 삭제 시 출납장월별잔액 차감 (QuerySet 일괄 삭제 포함)"""
+    apply_cashbook_balance(
+        instance.book_type, instance.year, instance.month, instance.entry_type, instance.amount, -1
+    )
+    mark_cashbook_snapshots_stale(instance.book_type, instance.year, instance.month)
+
+
+@receiver(post_save, sender=DepositLedger)
+@receiver(post_delete, sender=DepositLedger)
+def mark_deposit_snapshot_on_change(sender, instance, **kwargs):
+    """예수금출납장 변경 시 해당 월 확정 스냅샷 재확정필요 표시 (합산계정 과목이면 예산집행내역 포함)"""
+    if kwargs.get('raw'):
+        return
+    mark_deposit_snapshot_stale(instance.year, instance.month)
+    if deposit_affects_budget([instance.category_id]):
+        mark_budget_snapshots_stale(instance.year, instance.month)
+
+
+@receiver(pre_save, sender=MonthlySnapshot)
+def compute_snapshot_hash(sender, instance, raw=False, **kwargs):
+    """스냅샷 저장(확정) 시 내용해시 계산 및 이력에 새 버전을 남길지 판단
+
+    내용해시가 바뀌었거나 새로 확정/재확정(확정일시 변경)한 경우에만 이력을 추가하고,
+    재확정필요 표시 등 부가 정보만 바뀐 저장은 이력에 남기지 않는다.
+    """
+    if raw:
+        return
+    instance.content_hash = snapshot_checksum(
+        instance.snapshot_type, instance.fiscal_year, instance.month, instance.snapshot_data
+    )
+    previous = None
+    if instance.pk:
+        previous = MonthlySnapshot.objects.filter(pk=instance.pk).values(
+            'content_hash', 'is_confirmed', 'confirmed_at'
+        ).first()
+    instance._record_version = instance.is_confirmed and (
+        previous is None
+        or not previous['is_confirmed']
+        or previous['content_hash'] != instance.content_hash
+        or previous['confirmed_at'] != instance.confirmed_at
+    )
+
+
+@receiver(post_save, sender=MonthlySnapshot)
+def update_snapshot_index(sender, instance, raw=False, **kwargs):
+    """스냅샷 저장 시 색인 갱신, (재)확정이면 이력 추가 및 연간결산 재확정필요 표시 (확정해제는 CASCADE로 색인 삭제)"""
+    if raw:
+        return
+    sync_snapshot_index(instance)
+    if instance.snapshot_type != 'ANNUAL':
+        mark_annual_snapshot_stale(instance.fiscal_year)
+    if getattr(instance, '_record_version', False):
+        record_snapshot_version(
+            instance.snapshot_type, instance.fiscal_year, instance.month, 'CONFIRM',
+            instance.confirmed_at or timezone.now(), instance.confirmed_by, instance.snapshot_data,
+        )
+
+
+@receiver(post_delete, sender=MonthlySnapshot)
+def record_snapshot_cancel(sender, instance, **kwargs):
+    """확정해제 시 이력에 해제 버전 추가 (이전 확정 버전은 그대로 보관) 및 연간결산 재확정필요 표시"""
+    if instance.snapshot_type != 'ANNUAL':
+        mark_annual_snapshot_stale(instance.fiscal_year)
+    if instance.is_confirmed:
+        record_snapshot_version(
+            instance.snapshot_type, instance.fiscal_year, instance.month, 'CANCEL',
+            timezone.now(), getattr(instance, '_cancelled_by', ''),
+        )
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+@receiver(post_save, sender=DepositLedger)
+@receiver(post_delete, sender=DepositLedger)
+@receiver(post_save, sender=CashBookCategory)
+@receiver(post_delete, sender=CashBookCategory)
+def invalidate_report_cache(sender, **kwargs):
+    """보고서 원천 데이터 변경 시 캐시 데이터 버전 증가"""
+    bump_data_version()
+
+
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+@receiver(post_save, sender=CashBookCategory)
+@receiver(post_delete, sender=CashBookCategory)
+def invalidate_budget_structure(sender, **kwargs):
+    """계정/예산/출납장 과목 변경 시 편성 구조 캐시 버전 증가"""
+    bump_structure_version()
@@ -0,0 +1,316 @@
+# 월별스냅샷(MonthlySnapshot.snapshot_data) 직렬화 공통 로직
+#
+# 저장 형식 (format 2)
+# - 금액(Decimal)은 원 단위 정수로 저장 (float 변환 없이 정확한 값 유지)
+# - 날짜는 ISO 문자열
+# - 같은 키를 가진 dict 목록은 열 단위로 저장: {'_columns': [필드...], '_rows': [[값...], ...]}
+# 조회 시에는 decode_snapshot()이 접근하는 부분만 그때그때 복원한다.
+import hashlib
+import json
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from difflib import SequenceMatcher
+
+SNAPSHOT_FORMAT = 2
+FORMAT_KEY = '_format'
+COLUMNS_KEY = '_columns'
+ROWS_KEY = '_rows'
+
+
+def _encode_value(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Mapping):
+        return {str(key): _encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return _encode_list(value)
+    return value
+
+
+def _encode_list(values):
+    """같은 키 구성의 dict 목록(2건 이상)은 열 단위로, 그 외는 항목별로 변환"""
+    if len(values) > 1 and all(isinstance(v, Mapping) for v in values):
+        columns = list(values[0].keys())
+        if all(list(v.keys()) == columns for v in values):
+            return {
+                COLUMNS_KEY: [str(c) for c in columns],
+                ROWS_KEY: [[_encode_value(v[c]) for c in columns] for v in values],
+            }
+    return [_encode_value(v) for v in values]
+
+
+def encode_snapshot(data):
+    """스냅샷 데이터를 저장용 JSON 구조로 변환"""
+    encoded = _encode_value(data)
+    encoded[FORMAT_KEY] = SNAPSHOT_FORMAT
+    return encoded
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if COLUMNS_KEY in value and ROWS_KEY in value:
+            return ColumnarRows(value[COLUMNS_KEY], value[ROWS_KEY])
+        return SnapshotData(value)
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    return value
+
+
+class ColumnarRows(Sequence):
+    """열 단위로 저장된 목록 - 행에 접근할 때 dict로 복원"""
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._make_row(row) for row in self.rows[index]]
+        return self._make_row(self.rows[index])
+
+    def _make_row(self, row):
+        return {column: _decode_value(value) for column, value in zip(self.columns, row)}
+
+
+class SnapshotData(Mapping):
+    """저장된 스냅샷 dict - 값에 접근할 때 하위 구조를 복원 (이전 형식 데이터도 그대로 조회 가능)"""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self._decoded = {}
+
+    def __getitem__(self, key):
+        if key == FORMAT_KEY:
+            raise KeyError(key)
+        if key not in self._decoded:
+            self._decoded[key] = _decode_value(self._raw[key])
+        return self._decoded[key]
+
+    def __iter__(self):
+        return (key for key in self._raw if key != FORMAT_KEY)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def decode_snapshot(raw):
+    """저장된 snapshot_data를 지연 복원 dict로 감싸서 반환"""
+    return SnapshotData(raw or {})
+
+
+def _is_columnar(value):
+    return isinstance(value, dict) and COLUMNS_KEY in value and ROWS_KEY in value
+
+
+def _can_patch(old, new):
+    """하위 변경분으로 표현 가능한지 (같은 열 구성의 행 목록 또는 일반 dict끼리)"""
+    if _is_columnar(old) or _is_columnar(new):
+        return _is_columnar(old) and _is_columnar(new) and old[COLUMNS_KEY] == new[COLUMNS_KEY]
+    return isinstance(old, dict) and isinstance(new, dict)
+
+
+def make_snapshot_delta(old, new):
+    """저장 형식 스냅샷 두 개의 변경분 (이력 저장용, 변경이 없으면 빈 dict)
+
+    - dict: {'set': {키: 새 값}, 'patch': {키: 하위 변경분}, 'del': [삭제된 키]}
+    - 열 단위 행 목록: {'rows': [['=', 시작, 끝] (이전 행 구간 재사용) | ['+', [새 행...]]]}
+    """
+    if _is_columnar(old):
+        matcher = SequenceMatcher(
+            None,
+            [json.dumps(row, sort_keys=True) for row in old[ROWS_KEY]],
+            [json.dumps(row, sort_keys=True) for row in new[ROWS_KEY]],
+            autojunk=False,
+        )
+        ops = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                ops.append(['=', i1, i2])
+            elif j2 > j1:
+                ops.append(['+', new[ROWS_KEY][j1:j2]])
+        return {'rows': ops}
+
+    delta = {}
+    removed = [key for key in old if key not in new]
+    if removed:
+        delta['del'] = removed
+    for key, value in new.items():
+        if key not in old:
+            delta.setdefault('set', {})[key] = value
+        elif old[key] != value:
+            if _can_patch(old[key], value):
+                delta.setdefault('patch', {})[key] = make_snapshot_delta(old[key], value)
+            else:
+                delta.setdefault('set', {})[key] = value
+    return delta
+
+
+def apply_snapshot_delta(base, delta):
+    """make_snapshot_delta() 변경분을 이전 스냅샷에 적용해 다음 스냅샷 복원"""
+    if _is_columnar(base):
+        rows = []
+        for op in delta['rows']:
+            if op[0] == '=':
+                rows.extend(base[ROWS_KEY][op[1]:op[2]])
+            else:
+                rows.extend(op[1])
+        return {COLUMNS_KEY: base[COLUMNS_KEY], ROWS_KEY: rows}
+
+    removed = set(delta.get('del', ()))
+    result = {key: value for key, value in base.items() if key not in removed}
+    for key, sub_delta in delta.get('patch', {}).items():
+        result[key] = apply_snapshot_delta(base[key], sub_delta)
+    result.update(delta.get('set', {}))
+    return result
+
+
+def _serialize_tree(data, item_keys, medium_keys, large_keys, grand_keys):
+    """예산 트리(_fill_tree 결과)를 스냅샷 저장 구조로 변환 - 계정 객체는 ID/코드로 저장"""
+    execution_data = {}
+    for large_cat, large_data in data['execution_data'].items():
+        medium_categories = {}
+        for med_cat, med_data in large_data['medium_categories'].items():
+            medium_categories[med_cat] = {
+                'items': [{
+                    'account_id': item['account'].id,
+                    'account_code': item['account'].code,
+                    **{key: item[key] for key in item_keys},
+                } for item in med_data['items']],
+                **{key: med_data[key] for key in medium_keys},
+            }
+        execution_data[large_cat] = {
+            'medium_categories': medium_categories,
+            **{key: large_data[key] for key in large_keys},
+        }
+
+    return {
+        'execution_data': execution_data,
+        **{key: data[key] for key in grand_keys},
+    }
+
+
+def serialize_execution_tree(data):
+    """예산집행내역 트리(build_execution_tree 결과)를 스냅샷 저장 구조로 변환"""
+    return _serialize_tree(
+        data,
+        ('display_name', 'annual_budget', 'cumulative', 'exec_rate', 'monthly', 'remaining', 'note'),
+        ('subtotal_budget', 'subtotal_executed', 'subtotal_month',
+         'subtotal_remaining', 'subtotal_rate', 'row_count', 'show_subtotal'),
+        ('total_budget', 'total_executed', 'total_month', 'total_remaining', 'total_rate', 'row_count'),
+        ('grand_total_budget', 'grand_total_executed', 'grand_total_month',
+         'grand_total_remaining', 'grand_total_rate'),
+    )
+
+
+def serialize_matrix_tree(data):
+    """연간 월별 예산집행 트리(build_matrix_tree 결과)를 스냅샷 저장 구조로 변환"""
+    return _serialize_tree(
+        data,
+        ('display_name', 'annual_budget', 'cumulative', 'exec_rate', 'months', 'remaining'),
+        ('subtotal_budget', 'subtotal_executed', 'subtotal_months',
+         'subtotal_remaining', 'subtotal_rate', 'row_count', 'show_subtotal'),
+        ('total_budget', 'total_executed', 'total_months', 'total_remaining', 'total_rate', 'row_count'),
+        ('grand_total_budget', 'grand_total_executed', 'grand_total_months',
+         'grand_total_remaining', 'grand_total_rate'),
+    )
+
+
+def snapshot_checksum(snapshot_type, fiscal_year, month, raw):
+    """스냅샷 내용해시 (SHA-256) - 유형/연월과 저장 데이터를 키 정렬한 JSON으로 직렬화해 계산
+
+    데이터를 다른 연월/유형 행으로 옮겨도 검출되도록 식별 정보를 함께 해시한다.
+    """
+    canonical = json.dumps(
+        [snapshot_type, fiscal_year, month, raw],
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def normalize_snapshot(data):
+    """현재 데이터를 저장 형식과 같은 값 표현(정수 금액, ISO 날짜)으로 변환 - 확정본과 비교용"""
+    return decode_snapshot(encode_snapshot(data))
+
+
+def iter_execution_items(data):
+    """예산집행내역 스냅샷의 항목 행을 순서대로 반환"""
+    for large_data in data.get('execution_data', {}).values():
+        for med_data in large_data['medium_categories'].values():
+            yield from med_data['items']
+
+
+def diff_snapshot_rows(old_rows, new_rows, key, fields):
+    """ID로 색인한 두 행 목록 비교 (집합 연산으로 추가/삭제/공통 키 산출)
+
+    Returns:
+        {'added': [new_row...], 'removed': [old_row...],
+         'changed': [{'old': row, 'new': row, 'fields': {field: (old, new)}}...]}
+        추가/변경은 현재 데이터 순서, 삭제는 확정본 순서를 따른다.
+    """
+    old_index = {row[key]: row for row in old_rows}
+    new_index = {row[key]: row for row in new_rows}
+
+    added_keys = new_index.keys() - old_index.keys()
+    removed_keys = old_index.keys() - new_index.keys()
+    common_keys = new_index.keys() & old_index.keys()
+
+    changed = []
+    for row_key in (k for k in new_index if k in common_keys):
+        old_row, new_row = old_index[row_key], new_index[row_key]
+        changed_fields = {
+            field: (old_row.get(field), new_row.get(field))
+            for field in fields if old_row.get(field) != new_row.get(field)
+        }
+        if changed_fields:
+            changed.append({'old': old_row, 'new': new_row, 'fields': changed_fields})
+
+    return {
+        'added': [new_index[k] for k in new_index if k in added_keys],
+        'removed': [old_index[k] for k in old_index if k in removed_keys],
+        'changed': changed,
+    }
+
+
+def diff_snapshot_totals(old, new, keys):
+    """합계 항목별 확정값/현재값/차이 목록"""
+    result = []
+    for key in keys:
+        old_value = old.get(key) or 0
+        new_value = new.get(key) or 0
+        result.append({'key': key, 'old': old_value, 'new': new_value, 'delta': new_value - old_value})
+    return result
+
+
+# 색인(SnapshotIndex)에 보관할 유형별 행 목록/합계 키
+SNAPSHOT_SUMMARY_KEYS = {
+    'CASHBOOK_BANK': (('income_entries', 'expense_entries'), ('prev_balance', 'income_total', 'expense_total', 'next_balance')),
+    'CASHBOOK_CASH': (('income_entries', 'expense_entries'), ('prev_balance', 'income_total', 'expense_total', 'next_balance')),
+    'CASHBOOK_DEPOSIT': (('expense_entries',), ('expense_total',)),
+    'CARD_EXPENSE': (('card_items',), ('total_amount',)),
+    'BUDGET': ((), ('grand_total_budget', 'grand_total_executed', 'grand_total_month', 'grand_total_remaining')),
+    'ANNUAL': ((), ('grand_total_budget', 'grand_total_executed', 'grand_total_remaining')),
+}
+
+
+def summarize_snapshot(snapshot_type, raw):
+    """스냅샷 행 수와 주요 합계 산출 (색인 갱신용)
+
+    Returns:
+        (row_count, totals) - totals는 {키: 원 단위 정수}
+    """
+    data = decode_snapshot(raw)
+    row_keys, total_keys = SNAPSHOT_SUMMARY_KEYS.get(snapshot_type, ((), ()))
+
+    if snapshot_type in ('BUDGET', 'ANNUAL'):
+        row_count = sum(1 for _ in iter_execution_items(data))
+    else:
+        row_count = sum(len(data.get(key) or []) for key in row_keys)
+
+    totals = {key: int(Decimal(str(data.get(key) or 0))) for key in total_keys}
+    return row_count, totals
@@ -1,3 +1,1081 @@
-from django.test import TestCase
+import json
+from datetime import date
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .admin.cashbook import get_cashbook_totals
+from .cache import bump_data_version, get_data_version, get_or_build, get_structure_version
+from .models import (
+    Account, Budget, CashBook, CashBookBalance, CashBookCategory, DepositLedger, MonthlyAccountTotal, MonthlySnapshot,
+    SnapshotVersion, Transaction,
+)
+from .selectors import (
+    get_budget_skeleton, get_cashbook_balance, get_expense_totals_by_account, get_expense_totals_by_window,
+    get_remaining_budget, get_snapshot_index,
+)
+from .services import load_snapshot_version_data
+from .snapshots import (
+    ColumnarRows, SnapshotData, apply_snapshot_delta, decode_snapshot, encode_snapshot, make_snapshot_delta,
+)
+
+
+def plain(value):
+    """지연 복원 스냅샷(SnapshotData/ColumnarRows)을 일반 dict/list로 변환"""
+    if isinstance(value, (dict, SnapshotData)):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, (list, ColumnarRows)):
+        return [plain(item) for item in value]
+    return value
+
+
+class FinanceTestCase(TestCase):
+    """계정 2개(예산 포함)와 예금출납장 수입과목 1개를 갖춘 기본 데이터"""
+    year = 2025
+
+    def setUp(self):
+        # 캐시 버전은 테스트마다 DB와 함께 초기화되므로 이전 테스트의 캐시 항목을 비움
+        cache.clear()
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.user)
+        self.salary = self.make_account('1001', '인건비', '급여', '급여')
+        self.supplies = self.make_account('2001', '사업비', '운영비', '소모품비')
+        Budget.objects.create(fiscal_year=self.year, account=self.salary, annual_amount=Decimal('12000000'))
+        Budget.objects.create(fiscal_year=self.year, account=self.supplies, annual_amount=Decimal('3000000'))
+        self.income_category = CashBookCategory.objects.create(
+            fiscal_year=self.year, book_type='BANK', entry_type='INCOME', name='회비'
+        )
+
+    def make_account(self, code, large, medium, name, fiscal_year=None):
+        return Account.objects.create(
+            fiscal_year=fiscal_year or self.year, code=code, category_large=large,
+            category_medium=medium, category_small=name, account_name=name,
+        )
+
+    def add_expense(self, txn_date, account, amount, **fields):
+        """승인된 지출 거래 1건 추가 (신호로 월별계정집계 갱신)"""
+        fields = {'payment_method': 'BANK', 'status': 'APPROVED', 'transaction_type': 'EXPENSE', **fields}
+        return Transaction.objects.create(
+            date=txn_date, account=account, description='지출', amount=Decimal(amount), **fields
+        )
+
+    def cashbook_post_data(self, month, income=(), expense=(), book_type='BANK'):
+        """출납장 화면 제출값 - income: (행ID, 일, 금액), expense: (행ID, 일, 계정, 금액)"""
+        data = {'book_type': book_type, 'year': self.year, 'month': month}
+        for idx, (row_id, day, amount) in enumerate(income):
+            data.update({
+                f'income_id_{idx}': row_id or '', f'income_day_{idx}': day,
+                f'income_category_{idx}': self.income_category.pk, f'income_amount_{idx}': amount,
+                f'income_note_{idx}': '',
+            })
+        for idx, (row_id, day, account, amount) in enumerate(expense):
+            data.update({
+                f'expense_id_{idx}': row_id or '', f'expense_day_{idx}': day,
+                f'expense_item_{idx}': f'account:{account.pk}', f'expense_amount_{idx}': amount,
+                f'expense_note_{idx}': '',
+            })
+        return data
+
+    def save_cashbook(self, month, income=(), expense=(), book_type='BANK'):
+        response = self.client.post(
+            reverse('admin:cashbook_save'), self.cashbook_post_data(month, income, expense, book_type)
+        )
+        self.assertEqual(response.status_code, 302)
+        return response
+
+    def patch_cashbook(self, month, ops, book_type='BANK'):
+        return self.client.post(
+            reverse('admin:cashbook_patch'),
+            json.dumps({'book_type': book_type, 'year': self.year, 'month': month, 'ops': ops}),
+            content_type='application/json',
+        )
+
+    def confirm_cashbook(self, month, snapshot_type='CASHBOOK_BANK'):
+        self.client.post(reverse('admin:snapshot_confirm_cashbook'), {
+            'year': self.year, 'month': month, 'snapshot_type': snapshot_type,
+        })
+        return MonthlySnapshot.objects.get(snapshot_type=snapshot_type, fiscal_year=self.year, month=month)
+
+    def assertDerivedTablesConsistent(self):
+        """출납장월별잔액/월별계정집계가 원장 재계산(rebuild_* --check) 결과와 같은지 확인"""
+        for command in ('rebuild_cashbook_balances', 'rebuild_monthly_totals'):
+            out = StringIO()
+            call_command(command, '--check', stdout=out)
+            self.assertIn('정상', out.getvalue(), f'{command}: {out.getvalue()}')
+
+
+class CashBookSaveTests(FinanceTestCase):
+    """출납장 저장 - 변경분 반영과 집계 테이블 유지"""
+
+    def test_save_keeps_derived_tables_consistent(self):
+        self.save_cashbook(3, income=[(None, 2, '5,000,000')], expense=[
+            (None, 5, self.salary, '1,200,000'), (None, 9, self.supplies, '80000'),
+        ])
+        self.save_cashbook(4, income=[(None, 1, '1000000')], expense=[(None, 3, self.supplies, '-5000')])
+
+        self.assertEqual(CashBook.objects.count(), 5)
+        self.assertEqual(Transaction.objects.count(), 3)
+        self.assertEqual(get_cashbook_balance('BANK', self.year, 4), {
+            'prev_balance': 3720000, 'income_total': 1000000, 'expense_total': -5000, 'next_balance': 4725000,
+        })
+        self.assertDerivedTablesConsistent()
+
+    def test_edit_keeps_rows_and_touches_only_changed_transaction(self):
+        self.save_cashbook(3, income=[(None, 2, '5000000')], expense=[
+            (None, 5, self.salary, '1200000'), (None, 9, self.supplies, '80000'),
+        ])
+        income = CashBook.objects.get(entry_type='INCOME')
+        salary_row = CashBook.objects.get(account=self.salary)
+        supplies_row = CashBook.objects.get(account=self.supplies)
+        before = {row.pk: (row.created_at, row.updated_at) for row in CashBook.objects.all()}
+        txn_before = {txn.pk: (txn.amount, txn.updated_at) for txn in Transaction.objects.all()}
+
+        self.save_cashbook(3, income=[(income.pk, 2, '5000000')], expense=[
+            (salary_row.pk, 5, self.salary, '1200000'), (supplies_row.pk, 9, self.supplies, '90000'),
+        ])
+
+        after = {row.pk: (row.created_at, row.updated_at) for row in CashBook.objects.all()}
+        self.assertEqual(after.keys(), before.keys())
+        for pk, (created_at, updated_at) in after.items():
+            self.assertEqual(created_at, before[pk][0])
+            if pk != supplies_row.pk:
+                self.assertEqual(updated_at, before[pk][1])
+
+        txn_after = {txn.pk: (txn.amount, txn.updated_at) for txn in Transaction.objects.all()}
+        self.assertEqual(txn_after.keys(), txn_before.keys())
+        self.assertEqual(txn_after[salary_row.linked_transaction_id], txn_before[salary_row.linked_transaction_id])
+        self.assertEqual(txn_after[supplies_row.linked_transaction_id][0], Decimal('90000'))
+        self.assertDerivedTablesConsistent()
+
+    def test_clearing_month_removes_linked_transactions(self):
+        self.save_cashbook(3, income=[(None, 2, '5000000')], expense=[
+            (None, 5, self.salary, '1200000'), (None, 9, self.supplies, '80000'),
+        ])
+        self.save_cashbook(3)
+
+        self.assertFalse(CashBook.objects.exists())
+        self.assertFalse(Transaction.objects.exists())
+        self.assertEqual(get_cashbook_balance('BANK', self.year, 3)['next_balance'], 0)
+        self.assertDerivedTablesConsistent()
+
+
+class BudgetExecutionTests(FinanceTestCase):
+    """월간예산집행내역 - 계정별 누계/당월 집행액 일괄 집계"""
+
+    def test_totals_by_account(self):
+        self.add_expense(date(self.year, 1, 10), self.supplies, 1000)
+        self.add_expense(date(self.year, 3, 5), self.supplies, 2000)
+        self.add_expense(date(self.year, 4, 1), self.supplies, 4000)
+        self.add_expense(date(self.year, 3, 20), self.salary, 500, payment_method='CARD')
+        # 대기 상태/수입 거래와 전년도 거래는 집계하지 않음
+        self.add_expense(date(self.year, 3, 6), self.supplies, 9000, status='PENDING')
+        self.add_expense(date(self.year, 3, 7), self.supplies, 8000, transaction_type='INCOME')
+        self.add_expense(date(self.year - 1, 12, 31), self.supplies, 7000)
+
+        totals = get_expense_totals_by_account(self.year, 3, [self.salary, self.supplies])
+        self.assertEqual(totals, {
+            self.supplies.pk: {'cumulative': 3000, 'monthly': 2000},
+            self.salary.pk: {'cumulative': 500, 'monthly': 500},
+        })
+
+        response = self.client.get(reverse('admin:budget_execution', args=[self.year, 3]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['grand_total_executed'], 3500)
+        self.assertEqual(response.context['grand_total_month'], 2500)
+        self.assertEqual(response.context['grand_total_remaining'], 15000000 - 3500)
+
+    def test_query_count_does_not_grow_with_budget_lines(self):
+        url = reverse('admin:budget_execution', args=[self.year, 3])
+
+        def count_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            return len(queries)
+
+        count_queries()  # 캐시 버전 행 생성
+        baseline = count_queries()
+        for index in range(10):
+            account = self.make_account(f'3{index:03d}', '사업비', f'사업{index % 3}', f'사업비{index}')
+            Budget.objects.create(fiscal_year=self.year, account=account, annual_amount=Decimal('1000000'))
+            self.add_expense(date(self.year, 3, 1), account, 100 + index)
+        self.assertEqual(count_queries(), baseline)
+
+
+class MonthlyAccountTotalTests(FinanceTestCase):
+    """월별계정집계 - 거래 저장/수정/삭제 시 증분 갱신"""
+
+    def totals(self):
+        return {
+            (row.account_id, row.month, row.payment_method): (int(row.amount), row.item_count)
+            for row in MonthlyAccountTotal.objects.all()
+        }
+
+    def test_incremental_updates_follow_ledger(self):
+        first = self.add_expense(date(self.year, 3, 5), self.supplies, 1000)
+        second = self.add_expense(date(self.year, 3, 9), self.supplies, 2000)
+        self.assertEqual(self.totals(), {(self.supplies.pk, 3, 'BANK'): (3000, 2)})
+
+        # 계정/월/결제수단/상태 변경은 이전 집계에서 빼고 새 집계에 더함
+        second.account, second.date, second.payment_method = self.salary, date(self.year, 4, 1), 'CARD'
+        second.save()
+        first.status = 'PENDING'
+        first.save()
+        self.assertEqual(self.totals(), {(self.salary.pk, 4, 'CARD'): (2000, 1)})
+        self.assertDerivedTablesConsistent()
+
+        first.status = 'APPROVED'
+        first.save()
+        Transaction.objects.filter(pk=second.pk).delete()
+        self.assertEqual(self.totals(), {(self.supplies.pk, 3, 'BANK'): (1000, 1)})
+        self.assertDerivedTablesConsistent()
+
+    def test_rebuild_repairs_drift(self):
+        self.add_expense(date(self.year, 3, 5), self.supplies, 1000)
+        self.add_expense(date(self.year, 5, 5), self.salary, 500)
+        # 신호를 거치지 않은 변경으로 집계가 원장과 어긋난 상태
+        MonthlyAccountTotal.objects.filter(account=self.supplies).update(amount=1)
+        MonthlyAccountTotal.objects.filter(account=self.salary).delete()
+        MonthlyAccountTotal.objects.create(account=self.salary, year=self.year, month=6, payment_method='BANK',
+                                           amount=9, item_count=1)
+
+        out = StringIO()
+        call_command('rebuild_monthly_totals', '--check', stdout=out)
+        self.assertIn('불일치 3건 발견', out.getvalue())
+        self.assertEqual(MonthlyAccountTotal.objects.get(account=self.supplies).amount, 1)
+
+        call_command('rebuild_monthly_totals', stdout=StringIO())
+        self.assertEqual(self.totals(), {
+            (self.supplies.pk, 3, 'BANK'): (1000, 1),
+            (self.salary.pk, 5, 'BANK'): (500, 1),
+        })
+        self.assertDerivedTablesConsistent()
+
+
+class ResultCacheTests(FinanceTestCase):
+    """조회 결과 캐시 - 데이터 버전별 키와 커밋 후 버전 증가"""
+
+    def test_get_or_build_is_keyed_by_data_version(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return len(calls)
+
+        version = get_data_version()
+        self.assertEqual(get_or_build('test', (self.year, 3), build), 1)
+        self.assertEqual(get_or_build('test', (self.year, 3), build), 1)
+        self.assertEqual(get_or_build('test', (self.year, 4), build), 2)
+
+        # 버전 증가는 커밋 이후에만 반영
+        bump_data_version()
+        self.assertEqual(get_data_version(), version)
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_data_version()
+        self.assertEqual(get_data_version(), version + 1)
+        self.assertEqual(get_or_build('test', (self.year, 3), build), 3)
+
+    def test_budget_execution_cache_invalidated_by_transaction(self):
+        url = reverse('admin:budget_execution', args=[self.year, 3])
+        self.assertEqual(self.client.get(url).context['grand_total_executed'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_expense(date(self.year, 3, 5), self.supplies, 1000)
+        self.assertEqual(self.client.get(url).context['grand_total_executed'], 1000)
+
+        # 신호를 거치지 않은 변경은 버전이 그대로이므로 캐시된 결과를 반환
+        Transaction.objects.update(amount=Decimal('5000'))
+        MonthlyAccountTotal.objects.update(amount=Decimal('5000'))
+        self.assertEqual(self.client.get(url).context['grand_total_executed'], 1000)
+
+
+class BudgetMatrixTests(FinanceTestCase):
+    """연간 월별 예산집행 현황 - 계정 × 월 행렬과 합계"""
+
+    def test_matrix_totals(self):
+        repair = self.make_account('2002', '사업비', '운영비', '수선비')
+        Budget.objects.create(fiscal_year=self.year, account=repair, annual_amount=Decimal('1000'))
+        self.add_expense(date(self.year, 1, 10), self.supplies, 1000)
+        self.add_expense(date(self.year, 1, 20), self.supplies, 500, payment_method='CARD')
+        self.add_expense(date(self.year, 12, 31), self.supplies, 2000)
+        self.add_expense(date(self.year, 6, 1), repair, 333)
+        self.add_expense(date(self.year, 2, 1), self.salary, 1000000)
+        self.add_expense(date(self.year + 1, 1, 1), self.salary, 7)
+
+        response = self.client.get(reverse('admin:budget_matrix', args=[self.year]))
+        self.assertEqual(response.status_code, 200)
+        data = response.context
+
+        months = [0] * 12
+        months[0], months[1], months[5], months[11] = 1500, 1000000, 333, 2000
+        self.assertEqual(data['grand_total_months'], months)
+        self.assertEqual(data['grand_total_executed'], sum(months))
+
+        medium = data['execution_data']['사업비']['medium_categories']['운영비']
+        items = {item['account'].pk: item for item in medium['items']}
+        self.assertEqual(items[self.supplies.pk]['months'][0], 1500)
+        self.assertEqual(items[self.supplies.pk]['cumulative'], 3500)
+        self.assertEqual(items[repair.pk]['exec_rate'], 33.3)
+        self.assertEqual(medium['subtotal_months'][5], 333)
+        self.assertEqual(medium['subtotal_executed'], 3833)
+        self.assertTrue(medium['show_subtotal'])
+
+        # 12월 누계는 월간예산집행내역의 누계와 같음
+        monthly = self.client.get(reverse('admin:budget_execution', args=[self.year, 12])).context
+        self.assertEqual(monthly['grand_total_executed'], data['grand_total_executed'])
+
+        self.assertEqual(self.client.get(reverse('admin:budget_matrix_print', args=[self.year])).status_code, 200)
+
+
+class DepositAddbackTests(FinanceTestCase):
+    """예수금출납장 과목별 합산계정"""
+
+    def add_deposit(self, year, month, category, amount):
+        return DepositLedger.objects.create(
+            year=year, month=month, date=date(year, month, 10), category=category,
+            description=category.name, amount=Decimal(amount),
+        )
+
+    def test_addback_account_feeds_budget_totals(self):
+        withholding = CashBookCategory.objects.create(
+            fiscal_year=self.year, book_type='DEPOSIT', entry_type='EXPENSE', name='예수금(원천세)',
+            addback_account=self.salary,
+        )
+        other = CashBookCategory.objects.create(
+            fiscal_year=self.year, book_type='DEPOSIT', entry_type='EXPENSE', name='기타예수금',
+        )
+        self.add_expense(date(self.year, 3, 25), self.salary, 1000000)
+        self.add_deposit(self.year, 3, withholding, 50000)
+        self.add_deposit(self.year, 2, withholding, 40000)
+        self.add_deposit(self.year, 3, other, 7000)
+
+        totals = get_expense_totals_by_account(self.year, 3, [self.salary, self.supplies])
+        self.assertEqual(totals, {self.salary.pk: {'cumulative': 1090000, 'monthly': 1050000}})
+
+    def test_migration_maps_legacy_categories(self):
+        prev_salary = self.make_account('1001', '인건비', '급여', '급여', fiscal_year=self.year - 1)
+        year_category = CashBookCategory.objects.create(
+            fiscal_year=self.year, book_type='DEPOSIT', entry_type='EXPENSE', name='예수금(4대보험)',
+        )
+        legacy = CashBookCategory.objects.create(book_type='DEPOSIT', entry_type='EXPENSE', name='예수금(원천세)')
+        unused = CashBookCategory.objects.create(book_type='DEPOSIT', entry_type='EXPENSE', name='예수금(4대보험)')
+        self.add_deposit(self.year, 3, year_category, 20000)
+        self.add_deposit(self.year, 3, legacy, 50000)
+        self.add_deposit(self.year - 1, 11, legacy, 30000)
+
+        migration = import_module('finance.migrations.0025_add_category_addback_account')
+        migration.populate_addback_account(apps, None)
+
+        year_category.refresh_from_db()
+        self.assertEqual(year_category.addback_account, self.salary)
+        # 회계연도 미지정 과목의 행은 연도별 과목으로 옮겨 해당 연도 급여 계정에 합산
+        migrated = {
+            row.year: row.category for row in DepositLedger.objects.filter(description='예수금(원천세)')
+        }
+        self.assertEqual(migrated[self.year].fiscal_year, self.year)
+        self.assertEqual(migrated[self.year].addback_account, self.salary)
+        self.assertEqual(migrated[self.year - 1].addback_account, prev_salary)
+        legacy.refresh_from_db()
+        unused.refresh_from_db()
+        self.assertFalse(legacy.is_active)
+        self.assertTrue(unused.is_active)
+        self.assertIsNone(unused.addback_account)
+
+        self.assertEqual(
+            get_expense_totals_by_account(self.year, 12, [self.salary])[self.salary.pk]['cumulative'], 70000
+        )
+        self.assertEqual(
+            get_expense_totals_by_account(self.year - 1, 12, [prev_salary])[prev_salary.pk]['cumulative'], 30000
+        )
+
+    def test_category_screen_lists_common_categories(self):
+        common = CashBookCategory.objects.create(book_type='DEPOSIT', entry_type='EXPENSE', name='예수금(원천세)')
+        CashBookCategory.objects.create(
+            fiscal_year=self.year - 1, book_type='DEPOSIT', entry_type='EXPENSE', name='전년도 과목',
+        )
+        response = self.client.get(
+            reverse('admin:cashbook_category_main'), {'fiscal_year': self.year, 'book_type': 'DEPOSIT'}
+        )
+        self.assertEqual(list(response.context['expense_categories']), [common])
+        self.assertContains(response, '공통')
+
+
+class IntegerWonTests(FinanceTestCase):
+    """보고서 금액은 정수 원 단위로 계산"""
+
+    def test_budget_execution_amounts_are_int(self):
+        self.add_expense(date(self.year, 3, 5), self.supplies, 1001)
+        self.add_expense(date(self.year, 3, 6), self.supplies, -1)
+
+        data = self.client.get(reverse('admin:budget_execution', args=[self.year, 3])).context
+        medium = data['execution_data']['사업비']['medium_categories']['운영비']
+        item = medium['items'][0]
+        for value in (
+            item['annual_budget'], item['cumulative'], item['monthly'], item['remaining'],
+            medium['subtotal_executed'], data['grand_total_budget'], data['grand_total_executed'],
+            data['grand_total_month'], data['grand_total_remaining'],
+        ):
+            self.assertIs(type(value), int)
+        self.assertEqual(item['cumulative'], 1000)
+        self.assertEqual(item['exec_rate'], 0.0)
+        self.assertEqual(data['grand_total_rate'], 0.0)
+
+
+class BudgetExecutionDeltaTests(FinanceTestCase):
+    """월간예산집행내역 변경분 조회"""
+
+    def test_returns_only_changed_lines(self):
+        url = reverse('admin:budget_execution_delta', args=[self.year, 3])
+        first = self.client.get(url).json()
+        self.assertTrue(first['full'])
+        self.assertIn(f'item:{self.supplies.pk}', first['lines'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_expense(date(self.year, 3, 10), self.supplies, 50000, payment_method='CARD')
+
+        delta = self.client.get(url, {'since': first['version']}).json()
+        self.assertGreater(delta['version'], first['version'])
+        self.assertFalse(delta['reload'])
+        self.assertEqual(set(delta['lines']), {f'item:{self.supplies.pk}', 'med:사업비/운영비', 'large:사업비', 'grand'})
+        self.assertEqual(delta['lines'][f'item:{self.supplies.pk}']['month'], 50000)
+
+        unchanged = self.client.get(url, {'since': delta['version']}).json()
+        self.assertEqual(unchanged['lines'], {})
+
+    def test_structure_change_requests_reload(self):
+        url = reverse('admin:budget_execution_delta', args=[self.year, 3])
+        first = self.client.get(url).json()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            account = self.make_account('2002', '사업비', '운영비', '수선비')
+            Budget.objects.create(fiscal_year=self.year, account=account, annual_amount=Decimal('1000'))
+
+        delta = self.client.get(url, {'since': first['version']}).json()
+        self.assertTrue(delta['reload'])
+        self.assertIn(f'item:{account.pk}', delta['lines'])
+
+        # 캐시에 없는 기준 버전이면 전체 행 반환
+        self.assertTrue(self.client.get(url, {'since': 999}).json()['full'])
+
+
+class RemainingBudgetTests(FinanceTestCase):
+    """지출 입력 시 계정/중분류 잔여예산 조회"""
+
+    def test_account_and_medium_remaining(self):
+        equipment = self.make_account('2002', '사업비', '운영비', '비품비')
+        Budget.objects.create(fiscal_year=self.year, account=equipment, annual_amount=Decimal('1000000'))
+        self.add_expense(date(self.year, 2, 1), self.supplies, 1000000)
+        self.add_expense(date(self.year, 11, 1), equipment, 250000)
+
+        status = get_remaining_budget(self.supplies.pk, self.year, amount=500000)
+        self.assertEqual(status['account'], {
+            'name': '소모품비', 'budget': 3000000, 'executed': 1000000, 'remaining': 2000000,
+            'rate': 33.3, 'remaining_after': 1500000,
+        })
+        self.assertEqual(status['medium']['name'], '운영비')
+        self.assertEqual(status['medium']['budget'], 4000000)
+        self.assertEqual(status['medium']['executed'], 1250000)
+        self.assertEqual(status['medium']['remaining_after'], 2250000)
+        self.assertIsNone(get_remaining_budget(self.make_account('9999', '기타', '기타', '미편성').pk, self.year))
+        # 캐시된 색인 조회는 데이터 버전 확인 1회뿐
+        with self.assertNumQueries(1):
+            get_remaining_budget(self.supplies.pk, self.year, amount=1)
+
+        # 새 거래가 커밋되면 다음 조회부터 반영
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_expense(date(self.year, 12, 31), self.supplies, 100000)
+        self.assertEqual(get_remaining_budget(self.supplies.pk, self.year)['account']['remaining'], 1900000)
+
+    def test_endpoint(self):
+        url = reverse('admin:remaining_budget')
+        response = self.client.get(url, {'account': self.salary.pk, 'year': self.year, 'amount': '1,000'})
+        self.assertEqual(response.json()['account']['remaining_after'], 12000000 - 1000)
+        self.assertFalse(self.client.get(url, {'account': 0, 'year': self.year}).json()['success'])
+        self.assertEqual(self.client.get(url, {'account': 'x'}).status_code, 400)
+
+
+class BudgetSkeletonCacheTests(FinanceTestCase):
+    """회계연도별 예산 편성 구조 캐시"""
+
+    def test_cached_until_budget_or_account_changes(self):
+        skeleton = get_budget_skeleton(self.year)
+        self.assertEqual(list(skeleton['execution_data']), ['인건비', '사업비'])
+        operating = skeleton['execution_data']['사업비']
+        self.assertEqual(operating['row_count'], 1)
+        self.assertFalse(operating['medium_categories']['운영비']['show_subtotal'])
+        self.assertEqual(skeleton['grand_total_budget'], 15000000)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_budget_skeleton(self.year), skeleton)
+
+        # 거래 입력은 편성 구조 버전을 바꾸지 않음
+        version = get_structure_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_expense(date(self.year, 3, 1), self.supplies, 1000)
+        self.assertEqual(get_structure_version(), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            repair = self.make_account('2002', '사업비', '운영비', '수선비')
+            Budget.objects.create(fiscal_year=self.year, account=repair, annual_amount=Decimal('500'))
+        rebuilt = get_budget_skeleton(self.year)
+        medium = rebuilt['execution_data']['사업비']['medium_categories']['운영비']
+        self.assertEqual([item['account'].pk for item in medium['items']], [self.supplies.pk, repair.pk])
+        self.assertTrue(medium['show_subtotal'])
+        # 중분류 행 수 = 항목 2 + 소계 1
+        self.assertEqual(medium['row_count'], 3)
+        self.assertEqual(rebuilt['execution_data']['사업비']['row_count'], 3)
+        self.assertEqual(rebuilt['grand_total_budget'], 15000500)
+
+
+class ExpenseWindowTests(FinanceTestCase):
+    """임의 기간/비교 기간 집행액 집계"""
+
+    def setUp(self):
+        super().setUp()
+        self.prev_supplies = self.make_account('2001', '사업비', '운영비', '소모품비', fiscal_year=self.year - 1)
+        self.prev_blank = self.make_account('', '사업비', '운영비', '기타', fiscal_year=self.year - 1)
+        for txn_date, account, amount in [
+            (date(self.year, 1, 15), self.supplies, 1000),
+            (date(self.year, 3, 31), self.supplies, 2000),
+            (date(self.year, 4, 1), self.supplies, 4000),
+            (date(self.year, 2, 1), self.salary, 8000),
+            (date(self.year - 1, 2, 10), self.prev_supplies, 300),
+            (date(self.year - 1, 2, 10), self.prev_blank, 50),
+            # 다른 연도 계정으로 올해 기록된 거래는 올해 계정에 합치지 않음
+            (date(self.year, 2, 10), self.prev_supplies, 70),
+        ]:
+            self.add_expense(txn_date, account, amount)
+
+    def test_month_aligned_and_arbitrary_windows_with_comparison(self):
+        accounts = [self.salary, self.supplies]
+        quarter = {
+            'current': (date(self.year, 1, 1), date(self.year, 3, 31)),
+            'compare': (date(self.year - 1, 1, 1), date(self.year - 1, 3, 31)),
+        }
+        totals = get_expense_totals_by_window(quarter, accounts)
+        self.assertEqual(totals, {
+            self.supplies.pk: {'current': 3000, 'compare': 300},
+            self.salary.pk: {'current': 8000, 'compare': 0},
+        })
+
+        # 월 단위가 아닌 기간은 거래내역 원장에서 같은 방식으로 집계
+        custom = {
+            'current': (date(self.year, 1, 15), date(self.year, 3, 31)),
+            'compare': (date(self.year - 1, 1, 15), date(self.year - 1, 3, 31)),
+        }
+        self.assertEqual(get_expense_totals_by_window(custom, accounts), totals)
+
+    def test_range_crossing_fiscal_years(self):
+        next_supplies = self.make_account('2001', '사업비', '운영비', '소모품비', fiscal_year=self.year + 1)
+        next_unbudgeted = self.make_account('9001', '사업비', '운영비', '잡비', fiscal_year=self.year + 1)
+        self.add_expense(date(self.year, 12, 10), self.supplies, 500)
+        self.add_expense(date(self.year + 1, 2, 10), next_supplies, 600)
+        self.add_expense(date(self.year + 1, 2, 11), next_unbudgeted, 900)
+
+        # 다음 연도 계정은 계정코드로 조회 시작 연도의 계정에 합산
+        windows = {'current': (date(self.year, 12, 1), date(self.year + 1, 3, 31))}
+        self.assertEqual(
+            get_expense_totals_by_window(windows, [self.salary, self.supplies]),
+            {self.supplies.pk: {'current': 1100}},
+        )
+
+        response = self.client.get(reverse('admin:budget_period'), {
+            'period': 'CUSTOM', 'start': f'{self.year}-12-01', 'end': f'{self.year + 1}-03-31', 'compare': 'NONE',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['grand_total_executed'], 1100)
+
+    def test_period_view(self):
+        response = self.client.get(reverse('admin:budget_period'), {'year': self.year, 'period': 'Q1', 'compare': 'PREV_YEAR'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['grand_total_executed'], 11000)
+        self.assertEqual(response.context['grand_total_compare'], 300)
+        self.assertEqual(response.context['grand_total_change'], 10700)
+
+
+class SnapshotCodecTests(SimpleTestCase):
+    """스냅샷 저장 형식 변환과 변경분 적용"""
+
+    data = {
+        'income_entries': [
+            {'id': 1, 'date': date(2025, 3, 2), 'amount': Decimal('5000000'), 'note': ''},
+            {'id': 2, 'date': date(2025, 3, 4), 'amount': Decimal('12.5'), 'note': '환급'},
+        ],
+        'expense_entries': [{'id': 3, 'date': date(2025, 3, 5), 'amount': Decimal('-1000'), 'note': ''}],
+        'income_total': 5000012,
+        'prev_balance': Decimal('0'),
+        'meta': {'tags': ['a', 'b'], 'nested': {'x': None}},
+    }
+
+    def test_encode_decode_round_trip(self):
+        encoded = encode_snapshot(self.data)
+
+        self.assertEqual(encoded['income_entries']['_columns'], ['id', 'date', 'amount', 'note'])
+        self.assertEqual(plain(decode_snapshot(encoded)), {
+            'income_entries': [
+                {'id': 1, 'date': '2025-03-02', 'amount': 5000000, 'note': ''},
+                {'id': 2, 'date': '2025-03-04', 'amount': '12.5', 'note': '환급'},
+            ],
+            'expense_entries': [{'id': 3, 'date': '2025-03-05', 'amount': -1000, 'note': ''}],
+            'income_total': 5000012,
+            'prev_balance': 0,
+            'meta': {'tags': ['a', 'b'], 'nested': {'x': None}},
+        })
+        # 저장 형식은 JSON 왕복 후에도 같아야 함
+        self.assertEqual(json.loads(json.dumps(encoded)), encoded)
+
+    def test_delta_round_trip(self):
+        old = encode_snapshot(self.data)
+        changed = dict(self.data)
+        changed['income_entries'] = [
+            {'id': 9, 'date': date(2025, 3, 1), 'amount': Decimal('7'), 'note': '추가'},
+            self.data['income_entries'][1],
+        ]
+        changed['expense_entries'] = [{'id': 3, 'date': date(2025, 3, 5), 'note': ''}]
+        changed['income_total'] = 19
+        del changed['meta']
+        changed['next_balance'] = 19
+        new = encode_snapshot(changed)
+
+        delta = make_snapshot_delta(old, new)
+        self.assertEqual(apply_snapshot_delta(old, json.loads(json.dumps(delta))), new)
+        self.assertEqual(make_snapshot_delta(new, new), {})
+        self.assertEqual(apply_snapshot_delta(new, {}), new)
+
+
+class CashBookBalanceTests(FinanceTestCase):
+    """출납장월별잔액 조회와 재계산 복구"""
+
+    def test_balance_carries_forward_to_months_without_entries(self):
+        self.save_cashbook(3, income=[(None, 2, 1000000)], expense=[(None, 5, self.supplies, 200000)])
+
+        self.assertEqual(get_cashbook_balance('BANK', self.year, 2), {
+            'prev_balance': 0, 'income_total': 0, 'expense_total': 0, 'next_balance': 0,
+        })
+        self.assertEqual(get_cashbook_balance('BANK', self.year, 3), {
+            'prev_balance': 0, 'income_total': 1000000, 'expense_total': 200000, 'next_balance': 800000,
+        })
+        self.assertEqual(get_cashbook_balance('BANK', self.year + 1, 1), {
+            'prev_balance': 800000, 'income_total': 0, 'expense_total': 0, 'next_balance': 800000,
+        })
+
+    def test_rebuild_marks_snapshots_stale_and_bumps_version(self):
+        self.save_cashbook(3, income=[(None, 2, 1000000)])
+        self.save_cashbook(4, income=[(None, 2, 500000)])
+        snapshot = self.confirm_cashbook(4)
+        self.assertFalse(snapshot.is_stale)
+        # 신호를 거치지 않은 변경으로 3월 잔액이 원장과 어긋난 상태
+        CashBookBalance.objects.filter(book_type='BANK', year=self.year, month=3).update(closing_balance=1)
+        version = get_data_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('rebuild_cashbook_balances', stdout=StringIO())
+
+        self.assertEqual(get_cashbook_balance('BANK', self.year, 4)['prev_balance'], 1000000)
+        snapshot.refresh_from_db()
+        self.assertTrue(snapshot.is_stale)
+        self.assertGreater(get_data_version(), version)
+        self.assertDerivedTablesConsistent()
+
+
+class StaleSnapshotTests(FinanceTestCase):
+    """이전 월 변경 시 이후 확정 스냅샷 재확정필요 표시와 일괄 재확정"""
+
+    def test_earlier_edit_marks_later_months_and_chain_reconfirms(self):
+        for month in (3, 4, 5):
+            self.save_cashbook(month, income=[(None, 1, '1000000')], expense=[(None, 2, self.supplies, '100000')])
+        self.confirm_cashbook(3)
+        self.confirm_cashbook(5)
+        self.confirm_cashbook(5, 'CASHBOOK_CASH')
+
+        income = CashBook.objects.get(year=self.year, month=4, entry_type='INCOME')
+        expense = CashBook.objects.get(year=self.year, month=4, entry_type='EXPENSE')
+        self.save_cashbook(4, income=[(income.pk, 1, '2000000')], expense=[(expense.pk, 2, self.supplies, '100000')])
+
+        # 4월 이후의 예금출납장만 재확정필요 (3월, 현금출납장은 그대로)
+        self.assertEqual(
+            set(MonthlySnapshot.objects.filter(is_stale=True).values_list('snapshot_type', 'month')),
+            {('CASHBOOK_BANK', 5)},
+        )
+
+        self.client.post(reverse('admin:snapshot_reconfirm_chain'), {'snapshot_type': 'CASHBOOK_BANK'})
+
+        snapshot = MonthlySnapshot.objects.get(snapshot_type='CASHBOOK_BANK', fiscal_year=self.year, month=5)
+        self.assertFalse(snapshot.is_stale)
+        data = decode_snapshot(snapshot.snapshot_data)
+        balance = get_cashbook_balance('BANK', self.year, 5)
+        self.assertEqual((data['prev_balance'], data['next_balance']), (balance['prev_balance'], balance['next_balance']))
+        self.assertEqual(data['prev_balance'], 2800000)
+        self.assertFalse(MonthlySnapshot.objects.filter(is_stale=True).exists())
+
+
+class SnapshotDiffTests(FinanceTestCase):
+    """확정본과 현재 데이터 비교 화면"""
+
+    def diff(self, month):
+        response = self.client.get(reverse('admin:snapshot_diff', args=['CASHBOOK_BANK', self.year, month]))
+        self.assertEqual(response.status_code, 200)
+        return response.context
+
+    def test_reports_added_removed_and_changed_rows(self):
+        self.save_cashbook(3, income=[(None, 2, '1000000')], expense=[
+            (None, 5, self.salary, '300000'), (None, 6, self.supplies, '20000'),
+        ])
+        self.confirm_cashbook(3)
+        self.assertFalse(self.diff(3)['has_changes'])
+
+        income = CashBook.objects.get(entry_type='INCOME')
+        salary = CashBook.objects.get(account=self.salary)
+        self.save_cashbook(3, income=[(income.pk, 2, '1200000')], expense=[
+            (salary.pk, 5, self.salary, '300000'), (None, 7, self.supplies, '50000'),
+        ])
+
+        context = self.diff(3)
+        self.assertTrue(context['has_changes'])
+        self.assertEqual(context['change_count'], 3)
+        income_section, expense_section = context['sections']
+        self.assertEqual([row['amount'] for row in income_section['changed']], [1200000])
+        self.assertEqual([row['amount'] for row in expense_section['added']], [50000])
+        self.assertEqual([row['amount'] for row in expense_section['removed']], [20000])
+        self.assertEqual(
+            {total['key']: total['delta'] for total in context['totals']},
+            {'prev_balance': 0, 'income_total': 200000, 'expense_total': 30000, 'next_balance': 170000},
+        )
+
+
+class MonthCloseTests(FinanceTestCase):
+    """월 마감 일괄 확정"""
+
+    def test_month_close_matches_individual_confirms(self):
+        withholding = CashBookCategory.objects.create(
+            fiscal_year=self.year, book_type='DEPOSIT', entry_type='EXPENSE', name='예수금(원천세)',
+            addback_account=self.salary,
+        )
+        self.save_cashbook(2, income=[(None, 2, '1000000')])
+        self.save_cashbook(3, income=[(None, 2, '500000')], expense=[(None, 5, self.salary, '300000')])
+        DepositLedger.objects.create(year=self.year, month=3, date=date(self.year, 3, 10), category=withholding,
+                                     description='원천세', amount=Decimal('30000'))
+        self.add_expense(date(self.year, 3, 12), self.supplies, 20000, payment_method='CARD')
+
+        self.client.post(reverse('admin:snapshot_confirm_month'), {'year': self.year, 'month': 3})
+        snapshots = MonthlySnapshot.objects.filter(fiscal_year=self.year, month=3)
+        month_close = {snapshot.snapshot_type: plain(decode_snapshot(snapshot.snapshot_data)) for snapshot in snapshots}
+        self.assertEqual(set(month_close), {
+            'CASHBOOK_BANK', 'CASHBOOK_CASH', 'CASHBOOK_DEPOSIT', 'CARD_EXPENSE', 'BUDGET',
+        })
+        self.assertEqual(month_close['CASHBOOK_BANK']['prev_balance'], 1000000)
+        self.assertEqual(month_close['BUDGET']['grand_total_month'], 350000)
+
+        # 유형별 개별 확정 결과와 같아야 함
+        for snapshot_type in ('CASHBOOK_BANK', 'CASHBOOK_CASH', 'CASHBOOK_DEPOSIT'):
+            self.confirm_cashbook(3, snapshot_type)
+        for name in ('snapshot_confirm_card', 'snapshot_confirm_budget'):
+            self.client.post(reverse(f'admin:{name}'), {'year': self.year, 'month': 3})
+        self.assertEqual(
+            {snapshot.snapshot_type: plain(decode_snapshot(snapshot.snapshot_data)) for snapshot in snapshots},
+            month_close,
+        )
+
+    def test_sources_are_loaded_once(self):
+        model_admin = admin.site._registry[CashBook]
+        self.save_cashbook(3, income=[(None, 2, '500000')])
+        # 예산집행내역은 데이터 버전별 캐시를 사용하므로 미리 채움
+        model_admin._get_budget_execution_data(self.year, 3)
+
+        # 출납장 내역, 두 유형의 잔액, 예수금출납장, 카드 지출 각 1회 + 캐시 데이터 버전 조회
+        with self.assertNumQueries(5):
+            model_admin._build_month_close_data(self.year, 3)
+
+
+class SnapshotIndexTests(FinanceTestCase):
+    """확정 스냅샷 색인 동기화"""
+
+    def test_index_follows_confirm_stale_and_cancel(self):
+        self.save_cashbook(3, income=[(None, 2, '1000000')], expense=[(None, 5, self.supplies, '200000')])
+        snapshot = self.confirm_cashbook(3)
+
+        index = get_snapshot_index('CASHBOOK_BANK', self.year, 3)
+        self.assertEqual((index.snapshot_id, index.row_count, index.is_stale), (snapshot.pk, 2, False))
+        self.assertEqual(index.totals, {
+            'prev_balance': 0, 'income_total': 1000000, 'expense_total': 200000, 'next_balance': 800000,
+        })
+
+        income = CashBook.objects.get(entry_type='INCOME')
+        self.save_cashbook(3, income=[(income.pk, 2, '1500000')])
+        self.assertTrue(get_snapshot_index('CASHBOOK_BANK', self.year, 3).is_stale)
+
+        self.confirm_cashbook(3)
+        index = get_snapshot_index('CASHBOOK_BANK', self.year, 3)
+        self.assertEqual((index.row_count, index.is_stale), (1, False))
+        self.assertEqual(index.totals['next_balance'], 1500000)
+
+        self.client.post(reverse('admin:snapshot_cancel', args=['CASHBOOK_BANK', self.year, 3]))
+        self.assertIsNone(get_snapshot_index('CASHBOOK_BANK', self.year, 3))
+
+
+class ConfirmedViewCacheTests(FinanceTestCase):
+    """확정본 화면 ETag 응답"""
+
+    def test_etag_and_not_modified(self):
+        self.save_cashbook(3, income=[(None, 2, '5000000')])
+        self.confirm_cashbook(3)
+        self.client.cookies['csrftoken'] = 'a' * 32
+        url = reverse('admin:confirmed_cashbook', args=['BANK', self.year, 3])
+
+        # 첫 조회는 확정 메시지가 있어 캐시 없이 렌더링
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], etag)
+
+        # 이후 조회는 캐시한 HTML을 그대로 반환 (CSRF 토큰까지 같음)
+        self.assertEqual(self.client.get(url).content, response.content)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # 재확정하면 ETag가 바뀌어 새로 렌더링
+        self.confirm_cashbook(3)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class SnapshotVersionTests(FinanceTestCase):
+    """스냅샷 확정 이력 (전체본 + 변경분)"""
+
+    def test_version_history_restores_each_confirm(self):
+        self.save_cashbook(3, income=[(None, 2, '1000')])
+        row = CashBook.objects.get()
+        for amount in range(1001, 1013):
+            self.save_cashbook(3, income=[(row.pk, 2, str(amount))])
+            snapshot = self.confirm_cashbook(3)
+            restored, _ = load_snapshot_version_data('CASHBOOK_BANK', self.year, 3)
+            self.assertEqual(restored, snapshot.snapshot_data)
+
+        versions = SnapshotVersion.objects.filter(snapshot_type='CASHBOOK_BANK', fiscal_year=self.year, month=3)
+        self.assertEqual(versions.count(), 12)
+        self.assertEqual(versions.filter(is_full=True).count(), 2)
+
+        # 재확정필요 표시 등 부가 정보만 바뀐 저장은 이력에 남기지 않음
+        snapshot.is_stale = True
+        snapshot.save()
+        self.assertEqual(versions.count(), 12)
+
+
+class BudgetSnapshotStaleTests(FinanceTestCase):
+    """지출 변경 시 예산집행내역 확정 스냅샷 재확정필요 표시"""
+
+    def confirm_budget(self, month):
+        self.client.post(reverse('admin:snapshot_confirm_budget'), {'year': self.year, 'month': month})
+
+    def stale_budget_months(self):
+        return set(MonthlySnapshot.objects.filter(snapshot_type='BUDGET', is_stale=True).values_list('month', flat=True))
+
+    def test_late_expense_marks_month_and_later_months(self):
+        self.add_expense(date(self.year, 3, 5), self.salary, 1000000)
+        for month in (2, 3, 4):
+            self.confirm_budget(month)
+        self.assertEqual(self.stale_budget_months(), set())
+
+        self.add_expense(date(self.year, 3, 20), self.salary, 500000)
+        self.assertEqual(self.stale_budget_months(), {3, 4})
+
+        # 연간결산은 재확정필요 월을 확정본 대신 현재 데이터로 구성
+        annual = admin.site._registry[CashBook]._build_annual_snapshot_data(self.year)
+        self.assertEqual(annual['grand_total_executed'], 1500000)
+
+        self.confirm_budget(3)
+        self.assertEqual(self.stale_budget_months(), {4})
+
+    def test_cashbook_and_deposit_changes(self):
+        self.confirm_budget(3)
+        self.save_cashbook(3, expense=[(None, 5, self.supplies, '20000')])
+        self.assertEqual(self.stale_budget_months(), {3})
+
+        self.confirm_budget(3)
+        other = CashBookCategory.objects.create(
+            fiscal_year=self.year, book_type='DEPOSIT', entry_type='EXPENSE', name='기타예수금',
+        )
+        DepositLedger.objects.create(year=self.year, month=3, date=date(self.year, 3, 10), category=other,
+                                     description='기타', amount=Decimal('7000'))
+        self.assertEqual(self.stale_budget_months(), set())
+
+        withholding = CashBookCategory.objects.create(
+            fiscal_year=self.year, book_type='DEPOSIT', entry_type='EXPENSE', name='예수금(원천세)',
+            addback_account=self.salary,
+        )
+        self.client.post(reverse('admin:deposit_ledger_save'), {
+            'year': self.year, 'month': 3,
+            'expense_day_0': 10, 'expense_category_0': withholding.pk, 'expense_amount_0': '30000',
+            'expense_note_0': '',
+        })
+        self.assertEqual(self.stale_budget_months(), {3})
+
+
+class SnapshotIntegrityTests(FinanceTestCase):
+    """스냅샷 내용해시 검증"""
+
+    def test_verify_snapshots_detects_tampering(self):
+        self.save_cashbook(3, income=[(None, 2, '5000000')])
+        self.confirm_cashbook(3)
+        # 재확정(update_or_create)으로 내용이 바뀌어도 저장된 해시가 함께 갱신되어야 함
+        row = CashBook.objects.get()
+        self.save_cashbook(3, income=[(row.pk, 2, '6000000')])
+        snapshot = self.confirm_cashbook(3)
+        out = StringIO()
+        call_command('verify_snapshots', stdout=out)
+        self.assertIn('정상 (1건)', out.getvalue())
+
+        tampered = dict(snapshot.snapshot_data, income_total=1)
+        MonthlySnapshot.objects.filter(pk=snapshot.pk).update(snapshot_data=tampered)
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('verify_snapshots', stdout=out)
+        self.assertIn('[불일치]', out.getvalue())
+        self.assertIn(f'ID {snapshot.pk}', out.getvalue())
+
+
+class DepositLedgerSaveTests(FinanceTestCase):
+    """예수금출납장 저장 - 제출된 행 ID 기준 추가/수정/삭제"""
+
+    def setUp(self):
+        super().setUp()
+        self.withholding = CashBookCategory.objects.create(
+            fiscal_year=self.year, book_type='DEPOSIT', entry_type='EXPENSE', name='예수금(원천세)',
+            addback_account=self.salary,
+        )
+
+    def save_deposit(self, month, rows):
+        """rows: (행ID, 일, 금액)"""
+        data = {'year': self.year, 'month': month}
+        for idx, (row_id, day, amount) in enumerate(rows):
+            data.update({
+                f'expense_id_{idx}': row_id or '', f'expense_day_{idx}': day,
+                f'expense_category_{idx}': self.withholding.pk, f'expense_amount_{idx}': amount,
+                f'expense_note_{idx}': '',
+            })
+        response = self.client.post(reverse('admin:deposit_ledger_save'), data)
+        self.assertEqual(response.status_code, 302)
+
+    def test_rows_are_matched_by_id(self):
+        self.save_deposit(3, [(None, 1, '1000'), (None, 2, '2000'), (None, 3, '3000')])
+        first, second, third = DepositLedger.objects.order_by('order')
+
+        # 가운데 행 삭제와 마지막 행 수정 - 나머지 행 ID는 그대로
+        self.save_deposit(3, [(first.pk, 1, '1000'), (third.pk, 3, '3500')])
+        self.assertEqual(
+            list(DepositLedger.objects.order_by('order').values_list('pk', 'amount', 'order')),
+            [(first.pk, Decimal('1000'), 0), (third.pk, Decimal('3500'), 1)],
+        )
+        totals = get_expense_totals_by_account(self.year, 3, [self.salary])
+        self.assertEqual(totals, {self.salary.pk: {'cumulative': 4500, 'monthly': 4500}})
+
+        # 다른 월의 행 ID는 새 행으로 추가
+        self.save_deposit(4, [(first.pk, 5, '700')])
+        self.assertEqual(DepositLedger.objects.filter(year=self.year, month=3).count(), 2)
+        self.assertNotEqual(DepositLedger.objects.get(year=self.year, month=4).pk, first.pk)
+
+
+class CashBookPatchTests(FinanceTestCase):
+    """출납장 행 단위 저장 API"""
+
+    def test_create_update_delete(self):
+        response = self.patch_cashbook(3, [
+            {'op': 'create', 'entry_type': 'INCOME', 'day': 2, 'category': self.income_category.pk, 'amount': '1,000,000'},
+            {'op': 'create', 'entry_type': 'EXPENSE', 'day': 5, 'item': f'account:{self.salary.pk}', 'amount': 300000},
+            {'op': 'create', 'entry_type': 'EXPENSE', 'day': 6, 'item': f'account:{self.supplies.pk}', 'amount': 20000},
+        ])
+        self.assertEqual(response.status_code, 200)
+        income_id, salary_id, supplies_id = response.json()['ids']
+        salary_txn_id = CashBook.objects.get(pk=salary_id).linked_transaction_id
+
+        response = self.patch_cashbook(3, [
+            {'op': 'update', 'id': salary_id, 'entry_type': 'EXPENSE', 'day': 5,
+             'item': f'account:{self.salary.pk}', 'amount': 350000},
+            {'op': 'delete', 'id': supplies_id},
+        ])
+        result = response.json()
+        self.assertEqual(result['ids'], [salary_id, None])
+        self.assertEqual((result['created'], result['updated'], result['deleted']), (0, 1, 1))
+        self.assertEqual(result['totals'], get_cashbook_balance('BANK', self.year, 3))
+        self.assertEqual(result['totals']['next_balance'], 650000)
+
+        self.assertEqual(CashBook.objects.get(pk=salary_id).linked_transaction_id, salary_txn_id)
+        self.assertEqual(Transaction.objects.get().amount, Decimal('350000'))
+        self.assertEqual(set(CashBook.objects.values_list('pk', flat=True)), {income_id, salary_id})
+        self.assertDerivedTablesConsistent()
+
+    def test_rejects_unknown_row_and_invalid_input(self):
+        response = self.patch_cashbook(3, [
+            {'op': 'update', 'id': 999, 'entry_type': 'EXPENSE', 'day': 5,
+             'item': f'account:{self.salary.pk}', 'amount': 1},
+        ])
+        self.assertEqual(response.status_code, 409)
+
+        response = self.patch_cashbook(3, [
+            {'op': 'create', 'entry_type': 'INCOME', 'day': 2, 'category': self.income_category.pk, 'amount': 1},
+            {'op': 'create', 'entry_type': 'EXPENSE', 'day': 40, 'item': f'account:{self.salary.pk}', 'amount': 1},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['index'], 1)
+        self.assertFalse(CashBook.objects.exists())
+
+        response = self.client.post(reverse('admin:cashbook_patch'), 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        # 행 ID 없는 수정, 구분 누락
+        for op in ({'op': 'update', 'entry_type': 'INCOME', 'day': 2}, {'op': 'create', 'day': 2}):
+            self.assertEqual(self.patch_cashbook(3, [op]).status_code, 400)
+
+
+class CashBookViewTests(FinanceTestCase):
+    """예금/현금출납장 화면 - 단일 화면과 통합 화면이 같은 행 구성 사용"""
+
+    def test_single_and_combined_views_share_rows(self):
+        self.save_cashbook(3, income=[(None, 2, '1000000')], expense=[(None, 5, self.salary, '300000')])
+
+        single = self.client.get(reverse('admin:cashbook_view', args=['BANK', self.year, 3])).context
+        combined = self.client.get(reverse('admin:cashbook_combined', args=[self.year, 3])).context
+
+        for key in ('income_entries', 'expense_entries', 'income_total', 'expense_total', 'next_balance'):
+            self.assertEqual(combined[f'bank_{key}'], single[key], key)
+        # 빈 입력 행: 예금출납장 수입 20행, 현금출납장 수입 5행, 지출 20행
+        self.assertEqual(len(single['income_entries']), 20)
+        self.assertEqual(len(combined['cash_income_entries']), 5)
+        self.assertEqual(len(combined['cash_expense_entries']), 20)
+        self.assertEqual(single['expense_entries'][0]['selected_value'], f'account:{self.salary.pk}')
+        self.assertEqual(single['expense_entries'][1]['selected_value'], '')
+        self.assertEqual(combined['bank_income_categories'], single['income_categories'])
+
+
+class CashBookTotalsTests(FinanceTestCase):
+    """출납장 화면 합계와 전월이월/차월이월"""
+
+    def test_totals_use_displayed_rows_and_indexed_prev_balance(self):
+        self.save_cashbook(2, income=[(None, 2, '1000000')], expense=[(None, 5, self.supplies, '100000')])
+        entries = [{'amount': Decimal('500000')}, {'amount': 0}]
+        self.assertEqual(get_cashbook_totals('BANK', self.year, 3, entries, [{'amount': Decimal('-20000')}]), {
+            'income_total': 500000, 'expense_total': -20000, 'prev_balance': 900000, 'next_balance': 1420000,
+        })
+
+        self.save_cashbook(3, income=[(None, 2, '500000')], expense=[(None, 5, self.salary, '300000')])
+        single = self.client.get(reverse('admin:cashbook_view', args=['BANK', self.year, 3])).context
+        self.assertEqual(
+            (single['prev_balance'], single['income_total'], single['expense_total'], single['next_balance']),
+            (900000, 500000, 300000, 1100000),
+        )
+        self.assertEqual(single['next_balance'], get_cashbook_balance('BANK', self.year, 3)['next_balance'])
+
+        # 기록 없는 월은 직전 기록 월의 차월이월을 이월
+        combined = self.client.get(reverse('admin:cashbook_combined', args=[self.year, 5])).context
+        self.assertEqual((combined['bank_prev_balance'], combined['bank_next_balance']), (1100000, 1100000))
+        self.assertEqual((combined['cash_prev_balance'], combined['cash_next_balance']), (0, 0))